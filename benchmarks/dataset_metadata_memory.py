@@ -0,0 +1,111 @@
+"""
+Memory benchmark for holding many dataset metadata records.
+
+Builds the same records as:
+  - a list of plain dataclasses, as DatasetMetadata was before it was slotted,
+  - a list of the slotted DatasetMetadata, and
+  - a DatasetMetadataTable,
+and reports the memory each holds, measured with tracemalloc.
+
+Usage:
+    python benchmarks/dataset_metadata_memory.py --records 50000
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sds_common.models.dataset_metadata_table import DatasetMetadataTable
+from sds_common.models.dataset_models import DatasetMetadata
+
+
+@dataclass
+class UnslottedDatasetMetadata:
+    dataset_id: str
+    survey_id: str
+    period_id: str
+    form_types: list[str]
+    sds_published_at: str
+    total_reporting_units: int
+    sds_dataset_version: int
+    filename: str
+    title: str | None = None
+
+
+def generate_payload(records: int, surveys: int, periods: int) -> bytes:
+    """
+    Generate a dataset_metadata response body, so every layout is built from freshly decoded strings
+    as it would be from an SDS response.
+
+    :param records: the number of records.
+    :param surveys: the number of distinct surveys.
+    :param periods: the number of distinct periods.
+    :return: the JSON encoded records.
+    """
+    return json.dumps([
+        {
+            "dataset_id": f"{index:08x}-0000-4000-8000-{index:012x}",
+            "survey_id": f"{index % surveys:03d}",
+            "period_id": f"2025{index // surveys % periods:02d}",
+            "form_types": ["0001", "0002", "0003"],
+            "sds_published_at": "2025-01-01T00:00:00Z",
+            "total_reporting_units": 100 + index % 50,
+            "sds_dataset_version": 1 + index // (surveys * periods),
+            "filename": f"{index % surveys:03d}_2025.json",
+            "title": "Benchmark dataset",
+        }
+        for index in range(records)
+    ]).encode("utf-8")
+
+
+def measure(build: Callable[[], object]) -> int:
+    """
+    Measure the memory still allocated by the value a builder returns.
+
+    :param build: builds the value to measure.
+    :return: the number of bytes allocated while building the value that it still holds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return current
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000, help="number of records")
+    parser.add_argument("--surveys", type=int, default=50, help="number of distinct surveys")
+    parser.add_argument("--periods", type=int, default=24, help="number of distinct periods")
+    args = parser.parse_args()
+
+    payload = generate_payload(args.records, args.surveys, args.periods)
+
+    layouts = {
+        "list[dataclass]": lambda: [UnslottedDatasetMetadata(**record) for record in json.loads(payload)],
+        "list[DatasetMetadata]": lambda: [DatasetMetadata(**record) for record in json.loads(payload)],
+        "DatasetMetadataTable": lambda: DatasetMetadataTable.from_records(
+            DatasetMetadata(**record) for record in json.loads(payload)
+        ),
+    }
+
+    baseline = None
+    for name, build in layouts.items():
+        size = measure(build)
+        baseline = baseline or size
+        print(f"{name:24} {size / (1024 * 1024):8.2f} MiB  {size / args.records:7.1f} B/record  {size / baseline:5.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
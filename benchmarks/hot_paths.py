@@ -0,0 +1,450 @@
+"""
+Benchmarks for the sds_common hot paths, run against local stand-ins so no network access is needed.
+
+Cases:
+  - http_get, http_post_bytes: HttpService against a local HTTP stub server.
+  - bucket_get_json, bucket_get_json_cached: BucketFileRepository and CachedBucketFileRepository against an
+    in-memory fake bucket, or the GCS emulator when STORAGE_EMULATOR_HOST is set.
+  - schema_set_schema, schema_from_bytes: building Schema objects from parsed JSON and from raw bytes.
+  - publish_error_message: SchemaPublishError.generate_message_content serialisation.
+  - pubsub_publish: PubSubService against the Pub/Sub emulator, only when PUBSUB_EMULATOR_HOST is set.
+  - firestore_purge: FirestorePurgeService against the Firestore emulator, only when FIRESTORE_EMULATOR_HOST is set.
+
+Each case records its throughput, p50 and p99 latency and peak memory, and fails if any of them regress beyond
+the tolerance of a recorded baseline. Baselines are only comparable on the machine they were recorded on.
+
+Usage:
+    python benchmarks/hot_paths.py                        # check against the baseline, if one exists
+    python benchmarks/hot_paths.py --update-baseline      # record a new baseline for this machine
+    python benchmarks/hot_paths.py --case http_get --iterations 2000
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
+from sds_common.config.config import CONFIG
+from sds_common.enums.client_types import ClientType
+from sds_common.models.schema_publish_errors import SchemaPublishError
+from sds_common.repositories.bucket_file_repository import BucketFileRepository
+from sds_common.repositories.cached_bucket_file_repository import CachedBucketFileRepository
+from sds_common.schema.schema import Schema
+from sds_common.services.http_service import HttpService
+from sds_common.utilities import json_backend
+from sds_common.utilities.blob_cache import BlobCache
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "hot_paths.json"
+
+# The number of operations run with tracemalloc enabled to measure peak memory, as tracing slows every allocation.
+MEMORY_ITERATIONS = 50
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], Any]
+    setup: Callable[[], None] | None = None
+    items_per_operation: int = 1
+    iterations: int | None = None
+
+
+@dataclass
+class CaseResult:
+    iterations: int
+    throughput_per_second: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_bytes: int
+
+
+def generate_schema(survey_id: str, properties: int) -> dict:
+    """
+    Generate a schema JSON document shaped like those in sds-schema-definitions.
+
+    :param survey_id: the survey ID of the schema.
+    :param properties: the number of data properties in the schema.
+    :return: the schema JSON.
+    """
+    return {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "title": f"SDS schema for survey {survey_id}",
+        "type": "object",
+        "properties": {
+            "schema_version": {"const": "v1.0.0"},
+            "survey_id": {"type": "string", "enum": [survey_id]},
+            "data": {
+                "type": "object",
+                "properties": {
+                    f"field_{index}": {"type": "string", "description": f"Field {index} of the survey"}
+                    for index in range(properties)
+                },
+            },
+        },
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for SDS: GET returns a dataset metadata list, POST returns a small acknowledgement.
+    """
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, so without this Nagle's algorithm holds back the body.
+    disable_nagle_algorithm = True
+    get_body = b"[]"
+
+    def do_GET(self):
+        self._respond(self.get_body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond(b'{"status": "ok"}')
+
+    def _respond(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+def start_stub_server(stack: ExitStack) -> str:
+    """
+    Start the HTTP stub server on a free local port for the lifetime of the stack.
+
+    :param stack: the exit stack that stops the server.
+    :return: the base URL of the server.
+    """
+    StubHandler.get_body = json.dumps([
+        {
+            "dataset_id": str(uuid.UUID(int=index)),
+            "survey_id": "068",
+            "period_id": "202501",
+            "form_types": ["0001", "0002"],
+            "sds_published_at": "2025-01-01T00:00:00Z",
+            "total_reporting_units": 100,
+            "sds_dataset_version": index + 1,
+            "filename": f"068_202501_{index}.json",
+        }
+        for index in range(20)
+    ]).encode("utf-8")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stack.callback(server.server_close)
+    stack.callback(server.shutdown)
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class FakeBlob:
+    """
+    In-memory stand-in for google.cloud.storage.Blob, covering the calls the repositories make.
+    """
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.generation = None
+
+    def download_as_bytes(self, if_generation_not_match: int | None = None, **_options) -> bytes:
+        from google.api_core.exceptions import NotModified
+
+        generation, data = self.bucket.objects[self.name]
+        if if_generation_not_match is not None and if_generation_not_match == generation:
+            raise NotModified("not modified")
+        self.generation = generation
+        return data
+
+    def upload_from_string(self, data: bytes, **_options):
+        generation = self.bucket.objects.get(self.name, (0, b""))[0] + 1
+        self.bucket.objects[self.name] = (generation, bytes(data))
+        self.generation = generation
+
+    def exists(self) -> bool:
+        return self.name in self.bucket.objects
+
+    def delete(self):
+        del self.bucket.objects[self.name]
+
+
+class FakeBucket:
+    """
+    In-memory stand-in for google.cloud.storage.Bucket.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.objects: dict[str, tuple[int, bytes]] = {}
+
+    def blob(self, name: str, **_options) -> FakeBlob:
+        return FakeBlob(self, name)
+
+
+def create_bucket(stack: ExitStack):
+    """
+    Get the bucket to benchmark against: a bucket on the GCS emulator if STORAGE_EMULATOR_HOST is set,
+    otherwise an in-memory fake.
+
+    :param stack: the exit stack that deletes the emulator bucket.
+    :return: the bucket.
+    """
+    if not os.environ.get("STORAGE_EMULATOR_HOST"):
+        return FakeBucket("benchmark-bucket")
+
+    client = CLIENT_REGISTRY.get(ClientType.STORAGE, CONFIG.PROJECT_ID)
+    bucket = client.create_bucket(f"benchmark-{uuid.uuid4().hex[:12]}")
+    stack.callback(bucket.delete, force=True)
+    return bucket
+
+
+def http_cases(stack: ExitStack) -> list[Case]:
+    """
+    Cases for HttpService against the local stub server.
+
+    :param stack: the exit stack that stops the server.
+    :return: the cases.
+    """
+    base_url = start_stub_server(stack)
+    http_service = HttpService.create(False)
+    body = json_backend.dumps(generate_schema("068", 200))
+
+    return [
+        Case("http_get", lambda: http_service.make_get_request(f"{base_url}/v1/dataset_metadata").content),
+        Case("http_post_bytes", lambda: http_service.make_post_request(f"{base_url}/v1/schema", body)),
+    ]
+
+
+def bucket_cases(stack: ExitStack) -> list[Case]:
+    """
+    Cases for the bucket repositories reading a schema sized JSON file.
+
+    :param stack: the exit stack that deletes any emulator bucket.
+    :return: the cases.
+    """
+    bucket = create_bucket(stack)
+    bucket.blob("schema.json").upload_from_string(json_backend.dumps(generate_schema("068", 500)))
+    repository = BucketFileRepository(bucket)
+    # A TTL of zero revalidates on every read, measuring the conditional request rather than a memory hit.
+    cached_repository = CachedBucketFileRepository(bucket, BlobCache(ttl=0, max_memory_bytes=64 * 1024 * 1024))
+
+    return [
+        Case("bucket_get_json", lambda: repository.get_file_as_json("schema.json")),
+        Case("bucket_get_json_cached", lambda: cached_repository.get_file_as_json("schema.json")),
+    ]
+
+
+def schema_cases() -> list[Case]:
+    """
+    Cases for building schemas and serialising publish errors, which need no stand-ins.
+
+    :return: the cases.
+    """
+    schema_json = generate_schema("068", 500)
+    schema_bytes = json_backend.dumps(schema_json)
+    error = SchemaPublishError("SchemaPostError", "Failed to post schema. Status code: 500", "068/v1.json")
+
+    return [
+        Case("schema_set_schema", lambda: Schema.set_schema(schema_json, "068/v1.json").raw),
+        Case("schema_from_bytes", lambda: Schema.from_bytes(schema_bytes, "068/v1.json").raw),
+        Case("publish_error_message", error.generate_message_content),
+    ]
+
+
+def pubsub_cases(stack: ExitStack) -> list[Case]:
+    """
+    Cases for PubSubService against the Pub/Sub emulator.
+
+    :param stack: the exit stack that deletes the benchmark topic.
+    :return: the cases, or none if PUBSUB_EMULATOR_HOST is not set.
+    """
+    if not os.environ.get("PUBSUB_EMULATOR_HOST"):
+        return []
+
+    from google.api_core.exceptions import AlreadyExists
+
+    from sds_common.services.pub_sub_service import PubSubService
+
+    topic_id = f"benchmark-{uuid.uuid4().hex[:12]}"
+    service = PubSubService()
+    topic_path = service.publisher.topic_path(CONFIG.PROJECT_ID, topic_id)
+    try:
+        service.publisher.create_topic(name=topic_path)
+    except AlreadyExists:
+        pass
+    stack.callback(service.publisher.delete_topic, topic=topic_path)
+
+    error = SchemaPublishError("SchemaPostError", "Failed to post schema. Status code: 500", "068/v1.json")
+    return [Case("pubsub_publish", lambda: service.send_message(error, topic_id).result(), iterations=200)]
+
+
+def firestore_cases() -> list[Case]:
+    """
+    Cases for FirestorePurgeService against the Firestore emulator. Each operation purges a freshly seeded
+    collection of parent documents with a subcollection each, and throughput is counted in documents.
+
+    :return: the cases, or none if FIRESTORE_EMULATOR_HOST is not set.
+    """
+    if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        return []
+
+    from sds_common.services.firestore_purge_service import FirestorePurgeService
+
+    client = CLIENT_REGISTRY.get(ClientType.FIRESTORE, CONFIG.PROJECT_ID, database=CONFIG.FIRESTORE_DB_NAME)
+    collection = client.collection(f"benchmark-{uuid.uuid4().hex[:12]}")
+    service = FirestorePurgeService(client)
+    parents, children = 20, 5
+
+    def seed():
+        batch = client.batch()
+        for parent_index in range(parents):
+            parent = collection.document(f"parent-{parent_index}")
+            batch.set(parent, {"index": parent_index})
+            for child_index in range(children):
+                batch.set(parent.collection("units").document(f"unit-{child_index}"), {"index": child_index})
+        batch.commit()
+
+    return [
+        Case(
+            "firestore_purge",
+            lambda: service.purge_query(collection),
+            setup=seed,
+            items_per_operation=parents * (children + 1),
+            iterations=10,
+        )
+    ]
+
+
+def build_cases(stack: ExitStack) -> list[Case]:
+    """
+    Build every case, starting the local stand-ins they need.
+
+    :param stack: the exit stack that stops the stand-ins.
+    :return: the cases.
+    """
+    return [*http_cases(stack), *bucket_cases(stack), *schema_cases(), *pubsub_cases(stack), *firestore_cases()]
+
+
+def measure(case: Case, iterations: int, warmup: int) -> CaseResult:
+    """
+    Run a case, timing every operation, then run it again under tracemalloc to measure peak memory.
+
+    :param case: the case.
+    :param iterations: the number of timed operations, unless the case sets its own.
+    :param warmup: the number of untimed operations run first.
+    :return: the throughput, latency percentiles and peak memory of the case.
+    """
+    iterations = case.iterations or iterations
+
+    def run_once() -> float:
+        if case.setup is not None:
+            case.setup()
+        start = time.perf_counter()
+        case.run()
+        return time.perf_counter() - start
+
+    for _ in range(min(warmup, iterations)):
+        run_once()
+
+    gc.collect()
+    latencies = sorted(run_once() for _ in range(iterations))
+
+    gc.collect()
+    tracemalloc.start()
+    for _ in range(min(MEMORY_ITERATIONS, iterations)):
+        run_once()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return CaseResult(
+        iterations=iterations,
+        throughput_per_second=case.items_per_operation * iterations / sum(latencies),
+        p50_ms=statistics.median(latencies) * 1000,
+        p99_ms=latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        peak_memory_bytes=peak,
+    )
+
+
+def compare(results: dict[str, CaseResult], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Compare the results against the baseline.
+
+    :param results: the result per case.
+    :param baseline: the baseline result per case.
+    :param tolerance: the allowed fractional regression of each measurement.
+    :return: a description of each regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+
+        if result.throughput_per_second < expected["throughput_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result.throughput_per_second:.1f}/s "
+                f"(baseline {expected['throughput_per_second']:.1f}/s)"
+            )
+        for metric in ("p50_ms", "p99_ms", "peak_memory_bytes"):
+            value = getattr(result, metric)
+            if value > expected[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {value:.3f} (baseline {expected[metric]:.3f})")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500, help="timed operations per case")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed operations run before timing each case")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument("--case", action="append", help="only run the named case, may be given more than once")
+    parser.add_argument("--update-baseline", action="store_true", help="record the measured results as the baseline")
+    args = parser.parse_args()
+
+    results = {}
+    with ExitStack() as stack:
+        for case in build_cases(stack):
+            if args.case and case.name not in args.case:
+                continue
+            result = measure(case, args.iterations, args.warmup)
+            results[case.name] = result
+            print(
+                f"{case.name:24} {result.throughput_per_second:12.1f}/s  p50 {result.p50_ms:8.3f}ms  "
+                f"p99 {result.p99_ms:8.3f}ms  peak {result.peak_memory_bytes / 1024:9.1f} KiB"
+            )
+
+    failed = False
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        baseline.update({name: asdict(result) for name, result in results.items()})
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+    elif BASELINE_PATH.exists():
+        for regression in compare(results, json.loads(BASELINE_PATH.read_text()), args.tolerance):
+            print(f"FAIL regression {regression}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Import time benchmark for sds_common.
+
+Imports each public module in a fresh interpreter with `python -X importtime` and fails if:
+  - a heavy Google Cloud client library is imported eagerly (these must be deferred until first use), or
+  - a module's cumulative import time regresses beyond the tolerance of a recorded baseline.
+
+Usage:
+    python benchmarks/import_time.py                      # check against the baseline, if one exists
+    python benchmarks/import_time.py --update-baseline    # record a new baseline for this machine
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "import_time.json"
+
+MODULES = [
+    "sds_common.clients.client_registry",
+    "sds_common.publishers.gcs_schema_publisher",
+    "sds_common.publishers.github_schema_publisher",
+    "sds_common.publishers.schema_publish_planner",
+    "sds_common.repositories.bucket_file_repository",
+    "sds_common.repositories.bucket_loader",
+    "sds_common.repositories.cached_bucket_file_repository",
+    "sds_common.repositories.github_schema_snapshot",
+    "sds_common.repositories.schema_content_index",
+    "sds_common.repositories.schema_manifest_repository",
+    "sds_common.repositories.schema_metadata_repository",
+    "sds_common.services.file_service",
+    "sds_common.services.firestore_purge_service",
+    "sds_common.services.github_schema_fetcher",
+    "sds_common.services.http_policy",
+    "sds_common.services.http_service",
+    "sds_common.services.pub_sub_consumer",
+    "sds_common.services.pub_sub_service",
+    "sds_common.services.schema_validator_service",
+    "sds_common.services.sds_dataset_request_service",
+    "sds_common.services.sds_schema_request_service",
+    "sds_common.services.secret_service",
+    "sds_common.test_helpers.integration_helpers",
+    "sds_common.utilities.instrumentation",
+    "sds_common.utilities.utils",
+]
+
+# Modules that create gRPC channels or pull in large generated clients. They are imported lazily
+# by the client registry and must not be imported as a side effect of importing sds_common.
+FORBIDDEN_IMPORTS = [
+    "firebase_admin",
+    "google.cloud.firestore",
+    "google.cloud.iam_credentials_v1",
+    "google.cloud.pubsub_v1",
+    "google.cloud.secretmanager",
+    "google.cloud.storage",
+    "grpc",
+]
+
+
+def measure_import(module: str) -> tuple[int, set[str]]:
+    """
+    Import a module in a fresh interpreter and read the -X importtime report.
+
+    :param module: the module to import.
+    :return: the cumulative import time of the module in microseconds and the names of every module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = (part.strip() for part in line.split("|"))
+        if not cumulative_us.isdigit():
+            continue
+        imported.add(name)
+        if name == module:
+            cumulative = int(cumulative_us)
+
+    return cumulative, imported
+
+
+def run(repeat: int) -> tuple[dict[str, int], dict[str, list[str]]]:
+    """
+    Measure every module, taking the median cumulative import time over a number of runs.
+
+    :param repeat: the number of times to import each module.
+    :return: the median import time per module and any forbidden imports per module.
+    """
+    timings = {}
+    violations = {}
+
+    for module in MODULES:
+        samples = []
+        imported = set()
+        for _ in range(repeat):
+            cumulative, imported = measure_import(module)
+            samples.append(cumulative)
+        timings[module] = int(statistics.median(samples))
+
+        forbidden = sorted(name for name in FORBIDDEN_IMPORTS if name in imported)
+        if forbidden:
+            violations[module] = forbidden
+
+    return timings, violations
+
+
+def compare(timings: dict[str, int], baseline: dict[str, int], tolerance: float) -> list[str]:
+    """
+    Compare import times against the baseline.
+
+    :param timings: the measured import time per module.
+    :param baseline: the baseline import time per module.
+    :param tolerance: the allowed fractional increase over the baseline.
+    :return: a description of each regression.
+    """
+    regressions = []
+    for module, cumulative in timings.items():
+        expected = baseline.get(module)
+        if expected and cumulative > expected * (1 + tolerance):
+            regressions.append(f"{module}: {cumulative / 1000:.1f}ms (baseline {expected / 1000:.1f}ms)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="imports per module, the median is used")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument("--update-baseline", action="store_true", help="record the measured times as the baseline")
+    args = parser.parse_args()
+
+    timings, violations = run(args.repeat)
+
+    for module, cumulative in timings.items():
+        print(f"{cumulative / 1000:8.1f}ms  {module}")
+
+    failed = False
+
+    for module, forbidden in violations.items():
+        print(f"FAIL {module} eagerly imports {', '.join(forbidden)}")
+        failed = True
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(timings, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+    elif BASELINE_PATH.exists():
+        for regression in compare(timings, json.loads(BASELINE_PATH.read_text()), args.tolerance):
+            print(f"FAIL import time regression {regression}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.enums.client_types import ClientType
+
+logger = logging.getLogger(__name__)
+
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+# Environment variables that point a client at a local emulator. When set, the client library
+# resolves its own (anonymous) credentials, so the shared credentials are not passed in.
+EMULATOR_HOST_ENV_VARS = {
+    ClientType.STORAGE: "STORAGE_EMULATOR_HOST",
+    ClientType.PUBLISHER: "PUBSUB_EMULATOR_HOST",
+    ClientType.SUBSCRIBER: "PUBSUB_EMULATOR_HOST",
+    ClientType.FIRESTORE: "FIRESTORE_EMULATOR_HOST",
+}
+
+
+def _create_storage_client(project: str | None, credentials, **options):
+    from google.cloud import storage
+
+    return storage.Client(project=project, credentials=credentials, **options)
+
+
+def _create_publisher_client(_project: str | None, credentials, **options):
+    from google.cloud import pubsub_v1
+
+    return pubsub_v1.PublisherClient(credentials=credentials, **options)
+
+
+def _create_subscriber_client(_project: str | None, credentials, **options):
+    from google.cloud import pubsub_v1
+
+    return pubsub_v1.SubscriberClient(credentials=credentials, **options)
+
+
+def _create_secret_manager_client(_project: str | None, credentials, **options):
+    from google.cloud import secretmanager
+
+    return secretmanager.SecretManagerServiceClient(credentials=credentials, **options)
+
+
+def _create_iam_credentials_client(_project: str | None, credentials, **options):
+    from google.cloud import iam_credentials_v1
+
+    return iam_credentials_v1.IAMCredentialsClient(credentials=credentials, **options)
+
+
+def _create_firestore_client(project: str | None, credentials, **options):
+    from google.cloud import firestore
+
+    return firestore.Client(project=project, credentials=credentials, **options)
+
+
+DEFAULT_FACTORIES: dict[ClientType, Callable[..., Any]] = {
+    ClientType.STORAGE: _create_storage_client,
+    ClientType.PUBLISHER: _create_publisher_client,
+    ClientType.SUBSCRIBER: _create_subscriber_client,
+    ClientType.SECRET_MANAGER: _create_secret_manager_client,
+    ClientType.IAM_CREDENTIALS: _create_iam_credentials_client,
+    ClientType.FIRESTORE: _create_firestore_client,
+}
+
+
+class ClientRegistry:
+    """
+    Lazily creates and shares Google Cloud clients keyed by (client type, project, options), so that
+    channels and credentials are reused across the package instead of being created per call.
+
+    The registry holds at most max_size clients, dropping the least recently used one when full.
+    Clients are discarded in a child process after fork, as gRPC channels cannot be shared across fork.
+    Tests can replace the clients of a type with override() to return a fake, or with override_factory() to
+    create emulator clients.
+    """
+    def __init__(self, max_size: int = CONFIG.CLIENT_REGISTRY_MAX_SIZE):
+        self.max_size = max_size
+        self._clients: OrderedDict[Hashable, Any] = OrderedDict()
+        self._overrides: dict[ClientType, Callable[..., Any]] = {}
+        self._credentials = None
+        self._pid = os.getpid()
+        self._lock = threading.RLock()
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def get(self, client_type: ClientType, project: str | None = None, **options) -> Any:
+        """
+        Get the shared client for the client type, project and options, creating it on first use.
+
+        :param client_type: the type of client to get.
+        :param project: the project the client is for, if the client is project scoped.
+        :param options: extra keyword arguments passed to the client constructor.
+        :return: the shared client.
+        :raises TypeError: if the client type is not an instance of the ClientType enum.
+        """
+        if not isinstance(client_type, ClientType):
+            raise TypeError(f"Expected client_type to be an instance of ClientType enum, got {type(client_type)}")
+
+        key = (client_type, project, self._freeze(options))
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset_after_fork()
+
+            if key in self._clients:
+                self._clients.move_to_end(key)
+                return self._clients[key]
+
+            client = self._create(client_type, project, options)
+            self._clients[key] = client
+
+            if len(self._clients) > self.max_size:
+                evicted_key, evicted = self._clients.popitem(last=False)
+                logger.debug(f"Client registry full, closing {evicted_key[0].name} client")
+                self._close(evicted)
+
+            return client
+
+    def override(self, client_type: ClientType, instance: Any):
+        """
+        Return the given client for every request of a type, e.g. a fake in tests.
+        Any clients of the type already created are discarded.
+
+        :param client_type: the type of client to override.
+        :param instance: the client to return, used as is even if it is callable.
+        """
+        self.override_factory(client_type, lambda *_args, **_kwargs: instance)
+
+    def override_factory(self, client_type: ClientType, factory: Callable[..., Any]):
+        """
+        Replace how clients of a type are created, e.g. to create emulator clients.
+        Any clients of the type already created are discarded.
+
+        :param client_type: the type of client to override.
+        :param factory: a callable taking (project, **options) and returning a client.
+        """
+        with self._lock:
+            self._overrides[client_type] = factory
+            self._discard(client_type)
+
+    def clear_overrides(self, client_type: ClientType | None = None):
+        """
+        Remove overrides so clients are created by the default factories again.
+
+        :param client_type: the type of client to remove the override for, or None to remove every override.
+        """
+        with self._lock:
+            client_types = [client_type] if client_type is not None else list(self._overrides)
+            for override_type in client_types:
+                self._overrides.pop(override_type, None)
+                self._discard(override_type)
+
+    def clear(self):
+        """
+        Discard every client held by the registry, closing clients that support it.
+        """
+        with self._lock:
+            for client in self._clients.values():
+                self._close(client)
+            self._clients.clear()
+
+    def _create(self, client_type: ClientType, project: str | None, options: dict) -> Any:
+        """
+        Create a client using the override for the client type if there is one, otherwise the default factory.
+
+        :param client_type: the type of client to create.
+        :param project: the project the client is for.
+        :param options: extra keyword arguments passed to the client constructor.
+        :return: the new client.
+        """
+        if client_type in self._overrides:
+            return self._overrides[client_type](project, **options)
+
+        credentials = None if self._uses_emulator(client_type) else self._get_credentials()
+        return DEFAULT_FACTORIES[client_type](project, credentials, **options)
+
+    def _get_credentials(self):
+        """
+        Resolve the application default credentials once and share them between clients.
+
+        :return: the application default credentials.
+        """
+        if self._credentials is None:
+            import google.auth
+
+            self._credentials, _ = google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+        return self._credentials
+
+    def _discard(self, client_type: ClientType):
+        """
+        Drop every client of the type without closing it.
+
+        :param client_type: the type of client to drop.
+        """
+        for key in [key for key in self._clients if key[0] == client_type]:
+            del self._clients[key]
+
+    def _reset_after_fork(self):
+        """
+        Drop every client and the shared credentials in a forked child process, without closing them,
+        as they belong to the parent process.
+        """
+        self._clients = OrderedDict()
+        self._credentials = None
+        self._pid = os.getpid()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _close(client: Any):
+        """
+        Close a client if it supports it, logging rather than raising any error.
+
+        :param client: the client to close.
+        """
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Failed to close client: {e}", exc_info=True)
+
+    @staticmethod
+    def _uses_emulator(client_type: ClientType) -> bool:
+        """
+        Check whether the client type has been pointed at a local emulator.
+
+        :param client_type: the type of client.
+        :return: True if an emulator host is configured for the client type, False otherwise.
+        """
+        env_var = EMULATOR_HOST_ENV_VARS.get(client_type)
+        return env_var is not None and os.environ.get(env_var) is not None
+
+    @classmethod
+    def _freeze(cls, value: Any) -> Hashable:
+        """
+        Convert client options into a hashable registry key.
+
+        :param value: the options to convert.
+        :return: a hashable representation of the options.
+        """
+        if isinstance(value, dict):
+            return tuple(sorted((key, cls._freeze(item)) for key, item in value.items()))
+        if isinstance(value, (list, tuple, set)):
+            return tuple(cls._freeze(item) for item in value)
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return repr(value)
+
+
+CLIENT_REGISTRY = ClientRegistry()
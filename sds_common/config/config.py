@@ -8,10 +8,102 @@ class Config:
 
     PROCESS_TIMEOUT = int(ConfigHelpers.get_value_from_env("PROCESS_TIMEOUT", "540"))
     SECRET_ID = ConfigHelpers.get_value_from_env("SECRET_ID", "iap-secret")
+    ASYNC_HTTP_MAX_CONNECTIONS = int(ConfigHelpers.get_value_from_env("ASYNC_HTTP_MAX_CONNECTIONS", "100"))
+    ASYNC_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(
+        ConfigHelpers.get_value_from_env("ASYNC_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+    )
+    ASYNC_HTTP_KEEPALIVE_EXPIRY = float(ConfigHelpers.get_value_from_env("ASYNC_HTTP_KEEPALIVE_EXPIRY", "30"))
+    ASYNC_HTTP_MAX_CONNECTIONS_PER_HOST = int(
+        ConfigHelpers.get_value_from_env("ASYNC_HTTP_MAX_CONNECTIONS_PER_HOST", "20")
+    )
+    ASYNC_HTTP2 = ConfigHelpers.get_bool_value(str(ConfigHelpers.get_value_from_env("ASYNC_HTTP2", "false")))
+    SCHEMA_PUBLISH_RETRIEVE_CONCURRENCY = int(
+        ConfigHelpers.get_value_from_env("SCHEMA_PUBLISH_RETRIEVE_CONCURRENCY", "8")
+    )
+    SCHEMA_PUBLISH_POST_CONCURRENCY = int(ConfigHelpers.get_value_from_env("SCHEMA_PUBLISH_POST_CONCURRENCY", "4"))
+    JSON_STREAM_CHUNK_SIZE = int(ConfigHelpers.get_value_from_env("JSON_STREAM_CHUNK_SIZE", str(1024 * 1024)))
+    FILE_TRANSFER_CHUNK_SIZE = int(ConfigHelpers.get_value_from_env("FILE_TRANSFER_CHUNK_SIZE", str(8 * 1024 * 1024)))
+    FILE_TRANSFER_PART_SIZE = int(ConfigHelpers.get_value_from_env("FILE_TRANSFER_PART_SIZE", str(32 * 1024 * 1024)))
+    FILE_TRANSFER_MAX_WORKERS = int(ConfigHelpers.get_value_from_env("FILE_TRANSFER_MAX_WORKERS", "8"))
+    FILE_BATCH_MAX_WORKERS = int(ConfigHelpers.get_value_from_env("FILE_BATCH_MAX_WORKERS", "10"))
+    FILE_LIST_PAGE_SIZE = int(ConfigHelpers.get_value_from_env("FILE_LIST_PAGE_SIZE", "1000"))
+    FILE_CACHE_ENABLED = ConfigHelpers.get_bool_value(
+        str(ConfigHelpers.get_value_from_env("FILE_CACHE_ENABLED", "false"))
+    )
+    FILE_CACHE_TTL = float(ConfigHelpers.get_value_from_env("FILE_CACHE_TTL", "30"))
+    FILE_CACHE_MAX_MEMORY_BYTES = int(
+        ConfigHelpers.get_value_from_env("FILE_CACHE_MAX_MEMORY_BYTES", str(64 * 1024 * 1024))
+    )
+    FILE_CACHE_DIR = ConfigHelpers.get_value_from_env("FILE_CACHE_DIR", "")
+    FILE_CACHE_DISK_MAX_AGE = float(ConfigHelpers.get_value_from_env("FILE_CACHE_DISK_MAX_AGE", "86400"))
+    PUBSUB_BATCH_MAX_MESSAGES = int(ConfigHelpers.get_value_from_env("PUBSUB_BATCH_MAX_MESSAGES", "100"))
+    PUBSUB_BATCH_MAX_BYTES = int(ConfigHelpers.get_value_from_env("PUBSUB_BATCH_MAX_BYTES", str(1024 * 1024)))
+    PUBSUB_BATCH_MAX_LATENCY = float(ConfigHelpers.get_value_from_env("PUBSUB_BATCH_MAX_LATENCY", "0.05"))
+    PUBSUB_FLOW_CONTROL_MAX_MESSAGES = int(
+        ConfigHelpers.get_value_from_env("PUBSUB_FLOW_CONTROL_MAX_MESSAGES", "1000")
+    )
+    PUBSUB_FLOW_CONTROL_MAX_BYTES = int(
+        ConfigHelpers.get_value_from_env("PUBSUB_FLOW_CONTROL_MAX_BYTES", str(10 * 1024 * 1024))
+    )
+    PUBSUB_PUBLISH_TIMEOUT = float(ConfigHelpers.get_value_from_env("PUBSUB_PUBLISH_TIMEOUT", "60"))
+    PUBSUB_CONSUMER_MAX_MESSAGES = int(ConfigHelpers.get_value_from_env("PUBSUB_CONSUMER_MAX_MESSAGES", "100"))
+    PUBSUB_CONSUMER_MAX_BYTES = int(
+        ConfigHelpers.get_value_from_env("PUBSUB_CONSUMER_MAX_BYTES", str(10 * 1024 * 1024))
+    )
+    PUBSUB_CONSUMER_MAX_WORKERS = int(ConfigHelpers.get_value_from_env("PUBSUB_CONSUMER_MAX_WORKERS", "4"))
+    PUBSUB_CONSUMER_QUEUE_SIZE = int(ConfigHelpers.get_value_from_env("PUBSUB_CONSUMER_QUEUE_SIZE", "100"))
+    PUBSUB_CONSUMER_MAX_LEASE_DURATION = int(
+        ConfigHelpers.get_value_from_env("PUBSUB_CONSUMER_MAX_LEASE_DURATION", "600")
+    )
+    PUBSUB_CONSUMER_AWAIT_TIMEOUT = float(ConfigHelpers.get_value_from_env("PUBSUB_CONSUMER_AWAIT_TIMEOUT", "45"))
+    FIRESTORE_PURGE_MAX_WORKERS = int(ConfigHelpers.get_value_from_env("FIRESTORE_PURGE_MAX_WORKERS", "8"))
+    FIRESTORE_PURGE_MAX_ATTEMPTS = int(ConfigHelpers.get_value_from_env("FIRESTORE_PURGE_MAX_ATTEMPTS", "5"))
+    FIRESTORE_PURGE_PAGE_SIZE = int(ConfigHelpers.get_value_from_env("FIRESTORE_PURGE_PAGE_SIZE", "500"))
+    SCHEMA_DEDUP_ENABLED = ConfigHelpers.get_bool_value(
+        str(ConfigHelpers.get_value_from_env("SCHEMA_DEDUP_ENABLED", "false"))
+    )
+    SCHEMA_DEDUP_MANIFEST = ConfigHelpers.get_value_from_env("SCHEMA_DEDUP_MANIFEST", "none")
+    SCHEMA_DEDUP_MANIFEST_COLLECTION = ConfigHelpers.get_value_from_env(
+        "SCHEMA_DEDUP_MANIFEST_COLLECTION", "schema_content_manifest"
+    )
+    SCHEMA_DEDUP_MANIFEST_BUCKET = ConfigHelpers.get_value_from_env("SCHEMA_DEDUP_MANIFEST_BUCKET", "")
+    SCHEMA_DEDUP_MANIFEST_PREFIX = ConfigHelpers.get_value_from_env("SCHEMA_DEDUP_MANIFEST_PREFIX", "schema-manifest/")
+    SCHEMA_DEDUP_MISS_TTL = float(ConfigHelpers.get_value_from_env("SCHEMA_DEDUP_MISS_TTL", "5"))
+    SCHEMA_METADATA_READY_TIMEOUT = float(ConfigHelpers.get_value_from_env("SCHEMA_METADATA_READY_TIMEOUT", "30"))
+    DATASET_METADATA_CONCURRENCY = int(ConfigHelpers.get_value_from_env("DATASET_METADATA_CONCURRENCY", "8"))
+    DATASET_METADATA_CACHE_TTL = float(ConfigHelpers.get_value_from_env("DATASET_METADATA_CACHE_TTL", "60"))
+    DATASET_METADATA_CACHE_MAX_SIZE = int(
+        ConfigHelpers.get_value_from_env("DATASET_METADATA_CACHE_MAX_SIZE", "10000")
+    )
+    INSTRUMENTATION_BACKEND = ConfigHelpers.get_value_from_env("INSTRUMENTATION_BACKEND", "none")
+    HTTP_CONNECT_TIMEOUT = float(ConfigHelpers.get_value_from_env("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT = float(ConfigHelpers.get_value_from_env("HTTP_READ_TIMEOUT", "30"))
+    HTTP_TOTAL_TIMEOUT = float(ConfigHelpers.get_value_from_env("HTTP_TOTAL_TIMEOUT", "120"))
+    HTTP_ENDPOINT_READ_TIMEOUTS = ConfigHelpers.get_value_from_env("HTTP_ENDPOINT_READ_TIMEOUTS", "")
+    HTTP_MAX_ATTEMPTS = int(ConfigHelpers.get_value_from_env("HTTP_MAX_ATTEMPTS", "3"))
+    HTTP_BACKOFF_BASE = float(ConfigHelpers.get_value_from_env("HTTP_BACKOFF_BASE", "0.5"))
+    HTTP_BACKOFF_MAX = float(ConfigHelpers.get_value_from_env("HTTP_BACKOFF_MAX", "10"))
+    HTTP_MAX_RETRY_AFTER = float(ConfigHelpers.get_value_from_env("HTTP_MAX_RETRY_AFTER", "30"))
+    HTTP_RETRY_BUDGET_RATIO = float(ConfigHelpers.get_value_from_env("HTTP_RETRY_BUDGET_RATIO", "0.2"))
+    HTTP_RETRY_BUDGET_MAX_TOKENS = float(ConfigHelpers.get_value_from_env("HTTP_RETRY_BUDGET_MAX_TOKENS", "10"))
+    HTTP_CIRCUIT_FAILURE_THRESHOLD = int(ConfigHelpers.get_value_from_env("HTTP_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    HTTP_CIRCUIT_RESET_TIMEOUT = float(ConfigHelpers.get_value_from_env("HTTP_CIRCUIT_RESET_TIMEOUT", "30"))
+    SECRET_CACHE_TTL = int(ConfigHelpers.get_value_from_env("SECRET_CACHE_TTL", "300"))
+    SECRET_STALE_WHILE_REVALIDATE = ConfigHelpers.get_bool_value(
+        str(ConfigHelpers.get_value_from_env("SECRET_STALE_WHILE_REVALIDATE", "false"))
+    )
+    CLIENT_REGISTRY_MAX_SIZE = int(ConfigHelpers.get_value_from_env("CLIENT_REGISTRY_MAX_SIZE", "32"))
+    ID_TOKEN_REFRESH_MARGIN = int(ConfigHelpers.get_value_from_env("ID_TOKEN_REFRESH_MARGIN", "300"))
+    GITHUB_SCHEMA_CACHE_DIR = ConfigHelpers.get_value_from_env("GITHUB_SCHEMA_CACHE_DIR", "")
+    GITHUB_FETCH_CONCURRENCY = int(ConfigHelpers.get_value_from_env("GITHUB_FETCH_CONCURRENCY", "8"))
     GITHUB_SCHEMA_URL = ConfigHelpers.get_value_from_env(
         "GITHUB_SCHEMA_URL",
         "https://raw.githubusercontent.com/ONSdigital/sds-schema-definitions/main/"
     )
+    GITHUB_SCHEMA_ARCHIVE_URL = ConfigHelpers.get_value_from_env(
+        "GITHUB_SCHEMA_ARCHIVE_URL",
+        "https://codeload.github.com/ONSdigital/sds-schema-definitions/tar.gz/"
+    )
     POST_SCHEMA_ENDPOINT = ConfigHelpers.get_value_from_env(
         "POST_SCHEMA_URL", "/v1/schema"
     )
@@ -21,6 +113,9 @@ class Config:
     GET_ALL_SCHEMA_METADATA_ENDPOINT = ConfigHelpers.get_value_from_env(
         "GET_ALL_SCHEMA_METADATA_URL", "/v1/all_schema_metadata"
     )
+    GET_DATASET_METADATA_ENDPOINT = ConfigHelpers.get_value_from_env(
+        "GET_DATASET_METADATA_URL", "/v1/dataset_metadata"
+    )
     DATASET_CREATE_ENDPOINT = ConfigHelpers.get_value_from_env(
         "DATASET_CREATE_PATH", "/events/dataset/create"
     )
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class ClientType(Enum):
+    """
+    ClientType enum representing the Google Cloud clients that can be created through the client registry.
+    """
+    STORAGE = "storage"
+    PUBLISHER = "publisher"
+    SUBSCRIBER = "subscriber"
+    SECRET_MANAGER = "secret_manager"
+    IAM_CREDENTIALS = "iam_credentials"
+    FIRESTORE = "firestore"
@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class PublishPlanReason(Enum):
+    """
+    PublishPlanReason enum representing why a schema file is or is not included in a publish plan.
+    """
+    NEW = "new"
+    DUPLICATE = "duplicate"
+    VERSION_MISMATCH = "version_mismatch"
+    INVALID = "invalid"
@@ -1,4 +1,9 @@
-from abc import ABC
+import mmap
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from sds_common.models.file_transfer_models import BatchOperationResult, TransferStats
 
 
 class FileRepositoryInterface(ABC):
@@ -11,14 +16,72 @@ class FileRepositoryInterface(ABC):
         """
         ...
 
-    def upload_file_from_path(self, filepath: str):
+    @abstractmethod
+    def get_file_as_bytes(self, filename: str) -> bytes:
+        """
+        Gets the contents of a file with a specific filename.
+
+        :param filename: name of file being loaded.
+        :return: bytes: the file contents.
+        """
+
+    @abstractmethod
+    def stream_json_items(self, filename: str, path: str | None = None, chunk_size: int | None = None) -> Iterator[Any]:
+        """
+        Streams the items of a JSON array in a file one at a time, without loading the whole file.
+
+        :param filename: name of file being loaded.
+        :param path: dotted path of object keys leading to the array, or None for a top level array.
+        :param chunk_size: the number of bytes read at a time.
+        :return: a generator of the array items.
+        """
+
+    def upload_file_from_path(self, filepath: str, chunk_size: int | None = None) -> TransferStats:
         """
         Uploads a file from a local file path.
 
         :param filepath: path to the local file to be uploaded.
+        :param chunk_size: the resumable upload chunk size in bytes, or None to upload in a single request.
+        :return: the size, duration and throughput of the upload.
         """
         ...
 
+    @abstractmethod
+    def upload_file_in_parts(self, filepath: str, part_size: int, max_workers: int) -> TransferStats:
+        """
+        Uploads a large file from a local file path as parts uploaded in parallel.
+
+        :param filepath: path to the local file to be uploaded.
+        :param part_size: the size of each part in bytes.
+        :param max_workers: the number of parts uploaded at once.
+        :return: the size, duration and throughput of the upload.
+        """
+
+    @abstractmethod
+    def download_file_to_path(self, filename: str, destination: str, slice_size: int, max_workers: int) -> TransferStats:
+        """
+        Downloads a file to a local path as byte ranges fetched in parallel.
+
+        :param filename: name of the file to be downloaded.
+        :param destination: the local path to write the file to.
+        :param slice_size: the size of each byte range in bytes.
+        :param max_workers: the number of byte ranges downloaded at once.
+        :return: the size, duration and throughput of the download.
+        """
+
+    @abstractmethod
+    def download_file_to_buffer(
+        self, filename: str, slice_size: int, max_workers: int
+    ) -> tuple[mmap.mmap, TransferStats]:
+        """
+        Downloads a file into a memory-mapped buffer as byte ranges fetched in parallel.
+
+        :param filename: name of the file to be downloaded.
+        :param slice_size: the size of each byte range in bytes.
+        :param max_workers: the number of byte ranges downloaded at once.
+        :return: the buffer holding the file, and the size, duration and throughput of the download.
+        """
+
     def delete_file(self, filename: str):
         """
         Deletes a file with the specified filename.
@@ -35,3 +98,33 @@ class FileRepositoryInterface(ABC):
         :return: True if file exists, False otherwise.
         """
         ...
+
+    @abstractmethod
+    def delete_files(self, filenames: Iterable[str], max_workers: int) -> BatchOperationResult:
+        """
+        Deletes many files, reporting the outcome for each file.
+
+        :param filenames: names of the files to be deleted.
+        :param max_workers: the number of files deleted at once.
+        :return: a result per file, holding the error raised for any file that was not deleted.
+        """
+
+    @abstractmethod
+    def files_exist(self, filenames: Iterable[str], max_workers: int) -> BatchOperationResult:
+        """
+        Checks if many files exist, reporting the outcome for each file.
+
+        :param filenames: names of the files to be checked.
+        :param max_workers: the number of files checked at once.
+        :return: a result per file, holding True if the file exists, False otherwise.
+        """
+
+    @abstractmethod
+    def list_files(self, prefix: str | None, page_size: int) -> Iterator[str]:
+        """
+        Lists the names of files, fetching them a page at a time.
+
+        :param prefix: only list files whose names begin with the prefix.
+        :param page_size: the number of files fetched per request.
+        :return: a generator of file names.
+        """
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+from sds_common.models.schema_models import PublishedSchema
+
+
+class SchemaManifestInterface(ABC):
+    @abstractmethod
+    def get(self, content_hash: str) -> PublishedSchema | None:
+        """
+        Gets the record of the schema published with a content hash.
+
+        :param content_hash: the content hash of the schema.
+        :return: the published schema record, or None if no schema with the content hash has been published.
+        """
+
+    @abstractmethod
+    def put(self, record: PublishedSchema):
+        """
+        Records that a schema has been published.
+
+        :param record: the published schema record.
+        """
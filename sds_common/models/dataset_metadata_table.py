@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from sds_common.models.dataset_models import DatasetMetadata
+
+GROUP_BY_COLUMNS = ("survey_id", "period_id", "sds_dataset_version")
+
+
+class DatasetMetadataTable:
+    """
+    Columnar container for many DatasetMetadata records.
+
+    Each field is held in its own column rather than in an object per record. Columns with few distinct values,
+    such as survey_id and period_id, are dictionary encoded: each distinct value is held once and every record
+    stores a small integer code for it in an array. The integer fields are stored in arrays too. This keeps
+    tens of thousands of records in a fraction of the memory of a list of DatasetMetadata objects, and makes
+    filtering and grouping a scan over integer arrays.
+    """
+    def __init__(self):
+        self.dataset_ids: list[str] = []
+        self.total_reporting_units = array("q")
+        self.sds_dataset_versions = array("q")
+        self._survey_ids = _DictionaryColumn()
+        self._period_ids = _DictionaryColumn()
+        self._form_types = _DictionaryColumn()
+        self._sds_published_at = _DictionaryColumn()
+        self._filenames = _DictionaryColumn()
+        self._titles = _DictionaryColumn()
+
+    @classmethod
+    def from_records(cls, records: Iterable[DatasetMetadata]) -> DatasetMetadataTable:
+        """
+        Build a table from DatasetMetadata records.
+
+        :param records: the records.
+        :return: the table.
+        """
+        table = cls()
+        for record in records:
+            table.append(record)
+        return table
+
+    def append(self, record: DatasetMetadata):
+        """
+        Add a record to the end of the table.
+
+        :param record: the record to add.
+        """
+        self.dataset_ids.append(record.dataset_id)
+        self.total_reporting_units.append(record.total_reporting_units)
+        self.sds_dataset_versions.append(record.sds_dataset_version)
+        self._survey_ids.append(record.survey_id)
+        self._period_ids.append(record.period_id)
+        self._form_types.append(tuple(record.form_types))
+        self._sds_published_at.append(record.sds_published_at)
+        self._filenames.append(record.filename)
+        self._titles.append(record.title)
+
+    @property
+    def survey_ids(self) -> list[str]:
+        """
+        The distinct survey_ids in the table, in the order they were first added.
+        """
+        return self._survey_ids.distinct()
+
+    @property
+    def period_ids(self) -> list[str]:
+        """
+        The distinct period_ids in the table, in the order they were first added.
+        """
+        return self._period_ids.distinct()
+
+    def row(self, index: int) -> DatasetMetadata:
+        """
+        Build the DatasetMetadata record at a position.
+
+        :param index: the position of the record.
+        :return: the record.
+        """
+        return DatasetMetadata(
+            dataset_id=self.dataset_ids[index],
+            survey_id=self._survey_ids[index],
+            period_id=self._period_ids[index],
+            form_types=list(self._form_types[index]),
+            sds_published_at=self._sds_published_at[index],
+            total_reporting_units=self.total_reporting_units[index],
+            sds_dataset_version=self.sds_dataset_versions[index],
+            filename=self._filenames[index],
+            title=self._titles[index],
+        )
+
+    def filter(
+        self,
+        survey_id: str | None = None,
+        period_id: str | None = None,
+        sds_dataset_version: int | None = None,
+    ) -> DatasetMetadataTable:
+        """
+        Select the records matching every given value.
+
+        :param survey_id: only select records for this survey.
+        :param period_id: only select records for this period.
+        :param sds_dataset_version: only select records with this dataset version.
+        :return: a new table holding the matching records.
+        """
+        survey_code = self._survey_ids.code(survey_id) if survey_id is not None else None
+        period_code = self._period_ids.code(period_id) if period_id is not None else None
+        if (survey_id is not None and survey_code is None) or (period_id is not None and period_code is None):
+            return self._take([])
+
+        survey_codes = self._survey_ids.codes
+        period_codes = self._period_ids.codes
+        indexes = [
+            index
+            for index in range(len(self))
+            if (survey_code is None or survey_codes[index] == survey_code)
+            and (period_code is None or period_codes[index] == period_code)
+            and (sds_dataset_version is None or self.sds_dataset_versions[index] == sds_dataset_version)
+        ]
+        return self._take(indexes)
+
+    def group_by(self, *columns: str) -> dict[tuple, DatasetMetadataTable]:
+        """
+        Split the table into groups of records sharing the same values for the given columns.
+
+        :param columns: the columns to group by, any of survey_id, period_id and sds_dataset_version.
+        :return: a table per distinct combination of values, in the order each combination first appears.
+        :raises ValueError: if no columns are given or a column cannot be grouped by.
+        """
+        unknown = [column for column in columns if column not in GROUP_BY_COLUMNS]
+        if unknown or not columns:
+            raise ValueError(f"Can only group by {', '.join(GROUP_BY_COLUMNS)}, got {', '.join(unknown) or 'nothing'}")
+
+        groups: dict[tuple, list[int]] = {}
+        for index in range(len(self)):
+            key = tuple(self._column_value(column, index) for column in columns)
+            groups.setdefault(key, []).append(index)
+
+        return {key: self._take(indexes) for key, indexes in groups.items()}
+
+    def latest_versions(self) -> DatasetMetadataTable:
+        """
+        Select the record with the highest sds_dataset_version for each survey and period.
+
+        :return: a new table holding the latest record of each survey and period.
+        """
+        survey_codes = self._survey_ids.codes
+        period_codes = self._period_ids.codes
+        latest: dict[tuple[int, int], int] = {}
+
+        for index in range(len(self)):
+            key = (survey_codes[index], period_codes[index])
+            current = latest.get(key)
+            if current is None or self.sds_dataset_versions[index] > self.sds_dataset_versions[current]:
+                latest[key] = index
+
+        return self._take(sorted(latest.values()))
+
+    def __len__(self) -> int:
+        return len(self.dataset_ids)
+
+    def __iter__(self) -> Iterator[DatasetMetadata]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def _column_value(self, column: str, index: int) -> str | int:
+        """
+        Get the value of a groupable column for a record.
+
+        :param column: the column name.
+        :param index: the position of the record.
+        :return: the value.
+        """
+        if column == "survey_id":
+            return self._survey_ids[index]
+        if column == "period_id":
+            return self._period_ids[index]
+        return self.sds_dataset_versions[index]
+
+    def _take(self, indexes: list[int]) -> DatasetMetadataTable:
+        """
+        Build a new table from the records at the given positions, sharing the dictionaries of this table.
+
+        :param indexes: the positions of the records.
+        :return: the new table.
+        """
+        table = DatasetMetadataTable()
+        table.dataset_ids = [self.dataset_ids[index] for index in indexes]
+        table.total_reporting_units = array("q", (self.total_reporting_units[index] for index in indexes))
+        table.sds_dataset_versions = array("q", (self.sds_dataset_versions[index] for index in indexes))
+        table._survey_ids = self._survey_ids.take(indexes)
+        table._period_ids = self._period_ids.take(indexes)
+        table._form_types = self._form_types.take(indexes)
+        table._sds_published_at = self._sds_published_at.take(indexes)
+        table._filenames = self._filenames.take(indexes)
+        table._titles = self._titles.take(indexes)
+        return table
+
+
+class _DictionaryColumn:
+    """
+    A column storing each distinct value once, with an integer code per record referring to its value.
+    """
+    def __init__(self, values: list | None = None, value_codes: dict | None = None):
+        self.values = values if values is not None else []
+        self.value_codes = value_codes if value_codes is not None else {}
+        self.codes = array("I")
+
+    def append(self, value: Any):
+        """
+        Add a value to the end of the column, assigning the next code to values not seen before.
+
+        :param value: the value.
+        """
+        code = self.value_codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.value_codes[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def code(self, value: Any) -> int | None:
+        """
+        Get the code of a value.
+
+        :param value: the value.
+        :return: the code, or None if the value is not in the column.
+        """
+        return self.value_codes.get(value)
+
+    def distinct(self) -> list:
+        """
+        Get the distinct values used in the column, in the order they were first added.
+
+        :return: the values.
+        """
+        used = set(self.codes)
+        return [value for code, value in enumerate(self.values) if code in used]
+
+    def take(self, indexes: list[int]) -> _DictionaryColumn:
+        """
+        Build a column from the records at the given positions, sharing this column's dictionary.
+
+        :param indexes: the positions of the records.
+        :return: the new column.
+        """
+        column = _DictionaryColumn(self.values, self.value_codes)
+        column.codes = array("I", (self.codes[index] for index in indexes))
+        return column
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[self.codes[index]]
@@ -1,7 +1,12 @@
-from dataclasses import dataclass
+from __future__ import annotations
 
+import sys
+from dataclasses import dataclass, field
 
-@dataclass
+from sds_common.models.dataset_publish_errors import DatasetMetadataRetrievalError
+
+
+@dataclass(slots=True)
 class DatasetMetadata:
     dataset_id: str
     survey_id: str
@@ -12,3 +17,32 @@ class DatasetMetadata:
     sds_dataset_version: int
     filename: str
     title: str | None = None
+
+    def __post_init__(self):
+        """
+        Validate the identifiers and counts, and intern the strings repeated across many records,
+        so records for the same survey and period share a single copy of each.
+
+        :raises TypeError: if a field has the wrong type.
+        """
+        for name in ("dataset_id", "survey_id", "period_id"):
+            if not isinstance(getattr(self, name), str):
+                raise TypeError(f"DatasetMetadata.{name} must be a string, got {type(getattr(self, name)).__name__}")
+        for name in ("total_reporting_units", "sds_dataset_version"):
+            value = getattr(self, name)
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError(f"DatasetMetadata.{name} must be an integer, got {type(value).__name__}")
+
+        self.survey_id = sys.intern(self.survey_id)
+        self.period_id = sys.intern(self.period_id)
+        self.form_types = [sys.intern(form_type) for form_type in self.form_types]
+
+
+@dataclass
+class DatasetMetadataBatchResult:
+    metadata: dict[tuple[str, str], list[DatasetMetadata]] = field(default_factory=dict)
+    errors: dict[tuple[str, str], DatasetMetadataRetrievalError] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.errors
@@ -5,8 +5,13 @@ class DatasetPublishError(Exception):
 
 
 class DatasetMetadataRetrievalError(DatasetPublishError):
-    def __init__(self, survey_id: str, period_id: str, status_code: int):
+    def __init__(self, survey_id: str, period_id: str, status_code: int | None, reason: str | None = None):
+        self.survey_id = survey_id
+        self.period_id = period_id
+        self.status_code = status_code
         self.message = f"Failed to retrieve metadata for dataset with survey_id: {survey_id} and period_id: {period_id}, Status code: {status_code}"
+        if reason is not None:
+            self.message += f", Reason: {reason}"
         super().__init__(self.message)
 
 
@@ -0,0 +1,10 @@
+
+
+class FileTransferError(Exception):
+    pass
+
+
+class ChecksumMismatchError(FileTransferError):
+    def __init__(self, filename: str, expected: str, actual: str):
+        self.message = f"Checksum mismatch for file {filename}. Expected crc32c: {expected}, got: {actual}"
+        super().__init__(self.message)
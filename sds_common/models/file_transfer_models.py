@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class TransferStats:
+    filename: str
+    bytes_transferred: int
+    duration_seconds: float
+    parts: int = 1
+
+    @property
+    def throughput_mb_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.bytes_transferred / self.duration_seconds / (1024 * 1024)
+
+
+@dataclass
+class FileOperationResult:
+    filename: str
+    value: Any = None
+    error: Exception | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchOperationResult:
+    results: list[FileOperationResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> list[FileOperationResult]:
+        return [result for result in self.results if result.succeeded]
+
+    @property
+    def failed(self) -> list[FileOperationResult]:
+        return [result for result in self.results if not result.succeeded]
+
+    @property
+    def all_succeeded(self) -> bool:
+        return all(result.succeeded for result in self.results)
+
+    def values(self) -> dict[str, Any]:
+        """
+        The value of each successful operation, keyed by filename.
+
+        :return: the values.
+        """
+        return {result.filename: result.value for result in self.succeeded}
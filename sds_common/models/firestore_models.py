@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PurgeStats:
+    documents_found: int = 0
+    documents_deleted: int = 0
+    failed_paths: list[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed_paths
+
+    @property
+    def documents_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.documents_deleted / self.duration_seconds
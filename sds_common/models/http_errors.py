@@ -0,0 +1,10 @@
+class HttpPolicyError(Exception):
+    pass
+
+
+class CircuitOpenError(HttpPolicyError):
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        self.message = f"Circuit breaker for {host} is open, requests are rejected for another {retry_in:.1f}s"
+        super().__init__(self.message)
@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclass(frozen=True)
+class HttpPolicy:
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    total_timeout: float = 120.0
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 10.0
+    max_retry_after: float = 30.0
+    # Statuses retried for any method, as the server has refused the request without processing it.
+    retry_statuses_any_method: frozenset[int] = frozenset({429, 503})
+    # Statuses only retried for idempotent methods, as the request may have been processed.
+    retry_statuses_idempotent: frozenset[int] = frozenset({502, 504})
+    idempotent_methods: frozenset[str] = IDEMPOTENT_METHODS
+
+
+@dataclass
+class HttpPolicyMetrics:
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    retries_by_reason: dict[str, int] = field(default_factory=dict)
+    retries_denied_by_budget: int = 0
+    retries_denied_by_deadline: int = 0
+    circuit_trips: int = 0
+    circuit_rejections: int = 0
+
+    @property
+    def retry_ratio(self) -> float:
+        if self.requests == 0:
+            return 0.0
+        return self.retries / self.requests
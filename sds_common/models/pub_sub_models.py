@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class PublishOutcome:
+    topic_id: str
+    ordering_key: str = ""
+    message_id: str | None = None
+    error: Exception | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and self.message_id is not None
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+import requests
+
+from sds_common.enums.publish_plan_reasons import PublishPlanReason
+
+# Set on the response returned in place of posting a schema whose content has already been published,
+# holding the content hash of the schema.
+ALREADY_PUBLISHED_HEADER = "X-SDS-Already-Published"
+
+
+@dataclass
+class SchemaMetadata:
+    guid: str
+    survey_id: str
+    schema_location: str
+    sds_schema_version: int
+    sds_published_at: str
+    schema_version: str
+    title: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SchemaMetadata:
+        """
+        Build the schema metadata from a record returned by SDS or read from Firestore, ignoring unknown fields.
+
+        :param data: the schema metadata record.
+        :return: the schema metadata.
+        """
+        return cls(**{field.name: data[field.name] for field in fields(cls) if field.name in data})
+
+
+@dataclass
+class PublishedSchema:
+    content_hash: str
+    survey_id: str
+    schema_version: str
+    filepath: str
+    published_at: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PublishedSchema:
+        """
+        Build the record of a published schema from a manifest entry, ignoring unknown fields.
+
+        :param data: the manifest entry.
+        :return: the published schema record.
+        """
+        return cls(**{field.name: data[field.name] for field in fields(cls) if field.name in data})
+
+
+@dataclass
+class SchemaPublishResult:
+    file_name: str
+    response: requests.Response | None = None
+    error: Exception | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    @property
+    def already_published(self) -> bool:
+        return self.response is not None and ALREADY_PUBLISHED_HEADER in self.response.headers
+
+
+@dataclass
+class PlannedSchema:
+    file_name: str
+    reason: PublishPlanReason
+    survey_id: str | None = None
+    schema_version: str | None = None
+    error: Exception | None = None
+
+    @property
+    def should_publish(self) -> bool:
+        return self.reason is PublishPlanReason.NEW
+
+
+@dataclass
+class SchemaPublishPlan:
+    entries: list[PlannedSchema] = field(default_factory=list)
+
+    @property
+    def to_publish(self) -> list[str]:
+        return [entry.file_name for entry in self.entries if entry.should_publish]
+
+    @property
+    def skipped(self) -> list[PlannedSchema]:
+        return [entry for entry in self.entries if not entry.should_publish]
+
+    def counts(self) -> dict[PublishPlanReason, int]:
+        """
+        The number of files planned for each reason.
+
+        :return: the count per reason, including reasons with no files.
+        """
+        counts = Counter(entry.reason for entry in self.entries)
+        return {reason: counts[reason] for reason in PublishPlanReason}
+
+    def describe(self) -> str:
+        """
+        Describe the plan for a dry run, with a line per file giving its reason, followed by the counts.
+
+        :return: the description.
+        """
+        lines = []
+        for entry in self.entries:
+            action = "publish" if entry.should_publish else "skip"
+            line = f"{action:7} {entry.reason.value:16} {entry.file_name}"
+            if entry.survey_id is not None:
+                line += f" (survey {entry.survey_id}, version {entry.schema_version})"
+            if entry.error is not None:
+                line += f": {getattr(entry.error, 'message', entry.error)}"
+            lines.append(line)
+
+        counts = ", ".join(f"{count} {reason.value}" for reason, count in self.counts().items())
+        lines.append(f"{len(self.to_publish)} of {len(self.entries)} schemas to publish: {counts}")
+        return "\n".join(lines)
+
+
+class SchemaMetadataIndex:
+    """
+    Thread-safe index of the schema versions known to SDS for each survey.
+    Unless the index is complete, surveys that have not been looked up yet are absent, which is distinct
+    from a survey with no versions.
+    """
+    def __init__(self, complete: bool = False):
+        self.complete = complete
+        self._versions: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def has_survey(self, survey_id: str) -> bool:
+        """
+        Check whether the versions for a survey have been indexed.
+
+        :param survey_id: the survey to check.
+        :return: True if the survey has been indexed, False otherwise.
+        """
+        return self.complete or survey_id in self._versions
+
+    def set_versions(self, survey_id: str, versions: Iterable[str]):
+        """
+        Replace the indexed versions for a survey.
+
+        :param survey_id: the survey the versions belong to.
+        :param versions: the schema versions known to SDS for the survey.
+        """
+        with self._lock:
+            self._versions[survey_id] = set(versions)
+
+    def add(self, survey_id: str, version: str):
+        """
+        Add a single schema version for a survey.
+
+        :param survey_id: the survey the version belongs to.
+        :param version: the schema version.
+        """
+        with self._lock:
+            self._versions.setdefault(survey_id, set()).add(version)
+
+    def contains(self, survey_id: str, version: str) -> bool:
+        """
+        Check whether a schema version is known for a survey.
+
+        :param survey_id: the survey to check.
+        :param version: the schema version to check.
+        :return: True if the version is indexed for the survey, False otherwise.
+        """
+        return version in self._versions.get(survey_id, ())
+
+    @classmethod
+    def from_metadata(cls, schema_metadata: Iterable[dict]) -> SchemaMetadataIndex:
+        """
+        Build a complete index from the schema metadata records for every survey returned by SDS.
+
+        :param schema_metadata: the schema metadata records, each with a survey_id and schema_version.
+        :return: the index.
+        """
+        index = cls(complete=True)
+        for metadata in schema_metadata:
+            index.add(metadata["survey_id"], metadata["schema_version"])
+        return index
+
+
+@dataclass
+class SchemaPublishRun:
+    """
+    The state of a single publish_many run, passed to each stage of the run so that runs made at the same time
+    by the same publisher do not share it.
+    """
+    metadata_index: SchemaMetadataIndex | None = None
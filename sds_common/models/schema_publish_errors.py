@@ -83,6 +83,14 @@ class SchemaFetchError(SchemaPublishError):
         super().__init__(self.error_type, self.message, filepath)
 
 
+class SchemaSnapshotError(SchemaPublishError):
+    def __init__(self, filepath: str, revision: str):
+        self.error_type = "SchemaSnapshotError"
+        self.message = f"Schema not found in the GitHub snapshot at revision {revision}."
+        self.filepath = filepath
+        super().__init__(self.error_type, self.message, filepath)
+
+
 class SchemaPostError(
     SchemaPublishError,
 ):
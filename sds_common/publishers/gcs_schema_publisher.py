@@ -1,8 +1,11 @@
 import requests
+from sds_common.config.config import CONFIG
 from sds_common.enums.buckets import Bucket
 from sds_common.publishers.schema_publisher import SchemaPublisher
+from sds_common.repositories.bucket_file_repository import BucketFileRepository
 from sds_common.repositories.bucket_loader import BucketLoader
-from sds_common.schema.schema import Schema
+from sds_common.repositories.cached_bucket_file_repository import CachedBucketFileRepository
+from sds_common.repositories.schema_content_index import SchemaContentIndex
 from sds_common.services.file_service import FileService
 
 
@@ -10,9 +13,10 @@ class GcsSchemaPublisher(SchemaPublisher):
     """
     Publisher for retrieving and publishing schemas from Google Cloud Storage (GCS) buckets.
     """
-    def __init__(self):
-        super().__init__()
-        self.bucket_service = FileService(Bucket.SCHEMA_PUBLISH_BUCKET, BucketLoader())
+    def __init__(self, content_index: SchemaContentIndex | None = None):
+        super().__init__(content_index)
+        repository_cls = CachedBucketFileRepository if CONFIG.FILE_CACHE_ENABLED else BucketFileRepository
+        self.bucket_service = FileService(Bucket.SCHEMA_PUBLISH_BUCKET, BucketLoader(), repository_cls)
 
     def _retrieve_schema(self, file_name: str) -> dict:
         """
@@ -23,6 +27,15 @@ class GcsSchemaPublisher(SchemaPublisher):
         """
         return self.bucket_service.retrieve_json_file(file_name)
 
+    def _retrieve_schema_bytes(self, file_name: str) -> bytes:
+        """
+        Retrieve the schema JSON file from the GCS bucket without decoding it.
+
+        :param file_name: The name of the schema file to retrieve.
+        :return: The schema JSON bytes.
+        """
+        return self.bucket_service.retrieve_file_bytes(file_name)
+
     def publish_schema(self, file_name: str) -> requests.Response:
         """
         Publish the schema retrieved from the GCS bucket.
@@ -30,9 +43,8 @@ class GcsSchemaPublisher(SchemaPublisher):
         :param file_name: The name of the schema file to publish.
         :return: The response from the schema publishing service.
         """
-        schema_json = self._retrieve_schema(file_name)
-        schema = Schema.set_schema(schema_json, file_name)
-        response = self.schema_request_service.post_schema(schema)
+        schema, published = self._prepare_schema(file_name)
+        response = self._post_schema(schema, published)
         return response
 
     def cleanup(self, schema_file_name: str):
@@ -1,16 +1,30 @@
+import requests
+
+from sds_common.models.schema_models import PublishedSchema, SchemaPublishRun
+from sds_common.models.schema_publish_errors import SchemaJSONDecodeError
 from sds_common.publishers.schema_publisher import SchemaPublisher
+from sds_common.repositories.github_schema_snapshot import GithubSchemaSnapshot
+from sds_common.repositories.schema_content_index import SchemaContentIndex
 from sds_common.schema.schema import Schema
 from sds_common.services.schema_validator_service import SchemaValidatorService
-from sds_common.utilities.utils import fetch_raw_schema_from_github
+from sds_common.utilities import json_backend
+from sds_common.utilities.instrumentation import get_instrumentation
+from sds_common.utilities.utils import fetch_raw_schema_bytes_from_github, fetch_raw_schema_from_github
 
 
 class GithubSchemaPublisher(SchemaPublisher):
     """
     Publisher class to publish schemas retrieved from a GitHub repository.
+
+    By default each schema is fetched from the branch at GITHUB_SCHEMA_URL. Given a snapshot, schemas are
+    read from the archive of a single revision instead, with no request per schema.
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self, content_index: SchemaContentIndex | None = None, snapshot: GithubSchemaSnapshot | None = None
+    ):
+        super().__init__(content_index)
         self.validator = SchemaValidatorService()
+        self.snapshot = snapshot
 
     def _retrieve_schema(self, file_name: str):
         """
@@ -19,7 +33,24 @@ class GithubSchemaPublisher(SchemaPublisher):
         :param file_name: The name of the schema file to retrieve.
         :return: The schema JSON as a dictionary.
         """
-        return fetch_raw_schema_from_github(file_name)
+        if self.snapshot is None:
+            return fetch_raw_schema_from_github(file_name)
+
+        try:
+            return json_backend.loads(self.snapshot.read(file_name))
+        except json_backend.JSONDecodeError:
+            raise SchemaJSONDecodeError(file_name) from None
+
+    def _retrieve_schema_bytes(self, file_name: str) -> bytes:
+        """
+        Retrieves the schema JSON from a GitHub repository without decoding it.
+
+        :param file_name: The name of the schema file to retrieve.
+        :return: The schema JSON bytes.
+        """
+        if self.snapshot is None:
+            return fetch_raw_schema_bytes_from_github(file_name)
+        return self.snapshot.read(file_name)
 
     def publish_schema(self, file_name: str):
         """
@@ -28,16 +59,61 @@ class GithubSchemaPublisher(SchemaPublisher):
         :param file_name: The name of the schema file to publish.
         :return: The response from SDS.
         """
-        schema_json = self._retrieve_schema(file_name)
-        schema = Schema.set_schema(schema_json, file_name)
-        self._validate(schema)
-        response = self.schema_request_service.post_schema(schema)
+        schema, published = self._prepare_schema(file_name)
+        response = self._post_schema(schema, published)
         return response
 
-    def _validate(self, schema: Schema):
+    def _prepare_schema(
+        self, file_name: str, run: SchemaPublishRun | None = None
+    ) -> tuple[Schema, PublishedSchema | None]:
+        """
+        Retrieves the schema and validates it ready to be posted. Schemas whose content has already been
+        published are not validated, as they will not be posted.
+
+        :param file_name: The name of the schema file to prepare.
+        :param run: The publish_many run the schema is prepared in, or None if it is published on its own.
+        :return: The validated Schema object, and the record of the published schema with the same content, if any.
+        """
+        schema, published = super()._prepare_schema(file_name, run)
+        if published is None:
+            self._validate(schema, run)
+        return schema, published
+
+    def _post_schema(
+        self, schema: Schema, published: PublishedSchema | None, run: SchemaPublishRun | None = None
+    ) -> requests.Response:
+        """
+        Posts a validated schema. During publish_many the schema is checked again against versions posted
+        earlier in the same run, as it may have been validated before they were posted.
+
+        :param schema: The Schema object to post.
+        :param published: The record of the published schema with the same content, as found by _prepare_schema.
+        :param run: The publish_many run the schema is posted in, or None if it is published on its own.
+        :return: The response from SDS.
+        """
+        metadata_index = run.metadata_index if run is not None else None
+        if metadata_index is not None and published is None:
+            self.validator.check_duplicate_versions(schema, metadata_index)
+
+        response = super()._post_schema(schema, published, run)
+        self.validator.record_published(schema, metadata_index)
+        return response
+
+    def _start_run(self) -> SchemaPublishRun:
+        """
+        Fetches the schema metadata for every survey once, so the schemas in the run are validated without
+        a metadata request per schema.
+
+        :return: The state of the run, holding its schema metadata index.
+        """
+        return SchemaPublishRun(self.validator.start_metadata_run())
+
+    def _validate(self, schema: Schema, run: SchemaPublishRun | None = None):
         """
         Validates the schema.
 
         :param schema: The Schema object to validate.
+        :param run: The publish_many run the schema is validated in, if any.
         """
-        self.validator.validate_schema(schema)
+        with get_instrumentation().start_span("schema.validate", {"schema.file": schema.filepath}):
+            self.validator.validate_schema(schema, run.metadata_index if run is not None else None)
@@ -0,0 +1,144 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.enums.publish_plan_reasons import PublishPlanReason
+from sds_common.models.schema_models import (
+    PlannedSchema,
+    SchemaMetadataIndex,
+    SchemaPublishPlan,
+    SchemaPublishResult,
+)
+from sds_common.models.schema_publish_errors import (
+    FilepathError,
+    SchemaDuplicationError,
+    SchemaJSONDecodeError,
+    SchemaVersionError,
+    SchemaVersionMismatchError,
+    SurveyIDError,
+)
+from sds_common.publishers.schema_publisher import SchemaPublisher
+from sds_common.repositories.schema_metadata_repository import SchemaMetadataRepository
+from sds_common.schema.schema import Schema
+from sds_common.services.schema_validator_service import SchemaValidatorService
+from sds_common.utilities.instrumentation import get_instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Errors raised because of the content or name of a schema file, which plan the file as invalid.
+INVALID_SCHEMA_ERRORS = (FilepathError, SchemaJSONDecodeError, SurveyIDError, SchemaVersionError)
+
+
+class SchemaPublishPlanner:
+    """
+    Works out which of a set of candidate schema files need publishing, so a sync of a whole schema tree
+    only posts the files that are new to SDS.
+
+    The schema metadata for every survey is fetched once per plan, with a single all_schema_metadata request
+    or from the metadata repository, and each candidate is checked against it in the order given. A candidate
+    with the same survey and version as an earlier one in the plan is a duplicate of it.
+
+    Only errors in the schema files themselves are planned as invalid. Errors reaching GitHub or SDS, such as
+    a failed fetch or metadata request or an open circuit, are raised, as the plan cannot be trusted without them.
+    """
+    def __init__(self, publisher: SchemaPublisher, metadata_repository: SchemaMetadataRepository | None = None):
+        self.publisher = publisher
+        self.validator = SchemaValidatorService(metadata_repository)
+
+    def plan(
+        self, file_names: Iterable[str], concurrency: int = CONFIG.SCHEMA_PUBLISH_RETRIEVE_CONCURRENCY
+    ) -> SchemaPublishPlan:
+        """
+        Plan the publish of the candidate schema files.
+
+        :param file_names: the names of the candidate schema files.
+        :param concurrency: the number of schemas retrieved at once.
+        :return: the plan, with an entry per file in the order given.
+        :raises SchemaPublishError: if a schema file or the schema metadata cannot be fetched.
+        :raises CircuitOpenError: if the circuit breaker for GitHub or SDS is open.
+        """
+        file_names = list(file_names)
+        plan = SchemaPublishPlan()
+        if not file_names:
+            return plan
+
+        with get_instrumentation().start_span("schema.plan", {"schema.files": len(file_names)}) as span:
+            metadata_index = self.validator.start_metadata_run()
+            with ThreadPoolExecutor(min(concurrency, len(file_names)), thread_name_prefix="schema-plan") as pool:
+                for file_name, loaded in zip(file_names, pool.map(self._load, file_names)):
+                    plan.entries.append(self._plan_schema(file_name, loaded, metadata_index))
+
+            span.set_attribute("schema.to_publish", len(plan.to_publish))
+
+        logger.info(f"Planned publish of {len(plan.to_publish)} of {len(plan.entries)} schemas")
+        return plan
+
+    def publish(self, plan: SchemaPublishPlan, dry_run: bool = False) -> list[SchemaPublishResult]:
+        """
+        Publish the files a plan includes with publish_many. Publishers that validate schemas, such as
+        GithubSchemaPublisher, validate each file again as it is published, in case SDS has changed since the
+        plan was made.
+
+        :param plan: the plan to publish.
+        :param dry_run: log the plan instead of publishing it.
+        :return: a result per file published, or no results for a dry run.
+        """
+        if dry_run:
+            logger.info(f"Dry run, not publishing:\n{plan.describe()}")
+            return []
+
+        return self.publisher.publish_many(plan.to_publish)
+
+    def sync(
+        self, file_names: Iterable[str], dry_run: bool = False
+    ) -> tuple[SchemaPublishPlan, list[SchemaPublishResult]]:
+        """
+        Plan the publish of the candidate schema files and publish the files that need it.
+
+        :param file_names: the names of the candidate schema files.
+        :param dry_run: log the plan instead of publishing it.
+        :return: the plan and a result per file published.
+        """
+        plan = self.plan(file_names)
+        return plan, self.publish(plan, dry_run)
+
+    def _load(self, file_name: str) -> Schema | Exception:
+        """
+        Retrieve a candidate schema, returning the error instead if the file is not a valid schema.
+
+        :param file_name: the name of the schema file.
+        :return: the schema, or the error.
+        """
+        try:
+            return self.publisher.load_schema(file_name)
+        except INVALID_SCHEMA_ERRORS as e:
+            return e
+
+    def _plan_schema(
+        self, file_name: str, loaded: Schema | Exception, metadata_index: SchemaMetadataIndex
+    ) -> PlannedSchema:
+        """
+        Decide whether a candidate schema should be published. Schemas planned for publishing are added to the
+        metadata index, so later candidates with the same version are planned as duplicates.
+
+        :param file_name: the name of the schema file.
+        :param loaded: the schema, or the error raised reading it.
+        :param metadata_index: the metadata index of the plan.
+        :return: the plan entry for the file.
+        """
+        if isinstance(loaded, Exception):
+            return PlannedSchema(file_name, PublishPlanReason.INVALID, error=loaded)
+
+        entry = PlannedSchema(file_name, PublishPlanReason.NEW, loaded.survey_id, loaded.schema_version)
+        try:
+            self.validator.validate_schema(loaded, metadata_index)
+        except SchemaVersionMismatchError as e:
+            entry.reason, entry.error = PublishPlanReason.VERSION_MISMATCH, e
+        except SchemaDuplicationError as e:
+            entry.reason, entry.error = PublishPlanReason.DUPLICATE, e
+        except INVALID_SCHEMA_ERRORS as e:
+            entry.reason, entry.error = PublishPlanReason.INVALID, e
+        else:
+            self.validator.record_published(loaded, metadata_index)
+        return entry
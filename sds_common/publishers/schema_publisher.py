@@ -1,14 +1,83 @@
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import asdict
 
+import requests
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.models.schema_models import (
+    ALREADY_PUBLISHED_HEADER,
+    PublishedSchema,
+    SchemaPublishResult,
+    SchemaPublishRun,
+)
+from sds_common.models.schema_publish_errors import SchemaPublishError
+from sds_common.repositories.schema_content_index import SCHEMA_CONTENT_INDEX, SchemaContentIndex
+from sds_common.schema.schema import Schema
 from sds_common.services.sds_schema_request_service import SdsSchemaRequestService
+from sds_common.utilities import json_backend
+from sds_common.utilities.instrumentation import get_instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class SurveyLanes:
+    """
+    Runs tasks on an executor so that tasks for different surveys run concurrently,
+    while tasks for the same survey run one at a time in the order they were submitted.
+    """
+    def __init__(self, executor: Executor):
+        self.executor = executor
+        self._queues: dict[str, deque[Callable[[], None]]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, survey_id: str, task: Callable[[], None]):
+        """
+        Queue a task behind any earlier tasks for the same survey.
+
+        :param survey_id: the survey the task belongs to.
+        :param task: the task to run. It must handle its own exceptions.
+        """
+        with self._lock:
+            if survey_id in self._queues:
+                self._queues[survey_id].append(task)
+                return
+            self._queues[survey_id] = deque([task])
+
+        self.executor.submit(self._drain, survey_id)
+
+    def _drain(self, survey_id: str):
+        """
+        Run the queued tasks for a survey until there are none left.
+
+        :param survey_id: the survey to run tasks for.
+        """
+        while True:
+            with self._lock:
+                queue = self._queues[survey_id]
+                if not queue:
+                    del self._queues[survey_id]
+                    return
+                task = queue.popleft()
+            task()
 
 
 class SchemaPublisher(ABC):
     """
     Abstract base class for schema publishers.
+
+    When a content index is given, or SCHEMA_DEDUP_ENABLED is set, a schema whose content has already been
+    published is not posted again, and a locally built "already published" response is returned instead.
     """
-    def __init__(self):
+    def __init__(self, content_index: SchemaContentIndex | None = None):
         self.schema_request_service = SdsSchemaRequestService()
+        if content_index is None and CONFIG.SCHEMA_DEDUP_ENABLED:
+            content_index = SCHEMA_CONTENT_INDEX
+        self.content_index = content_index
 
     @abstractmethod
     def _retrieve_schema(self, file_name: str) -> dict:
@@ -28,3 +97,236 @@ class SchemaPublisher(ABC):
         :param file_name: The name of the schema file to be published.
         """
         pass
+
+    def _retrieve_schema_bytes(self, file_name: str) -> bytes | None:
+        """
+        Retrieves the schema for the given file name as the raw JSON bytes. Publishers that can do so
+        override this, so the schema is posted with the bytes it was retrieved as rather than re-encoded.
+
+        :param file_name: The name of the schema file to be retrieved.
+        :return: The schema JSON bytes, or None if the publisher can only retrieve the schema as a dictionary.
+        """
+        return None
+
+    def load_schema(self, file_name: str) -> Schema:
+        """
+        Retrieves the schema for the given file name as a Schema object, without validating it.
+
+        :param file_name: The name of the schema file to be loaded.
+        :return: The Schema object.
+        """
+        with get_instrumentation().start_span("schema.retrieve", {"schema.file": file_name}) as span:
+            schema_bytes = self._retrieve_schema_bytes(file_name)
+            if schema_bytes is not None:
+                span.set_attribute("bytes", len(schema_bytes))
+                return Schema.from_bytes(schema_bytes, file_name)
+
+            schema_json = self._retrieve_schema(file_name)
+            return Schema.set_schema(schema_json, file_name)
+
+    def _prepare_schema(
+        self, file_name: str, run: SchemaPublishRun | None = None
+    ) -> tuple[Schema, PublishedSchema | None]:
+        """
+        Retrieves the schema for the given file name and sets up the Schema object ready to be posted,
+        looking up whether its content has already been published.
+
+        :param file_name: The name of the schema file to be prepared.
+        :param run: The publish_many run the schema is prepared in, or None if it is published on its own.
+        :return: The Schema object, and the record of the published schema with the same content, if any.
+        """
+        schema = self.load_schema(file_name)
+        return schema, self._find_published(schema)
+
+    def _post_schema(
+        self, schema: Schema, published: PublishedSchema | None, run: SchemaPublishRun | None = None
+    ) -> requests.Response:
+        """
+        Posts a prepared schema to SDS, unless a schema with the same content has already been published.
+
+        :param schema: The Schema object to post.
+        :param published: The record of the published schema with the same content, as found by _prepare_schema.
+        :param run: The publish_many run the schema is posted in, or None if it is published on its own.
+        :return: The response from SDS, or a response built locally with the ALREADY_PUBLISHED_HEADER set
+            if the content has already been published.
+        """
+        if published is not None:
+            logger.info(
+                f"Skipping schema {schema.filepath}, its content was already published as {published.filepath} "
+                f"(survey {published.survey_id}, version {published.schema_version})"
+            )
+            return self._already_published_response(published)
+
+        attributes = {"schema.file": schema.filepath, "schema.survey_id": schema.survey_id}
+        with get_instrumentation().start_span("schema.post", attributes) as span:
+            response = self.schema_request_service.post_schema(schema)
+            span.set_attribute("http.status_code", response.status_code)
+
+        if self.content_index is not None:
+            self.content_index.record(schema)
+        return response
+
+    def _find_published(self, schema: Schema) -> PublishedSchema | None:
+        """
+        Finds an already published schema with the same content as the given schema.
+
+        :param schema: The Schema object.
+        :return: The record of the published schema, or None if its content has not been published
+            or deduplication is off.
+        """
+        if self.content_index is None:
+            return None
+        return self.content_index.find(schema)
+
+    @staticmethod
+    def _already_published_response(published: PublishedSchema) -> requests.Response:
+        """
+        Builds the response returned in place of posting a schema whose content has already been published,
+        so callers that check for a successful response carry on as if it had been posted.
+
+        :param published: The record of the published schema.
+        :return: A 200 response holding the published schema record.
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "Already Published"
+        response.headers["Content-Type"] = "application/json"
+        response.headers[ALREADY_PUBLISHED_HEADER] = published.content_hash
+        response._content = json_backend.dumps(asdict(published))
+        return response
+
+    def publish_many(
+        self,
+        file_names: Iterable[str],
+        retrieve_concurrency: int = CONFIG.SCHEMA_PUBLISH_RETRIEVE_CONCURRENCY,
+        post_concurrency: int = CONFIG.SCHEMA_PUBLISH_POST_CONCURRENCY,
+    ) -> list[SchemaPublishResult]:
+        """
+        Publishes many schema files, overlapping retrieval and validation of later files with posting of earlier ones.
+        Schemas for the same survey are posted one at a time in the order given, schemas for different surveys
+        are posted concurrently. A failure for one file does not stop the others being published.
+
+        :param file_names: The names of the schema files to publish.
+        :param retrieve_concurrency: The number of schemas retrieved and validated at once.
+        :param post_concurrency: The number of schemas posted at once.
+        :return: A result per file, in the order given, holding the response from SDS or the error raised.
+        """
+        file_names = list(file_names)
+        results = [SchemaPublishResult(file_name) for file_name in file_names]
+
+        with get_instrumentation().start_span("schema.publish_many", {"schema.files": len(file_names)}) as span:
+            run = self._start_run()
+            self._run_pipeline(file_names, results, run, retrieve_concurrency, post_concurrency)
+
+            succeeded = sum(result.succeeded for result in results)
+            span.set_attribute("schema.succeeded", succeeded)
+
+        logger.info(f"Published {succeeded} of {len(results)} schemas")
+        return results
+
+    def _start_run(self) -> SchemaPublishRun:
+        """
+        Called before a batch of schemas is published with publish_many, to set up the state of the run.
+
+        :return: The state of the run, passed to each schema prepared and posted in it.
+        """
+        return SchemaPublishRun()
+
+    def _run_pipeline(
+        self,
+        file_names: list[str],
+        results: list[SchemaPublishResult],
+        run: SchemaPublishRun,
+        retrieve_concurrency: int,
+        post_concurrency: int,
+    ):
+        """
+        Runs the retrieve and post stages of publish_many, recording the outcome of each file on its result.
+
+        :param file_names: The names of the schema files to publish.
+        :param results: The result for each file, in the same order.
+        :param run: The state of the run.
+        :param retrieve_concurrency: The number of schemas retrieved and validated at once.
+        :param post_concurrency: The number of schemas posted at once.
+        """
+        # Bound the number of schemas being retrieved or waiting to be posted, so memory does not grow with the batch.
+        max_prepared_ahead = retrieve_concurrency * 2
+        post_slots = threading.Semaphore(max_prepared_ahead + post_concurrency)
+
+        with (
+            ThreadPoolExecutor(retrieve_concurrency, thread_name_prefix="schema-retrieve") as retrieve_pool,
+            ThreadPoolExecutor(post_concurrency, thread_name_prefix="schema-post") as post_pool,
+        ):
+            lanes = SurveyLanes(post_pool)
+            pending: deque[tuple[int, Future]] = deque()
+            remaining = iter(enumerate(file_names))
+
+            def submit_next():
+                for index, file_name in remaining:
+                    pending.append((index, retrieve_pool.submit(self._prepare_schema, file_name, run)))
+                    return
+
+            for _ in range(max_prepared_ahead):
+                submit_next()
+
+            while pending:
+                index, future = pending.popleft()
+                submit_next()
+
+                try:
+                    schema, published = future.result()
+                except SchemaPublishError as e:
+                    self._record_failure(results[index], e)
+                    continue
+                except Exception as e:
+                    logger.exception(f"Unexpected error preparing schema {results[index].file_name}")
+                    results[index].error = e
+                    continue
+
+                post_slots.acquire()
+                lanes.submit(
+                    schema.survey_id, self._post_task(results[index], schema, published, run, post_slots.release)
+                )
+
+    def _post_task(
+        self,
+        result: SchemaPublishResult,
+        schema: Schema,
+        published: PublishedSchema | None,
+        run: SchemaPublishRun,
+        on_done: Callable[[], None],
+    ) -> Callable[[], None]:
+        """
+        Build the task that posts a schema and records the outcome on its result.
+
+        :param result: The result to record the outcome on.
+        :param schema: The Schema object to post.
+        :param published: The record of the published schema with the same content, if any.
+        :param run: The state of the run.
+        :param on_done: Called once the post has finished, whether or not it succeeded.
+        :return: The task.
+        """
+        def post():
+            try:
+                result.response = self._post_schema(schema, published, run)
+            except SchemaPublishError as e:
+                self._record_failure(result, e)
+            except Exception as e:
+                logger.exception(f"Unexpected error posting schema {result.file_name}")
+                result.error = e
+            finally:
+                on_done()
+
+        return post
+
+    @staticmethod
+    def _record_failure(result: SchemaPublishResult, error: SchemaPublishError):
+        """
+        Record the error raised while publishing a schema file. Unexpected errors are recorded by the caller,
+        which logs them with their traceback.
+
+        :param result: The result to record the error on.
+        :param error: The error raised.
+        """
+        logger.error(f"Failed to publish schema {result.file_name}: {error.error_message}")
+        result.error = error
@@ -1,12 +1,35 @@
-import json
+from __future__ import annotations
+
+import base64
+import mmap
 import os
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
-from google.cloud import storage
+from sds_common.config.config import CONFIG
 from sds_common.config.logging_config import logging
 from sds_common.interfaces.file_repository_interface import FileRepositoryInterface
+from sds_common.models.file_transfer_errors import ChecksumMismatchError
+from sds_common.models.file_transfer_models import (
+    BatchOperationResult,
+    FileOperationResult,
+    TransferStats,
+)
+from sds_common.utilities import json_backend
+from sds_common.utilities.instrumentation import Span, get_instrumentation
+from sds_common.utilities.json_stream import iter_json_items
+
+if TYPE_CHECKING:
+    from google.cloud import storage
 
 logger = logging.getLogger(__name__)
 
+# The maximum number of source objects GCS accepts in a single compose request.
+MAX_COMPOSE_SOURCES = 32
+
 
 class BucketFileRepository(FileRepositoryInterface):
     def __init__(self, bucket: storage.Bucket):
@@ -19,17 +42,170 @@ class BucketFileRepository(FileRepositoryInterface):
         :param filename: name of file being loaded.
         :return: dict: the file loaded as json.
         """
-        return json.loads(self.bucket.blob(filename).download_as_string())
+        return json_backend.loads(self._download_as_bytes(filename))
+
+    def get_file_as_bytes(self, filename: str) -> bytes:
+        """
+        Gets the contents of a file from a Google Cloud Bucket with a specific filename.
+
+        :param filename: name of file being loaded.
+        :return: bytes: the file contents.
+        """
+        return self._download_as_bytes(filename)
+
+    def stream_json_items(self, filename: str, path: str | None = None, chunk_size: int | None = None) -> Iterator[Any]:
+        """
+        Streams the items of a JSON array in a file from a Google Cloud Bucket one at a time.
+        The blob is downloaded in chunks, so peak memory is bounded by the chunk size plus the largest single item.
+
+        :param filename: name of file being loaded.
+        :param path: dotted path of object keys leading to the array, e.g. "data", or None for a top level array.
+        :param chunk_size: the number of bytes downloaded at a time, defaulting to JSON_STREAM_CHUNK_SIZE.
+        :return: a generator of the array items.
+        """
+        chunk_size = chunk_size or CONFIG.JSON_STREAM_CHUNK_SIZE
+        with self.bucket.blob(filename).open("rb", chunk_size=chunk_size) as reader:
+            yield from iter_json_items(reader, path, chunk_size)
 
-    def upload_file_from_path(self, filepath: str):
+    def upload_file_from_path(
+        self, filepath: str, chunk_size: int | None = CONFIG.FILE_TRANSFER_CHUNK_SIZE
+    ) -> TransferStats:
         """
         Uploads a file to the bucket from a local file path.
+        When a chunk size is given the file is sent as a resumable upload in chunks of that size,
+        so an interrupted chunk is retried on its own rather than restarting the whole upload.
 
         :param filepath: path to the local file to be uploaded.
+        :param chunk_size: the resumable upload chunk size in bytes, a multiple of 256 KiB, defaulting to
+            FILE_TRANSFER_CHUNK_SIZE, or None to upload in a single request.
+        :return: the size, duration and throughput of the upload.
         """
         filename = os.path.basename(filepath)
-        blob = self.bucket.blob(filename)
-        blob.upload_from_filename(filepath)
+        with self._start_span("gcs.upload", filename) as span:
+            blob = self.bucket.blob(filename, chunk_size=chunk_size)
+            start = time.monotonic()
+            blob.upload_from_filename(filepath, checksum="crc32c")
+            stats = TransferStats(filename, os.path.getsize(filepath), time.monotonic() - start)
+            return self._log_transfer(stats, span)
+
+    def upload_file_in_parts(
+        self,
+        filepath: str,
+        part_size: int = CONFIG.FILE_TRANSFER_PART_SIZE,
+        max_workers: int = CONFIG.FILE_TRANSFER_MAX_WORKERS,
+    ) -> TransferStats:
+        """
+        Uploads a large file to the bucket as parts uploaded in parallel, which are then composed into a single object.
+        The crc32c of the composed object is checked against the local file, and the parts are deleted afterwards.
+
+        :param filepath: path to the local file to be uploaded.
+        :param part_size: the size of each part in bytes.
+        :param max_workers: the number of parts uploaded at once.
+        :return: the size, duration and throughput of the upload.
+        :raises ChecksumMismatchError: if the composed object does not match the local file.
+        """
+        filename = os.path.basename(filepath)
+        with self._start_span("gcs.upload", filename) as span:
+            size = os.path.getsize(filepath)
+            offsets = list(range(0, size, part_size)) or [0]
+            prefix = f"{filename}.parts-{uuid.uuid4().hex}"
+            start = time.monotonic()
+
+            def upload_part(index: int) -> storage.Blob:
+                with open(filepath, "rb") as file:
+                    file.seek(offsets[index])
+                    data = file.read(part_size)
+                part = self.bucket.blob(f"{prefix}/{index:05d}")
+                part.upload_from_string(data, content_type="application/octet-stream", checksum="crc32c")
+                return part
+
+            with ThreadPoolExecutor(max_workers) as executor:
+                parts = list(executor.map(upload_part, range(len(offsets))))
+                temporary_blobs = list(parts)
+
+                try:
+                    blob = self._compose(filename, parts, prefix, executor, temporary_blobs)
+                finally:
+                    list(executor.map(self._delete_quietly, temporary_blobs))
+
+            blob.reload()
+            self._verify_checksum(filename, blob.crc32c, self._file_crc32c(filepath))
+            stats = TransferStats(filename, size, time.monotonic() - start, len(offsets))
+            return self._log_transfer(stats, span)
+
+    def download_file_to_path(
+        self,
+        filename: str,
+        destination: str,
+        slice_size: int = CONFIG.FILE_TRANSFER_PART_SIZE,
+        max_workers: int = CONFIG.FILE_TRANSFER_MAX_WORKERS,
+    ) -> TransferStats:
+        """
+        Downloads a file from the bucket to a local path as byte ranges fetched in parallel.
+        Every range is pinned to the same object generation and the result is checked against the object's crc32c.
+
+        :param filename: name of the file to be downloaded.
+        :param destination: the local path to write the file to.
+        :param slice_size: the size of each byte range in bytes.
+        :param max_workers: the number of byte ranges downloaded at once.
+        :return: the size, duration and throughput of the download.
+        :raises ChecksumMismatchError: if the downloaded file does not match the object.
+        """
+        with self._start_span("gcs.download", filename) as span:
+            blob = self.bucket.blob(filename)
+            blob.reload()
+            start = time.monotonic()
+
+            with open(destination, "wb+") as file:
+                file.truncate(blob.size)
+                fd = file.fileno()
+
+                def write(offset: int, data: bytes):
+                    os.pwrite(fd, data, offset)
+
+                slices = self._download_slices(blob, slice_size, max_workers, write)
+
+            self._verify_checksum(filename, blob.crc32c, self._file_crc32c(destination))
+            return self._log_transfer(TransferStats(filename, blob.size, time.monotonic() - start, slices), span)
+
+    def download_file_to_buffer(
+        self,
+        filename: str,
+        slice_size: int = CONFIG.FILE_TRANSFER_PART_SIZE,
+        max_workers: int = CONFIG.FILE_TRANSFER_MAX_WORKERS,
+    ) -> tuple[mmap.mmap, TransferStats]:
+        """
+        Downloads a file from the bucket into an anonymous memory-mapped buffer as byte ranges fetched in parallel.
+        The caller is responsible for closing the buffer.
+
+        :param filename: name of the file to be downloaded.
+        :param slice_size: the size of each byte range in bytes.
+        :param max_workers: the number of byte ranges downloaded at once.
+        :return: the buffer holding the file, and the size, duration and throughput of the download.
+        :raises ChecksumMismatchError: if the downloaded file does not match the object.
+        """
+        with self._start_span("gcs.download", filename) as span:
+            blob = self.bucket.blob(filename)
+            blob.reload()
+            start = time.monotonic()
+            # mmap does not accept a length of 0, so empty files get a one byte buffer.
+            buffer = mmap.mmap(-1, max(blob.size, 1))
+
+            def write(offset: int, data: bytes):
+                buffer[offset:offset + len(data)] = data
+
+            try:
+                slices = self._download_slices(blob, slice_size, max_workers, write)
+                chunks = (
+                    buffer[offset:min(offset + slice_size, blob.size)] for offset in range(0, blob.size, slice_size)
+                )
+                self._verify_checksum(filename, blob.crc32c, self._crc32c(chunks))
+            except Exception:
+                buffer.close()
+                raise
+
+            stats = TransferStats(filename, blob.size, time.monotonic() - start, slices)
+            return buffer, self._log_transfer(stats, span)
 
     def delete_file(self, filename: str):
         """
@@ -37,8 +213,8 @@ class BucketFileRepository(FileRepositoryInterface):
 
         :param filename: name of the file to be deleted.
         """
-        blob = self.bucket.blob(filename)
-        blob.delete()
+        with self._start_span("gcs.delete", filename):
+            self.bucket.blob(filename).delete()
 
     def check_file_exists(self, filename: str) -> bool:
         """
@@ -47,5 +223,236 @@ class BucketFileRepository(FileRepositoryInterface):
         :param filename: name of the file to be checked.
         :return: True if file exists, False otherwise.
         """
+        with self._start_span("gcs.exists", filename):
+            return self.bucket.blob(filename).exists()
+
+    def delete_files(
+        self, filenames: Iterable[str], max_workers: int = CONFIG.FILE_BATCH_MAX_WORKERS
+    ) -> BatchOperationResult:
+        """
+        Deletes many files from the bucket concurrently. A failure to delete one file does not stop the others.
+
+        :param filenames: names of the files to be deleted.
+        :param max_workers: the number of files deleted at once.
+        :return: a result per file, in the order given, holding the error raised for any file that was not deleted.
+        """
+        result = self._run_batch(
+            "gcs.delete_many", filenames, lambda filename: self.bucket.blob(filename).delete(), max_workers
+        )
+        logger.info(f"Deleted {len(result.succeeded)} of {len(result.results)} files")
+        return result
+
+    def files_exist(
+        self, filenames: Iterable[str], max_workers: int = CONFIG.FILE_BATCH_MAX_WORKERS
+    ) -> BatchOperationResult:
+        """
+        Checks if many files exist in the bucket concurrently.
+
+        :param filenames: names of the files to be checked.
+        :param max_workers: the number of files checked at once.
+        :return: a result per file, in the order given, holding True if the file exists, False otherwise,
+            or the error raised if the check failed.
+        """
+        return self._run_batch(
+            "gcs.exists_many", filenames, lambda filename: self.bucket.blob(filename).exists(), max_workers
+        )
+
+    def list_files(self, prefix: str | None = None, page_size: int = CONFIG.FILE_LIST_PAGE_SIZE) -> Iterator[str]:
+        """
+        Lists the names of the files in the bucket, fetching a page of results at a time as the iterator is consumed.
+        The listing is timed by a single span, which ends when the generator is exhausted or closed.
+
+        :param prefix: only list files whose names begin with the prefix.
+        :param page_size: the number of files fetched per request.
+        :return: a generator of file names.
+        """
+        # The span is not made current, as the generator may be resumed from another context.
+        span = get_instrumentation().start_span("gcs.list", {"gcs.bucket": self.bucket.name, "gcs.prefix": prefix})
+        listed = 0
+        error = None
+        try:
+            for blob in self.bucket.list_blobs(prefix=prefix, page_size=page_size):
+                listed += 1
+                yield blob.name
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            span.set_attribute("gcs.items", listed)
+            span.end(error)
+
+    def _download_as_bytes(self, filename: str) -> bytes:
+        """
+        Downloads the contents of a file in a single request.
+
+        :param filename: name of the file to be downloaded.
+        :return: the file contents.
+        """
+        with self._start_span("gcs.download", filename) as span:
+            data = self.bucket.blob(filename).download_as_bytes()
+            span.set_attribute("bytes", len(data))
+            return data
+
+    def _start_span(self, operation: str, filename: str) -> Span:
+        """
+        Start the span of an operation on a file in the bucket.
+
+        :param operation: the name of the operation.
+        :param filename: name of the file.
+        :return: the span.
+        """
+        return get_instrumentation().start_span(operation, {"gcs.bucket": self.bucket.name, "gcs.blob": filename})
+
+    def _run_batch(
+        self, span_name: str, filenames: Iterable[str], operation: Callable[[str], Any], max_workers: int
+    ) -> BatchOperationResult:
+        """
+        Runs an operation on many files concurrently, capturing the value or error for each file.
+        The batch is timed by a single span recording the number of files and failures.
+
+        :param span_name: the name of the span of the batch.
+        :param filenames: names of the files to run the operation on.
+        :param operation: the operation, called with a file name.
+        :param max_workers: the number of operations run at once.
+        :return: a result per file, in the order given.
+        """
+        def run(filename: str) -> FileOperationResult:
+            try:
+                return FileOperationResult(filename, value=operation(filename))
+            except Exception as e:
+                logger.exception(f"Batch operation failed for file {filename}")
+                return FileOperationResult(filename, error=e)
+
+        with get_instrumentation().start_span(span_name, {"gcs.bucket": self.bucket.name}) as span:
+            with ThreadPoolExecutor(max_workers) as executor:
+                result = BatchOperationResult(list(executor.map(run, filenames)))
+            span.set_attribute("gcs.items", len(result.results))
+            span.set_attribute("gcs.failures", len(result.failed))
+            return result
+
+    def _compose(
+        self,
+        filename: str,
+        parts: list[storage.Blob],
+        prefix: str,
+        executor: ThreadPoolExecutor,
+        temporary_blobs: list[storage.Blob],
+    ) -> storage.Blob:
+        """
+        Composes the parts into a single object, composing groups of parts into intermediate objects in parallel
+        while there are more parts than a single compose request accepts.
+
+        :param filename: the name of the final object.
+        :param parts: the parts in order.
+        :param prefix: the prefix for intermediate objects.
+        :param executor: the executor to compose groups on.
+        :param temporary_blobs: list the intermediate objects are added to, so they can be deleted afterwards.
+        :return: the composed object.
+        """
+        level = 0
+        while len(parts) > MAX_COMPOSE_SOURCES:
+            groups = [parts[i:i + MAX_COMPOSE_SOURCES] for i in range(0, len(parts), MAX_COMPOSE_SOURCES)]
+            intermediates = [self.bucket.blob(f"{prefix}/level-{level}-{i:05d}") for i in range(len(groups))]
+            temporary_blobs.extend(intermediates)
+            list(executor.map(lambda blob, group: blob.compose(group), intermediates, groups))
+            parts = intermediates
+            level += 1
+
         blob = self.bucket.blob(filename)
-        return blob.exists()
+        blob.compose(parts)
+        return blob
+
+    @staticmethod
+    def _download_slices(blob: storage.Blob, slice_size: int, max_workers: int, write) -> int:
+        """
+        Downloads a blob as byte ranges in parallel, passing each range to the write callback as it arrives.
+
+        :param blob: the blob to download, with its metadata loaded.
+        :param slice_size: the size of each byte range in bytes.
+        :param max_workers: the number of byte ranges downloaded at once.
+        :param write: callback taking the offset and bytes of each range.
+        :return: the number of ranges downloaded.
+        """
+        offsets = range(0, blob.size, slice_size)
+
+        def download_slice(offset: int):
+            end = min(offset + slice_size, blob.size) - 1
+            # Checksums are only available for the whole object, so they are checked after all ranges are written.
+            data = blob.download_as_bytes(
+                start=offset, end=end, if_generation_match=blob.generation, checksum=None
+            )
+            write(offset, data)
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            list(executor.map(download_slice, offsets))
+
+        return len(offsets)
+
+    @staticmethod
+    def _delete_quietly(blob: storage.Blob):
+        """
+        Deletes a temporary blob, logging rather than raising on failure.
+
+        :param blob: the blob to delete.
+        """
+        try:
+            blob.delete()
+        except Exception:
+            logger.warning(f"Failed to delete temporary blob {blob.name}", exc_info=True)
+
+    @staticmethod
+    def _crc32c(chunks: Iterable[bytes]) -> str:
+        """
+        Calculates the crc32c of data in the base64 encoding used by GCS object metadata.
+
+        :param chunks: the data to checksum, in order.
+        :return: the base64 encoded crc32c.
+        """
+        import google_crc32c
+
+        checksum = google_crc32c.Checksum()
+        for chunk in chunks:
+            checksum.update(chunk)
+        return base64.b64encode(checksum.digest()).decode("utf-8")
+
+    @classmethod
+    def _file_crc32c(cls, filepath: str, chunk_size: int = 1024 * 1024) -> str:
+        """
+        Calculates the crc32c of a local file in the base64 encoding used by GCS object metadata.
+
+        :param filepath: path to the local file.
+        :param chunk_size: the number of bytes read at a time.
+        :return: the base64 encoded crc32c.
+        """
+        with open(filepath, "rb") as file:
+            return cls._crc32c(iter(lambda: file.read(chunk_size), b""))
+
+    @staticmethod
+    def _verify_checksum(filename: str, expected: str | None, actual: str):
+        """
+        Checks a calculated crc32c against the crc32c in the object metadata.
+
+        :param filename: the name of the file, for the error message.
+        :param expected: the crc32c from the object metadata.
+        :param actual: the calculated crc32c.
+        :raises ChecksumMismatchError: if the checksums differ.
+        """
+        if expected is not None and expected != actual:
+            raise ChecksumMismatchError(filename, expected, actual)
+
+    @staticmethod
+    def _log_transfer(stats: TransferStats, span: Span) -> TransferStats:
+        """
+        Logs the throughput of a completed transfer, and records its size on the span of the transfer.
+
+        :param stats: the transfer stats.
+        :param span: the span of the transfer.
+        :return: the transfer stats.
+        """
+        span.set_attribute("bytes", stats.bytes_transferred)
+        span.set_attribute("gcs.parts", stats.parts)
+        logger.info(
+            f"Transferred {stats.filename}: {stats.bytes_transferred} bytes in {stats.parts} part(s) "
+            f"in {stats.duration_seconds:.2f}s ({stats.throughput_mb_per_second:.2f} MiB/s)"
+        )
+        return stats
@@ -1,12 +1,29 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
 from sds_common.config.config import CONFIG
-from google.cloud import exceptions, storage
 from sds_common.enums.buckets import Bucket
+from sds_common.enums.client_types import ClientType
+
+if TYPE_CHECKING:
+    from google.cloud import storage
 
 
 class BucketLoader:
 
     def __init__(self):
-        self._client = storage.Client(project=CONFIG.PROJECT_ID)
+        self._client = None
+
+    @property
+    def client(self) -> storage.Client:
+        """
+        The shared Google Cloud Storage client, fetched from the client registry on first use.
+        """
+        if self._client is None:
+            self._client = CLIENT_REGISTRY.get(ClientType.STORAGE, CONFIG.PROJECT_ID)
+        return self._client
 
     def fetch_bucket(self, bucket: Bucket) -> storage.Bucket:
         """
@@ -20,11 +37,13 @@ class BucketLoader:
         if not isinstance(bucket, Bucket):
             raise TypeError(f"Expected bucket to be an instance of Bucket enum, got {type(bucket)}")
 
+        from google.api_core import exceptions
+
         attr_name = bucket.name.lower()
 
         if not hasattr(self, attr_name):
             try:
-                bucket_instance = self._client.get_bucket(bucket.value)
+                bucket_instance = self.client.get_bucket(bucket.value)
                 setattr(self, attr_name, bucket_instance)
             except exceptions.NotFound as exc:
                 raise Exception(f"Bucket {bucket.value} not found") from exc
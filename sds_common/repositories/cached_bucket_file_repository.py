@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.repositories.bucket_file_repository import BucketFileRepository
+from sds_common.utilities import json_backend
+from sds_common.utilities.blob_cache import BlobCache
+
+if TYPE_CHECKING:
+    from google.cloud import storage
+
+logger = logging.getLogger(__name__)
+
+BLOB_CACHE = BlobCache(
+    ttl=CONFIG.FILE_CACHE_TTL,
+    max_memory_bytes=CONFIG.FILE_CACHE_MAX_MEMORY_BYTES,
+    cache_dir=CONFIG.FILE_CACHE_DIR or None,
+    disk_max_age=CONFIG.FILE_CACHE_DISK_MAX_AGE,
+)
+
+
+class CachedBucketFileRepository(BucketFileRepository):
+    """
+    BucketFileRepository that serves files from a read-through BlobCache.
+
+    A cached file younger than the cache TTL is returned without contacting the bucket. Older entries are
+    revalidated with a download conditional on the generation changing, so an unchanged file costs a single
+    request with no body, and a changed file is downloaded in the same request.
+
+    Parsed files are held in the cache and returned to every caller as-is, so the dicts returned by
+    get_file_as_json are shared between callers and must be treated as read-only. Callers that need to modify
+    a file should copy it first.
+    """
+    def __init__(self, bucket: storage.Bucket, cache: BlobCache = BLOB_CACHE):
+        super().__init__(bucket)
+        self.cache = cache
+
+    def get_file_as_json(self, filename: str) -> dict:
+        """
+        Gets a file from a Google Cloud Bucket with a specific filename and loads it as json, using the cache.
+        The returned value is shared with other callers and must not be modified.
+
+        :param filename: name of file being loaded.
+        :return: dict: the file loaded as json.
+        """
+        return self._get_cached(filename, json_backend.loads, "json")
+
+    def get_file_as_bytes(self, filename: str) -> bytes:
+        """
+        Gets the contents of a file from a Google Cloud Bucket with a specific filename, using the cache.
+
+        :param filename: name of file being loaded.
+        :return: bytes: the file contents.
+        """
+        return self._get_cached(filename, bytes, "bytes")
+
+    def _get_cached(self, filename: str, parse: Callable[[bytes], Any], variant: str) -> Any:
+        """
+        Gets a file through the cache, parsing its contents on a miss. Each variant is held separately in
+        memory, while the file contents on disk are shared by every variant.
+
+        :param filename: name of file being loaded.
+        :param parse: turns the file contents into the value to cache and return.
+        :param variant: the name the parsed value is cached under.
+        :return: the parsed file contents.
+        """
+        from google.api_core.exceptions import NotModified
+
+        bucket_name = self.bucket.name
+        entry = self.cache.get(bucket_name, filename, variant)
+
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record("memory_hits")
+            return entry.value
+
+        generation = None
+        cached_data = None
+        if entry is not None:
+            generation = entry.generation
+        else:
+            cached_data = self.cache.read_disk(bucket_name, filename)
+            if cached_data is not None:
+                generation = cached_data[0]
+
+        blob = self.bucket.blob(filename)
+
+        with self._start_span("gcs.download", filename) as span:
+            try:
+                data = blob.download_as_bytes(if_generation_not_match=generation)
+            except NotModified:
+                data = None
+            span.set_attribute("bytes", len(data) if data is not None else 0)
+            span.set_attribute("gcs.not_modified", data is None)
+
+        if data is None:
+            if entry is not None:
+                self.cache.record("revalidations")
+                self.cache.mark_validated(bucket_name, filename, entry, variant)
+                return entry.value
+
+            self.cache.record("disk_hits")
+            value = parse(cached_data[1])
+            self.cache.set(bucket_name, filename, generation, value, cached_data[1], variant)
+            return value
+
+        self.cache.record("misses")
+        value = parse(data)
+        if blob.generation is not None:
+            self.cache.set(bucket_name, filename, blob.generation, value, data, variant)
+        return value
+
+    def delete_file(self, filename: str):
+        """
+        Deletes a file from the bucket with the specified filename, and removes it from the cache.
+
+        :param filename: name of the file to be deleted.
+        """
+        super().delete_file(filename)
+        self.cache.invalidate(self.bucket.name, filename)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import io
+import os
+import posixpath
+import tarfile
+import zipfile
+from collections.abc import Iterable, Iterator
+from fnmatch import fnmatch
+from typing import BinaryIO
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.models.schema_publish_errors import SchemaFetchError, SchemaSnapshotError
+from sds_common.services.http_service import HttpService
+from sds_common.utilities.instrumentation import get_instrumentation
+
+logger = logging.getLogger(__name__)
+
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+class GithubSchemaSnapshot:
+    """
+    The schema files of one revision of the sds-schema-definitions repository, extracted from a single
+    tarball or zipball instead of being fetched one file at a time.
+
+    Only files matching the include patterns are extracted, keyed by their path in the repository. They are
+    held in memory, or written under extract_dir when one is given and read back when asked for. Every file
+    served comes from the same revision, even if the branch moves while schemas are being published.
+    """
+    def __init__(self, revision: str, extract_dir: str | None = None):
+        self.revision = revision
+        self.extract_dir = extract_dir
+        self._files: dict[str, bytes | None] = {}
+
+    @classmethod
+    def download(
+        cls,
+        revision: str,
+        archive_url: str = CONFIG.GITHUB_SCHEMA_ARCHIVE_URL,
+        include: Iterable[str] = ("*.json",),
+        extract_dir: str | None = None,
+    ) -> GithubSchemaSnapshot:
+        """
+        Download the archive of a revision and extract the schema files from it. A tarball is extracted as it
+        is downloaded, without holding the whole archive in memory.
+
+        :param revision: the commit SHA, or a branch or tag name, to download.
+        :param archive_url: the URL the revision is appended to, to download its tarball or zipball.
+        :param include: glob patterns of the repository paths to extract.
+        :param extract_dir: the directory to extract files into, or None to hold them in memory.
+        :return: the snapshot.
+        :raises SchemaFetchError: if the archive cannot be downloaded.
+        """
+        url = archive_url + revision
+        logger.info(f"Downloading schema archive from {url}")
+        with HttpService.create(False).make_get_request(url, stream=True) as response:
+            if response.status_code != 200:
+                raise SchemaFetchError(revision, response.status_code, url)
+
+            response.raw.decode_content = True
+            return cls.from_archive(response.raw, revision, include, extract_dir)
+
+    @classmethod
+    def from_archive(
+        cls,
+        archive: str | BinaryIO,
+        revision: str,
+        include: Iterable[str] = ("*.json",),
+        extract_dir: str | None = None,
+        strip_components: int = 1,
+    ) -> GithubSchemaSnapshot:
+        """
+        Extract the schema files from a tarball or zipball, such as one downloaded from GitHub.
+        Tarballs are read as a stream, so the archive is never unpacked in full. A zipball read from a stream
+        that cannot seek is read into memory first, as its index is at the end of the file.
+
+        :param archive: the path to the archive, or a binary file holding it, which need not be seekable.
+        :param revision: the revision the archive holds, reported in errors.
+        :param include: glob patterns of the repository paths to extract.
+        :param extract_dir: the directory to extract files into, or None to hold them in memory.
+        :param strip_components: the number of leading directories to remove from each path in the archive.
+            GitHub archives hold the repository under a single directory named after the repository and revision.
+        :return: the snapshot.
+        """
+        snapshot = cls(revision, extract_dir)
+        include = tuple(include)
+
+        with get_instrumentation().start_span("schema.snapshot", {"schema.revision": revision}) as span:
+            if isinstance(archive, str):
+                with open(archive, "rb") as file:
+                    snapshot._extract(file, include, strip_components)
+            else:
+                snapshot._extract(archive, include, strip_components)
+            span.set_attribute("schema.files", len(snapshot))
+
+        logger.info(f"Extracted {len(snapshot)} schema files from the archive of revision {revision}")
+        return snapshot
+
+    def paths(self) -> list[str]:
+        """
+        Get the paths of the files in the snapshot.
+
+        :return: the paths, sorted.
+        """
+        return sorted(self._files)
+
+    def read(self, path: str) -> bytes:
+        """
+        Get the raw bytes of a file in the snapshot.
+
+        :param path: the path to the file in the repository.
+        :return: the raw bytes of the file.
+        :raises SchemaSnapshotError: if the file is not in the snapshot.
+        """
+        if path not in self._files:
+            raise SchemaSnapshotError(path, self.revision)
+
+        data = self._files[path]
+        if data is not None:
+            return data
+
+        with open(os.path.join(self.extract_dir, *path.split("/")), "rb") as file:
+            return file.read()
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths())
+
+    def _extract(self, file: BinaryIO, include: tuple[str, ...], strip_components: int):
+        """
+        Extract the matching files from an archive, detecting whether it is a zipball or a tarball.
+
+        :param file: the binary file holding the archive.
+        :param include: glob patterns of the repository paths to extract.
+        :param strip_components: the number of leading directories to remove from each path.
+        """
+        if file.seekable():
+            start = file.tell()
+            is_zip = file.read(len(ZIP_MAGIC)) == ZIP_MAGIC
+            file.seek(start)
+        else:
+            # Peek at the magic number through a buffer, so a tarball can still be read as a stream.
+            file = file if hasattr(file, "peek") else io.BufferedReader(file)
+            is_zip = file.peek(len(ZIP_MAGIC))[: len(ZIP_MAGIC)] == ZIP_MAGIC
+            if is_zip:
+                file = io.BytesIO(file.read())
+
+        if is_zip:
+            with zipfile.ZipFile(file) as archive:
+                for info in archive.infolist():
+                    path = self._repository_path(info.filename, strip_components, include)
+                    if path is not None and not info.is_dir():
+                        self._add(path, archive.read(info))
+        else:
+            with tarfile.open(fileobj=file, mode="r|*") as archive:
+                for member in archive:
+                    path = self._repository_path(member.name, strip_components, include)
+                    if path is not None and member.isfile():
+                        self._add(path, archive.extractfile(member).read())
+
+    @staticmethod
+    def _repository_path(name: str, strip_components: int, include: tuple[str, ...]) -> str | None:
+        """
+        Get the repository path of a file in an archive, if it should be extracted.
+
+        :param name: the name of the file in the archive.
+        :param strip_components: the number of leading directories to remove.
+        :param include: glob patterns of the repository paths to extract.
+        :return: the repository path, or None if the file is outside the repository or does not match.
+        """
+        parts = posixpath.normpath(name).split("/")
+        # After normalising, any ".." leads the path, so check before stripping it away.
+        if parts[0] in ("", "..", "."):
+            return None
+
+        parts = parts[strip_components:]
+        if not parts:
+            return None
+
+        path = "/".join(parts)
+        if not any(fnmatch(path, pattern) for pattern in include):
+            return None
+        return path
+
+    def _add(self, path: str, data: bytes):
+        """
+        Add a file to the snapshot, writing it under extract_dir when there is one.
+
+        :param path: the path to the file in the repository.
+        :param data: the raw bytes of the file.
+        """
+        if self.extract_dir is None:
+            self._files[path] = data
+            return
+
+        target = os.path.join(self.extract_dir, *path.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as file:
+            file.write(data)
+        self._files[path] = None
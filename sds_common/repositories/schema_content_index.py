@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+from datetime import UTC, datetime
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.interfaces.schema_manifest_interface import SchemaManifestInterface
+from sds_common.models.schema_models import PublishedSchema
+from sds_common.schema.schema import Schema
+from sds_common.utilities.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaContentIndex:
+    """
+    Content-addressed index of the schemas published to SDS, keyed by the hash of their canonicalised JSON,
+    so a schema whose content has already been published is found before it is posted again.
+
+    Schemas published by this process are held in memory. With a manifest, schemas published by other processes
+    are found too, and lookups that miss the manifest are remembered for miss_ttl seconds so a schema is not
+    looked up repeatedly while it is being published. The index only records what has been posted, so a schema
+    removed from SDS afterwards is still treated as published until it is removed from the manifest.
+    """
+    def __init__(self, manifest: SchemaManifestInterface | None = None, miss_ttl: float = CONFIG.SCHEMA_DEDUP_MISS_TTL):
+        self.manifest = manifest
+        self._records: dict[str, PublishedSchema] = {}
+        self._misses: TTLCache[str, bool] = TTLCache(miss_ttl)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> SchemaContentIndex:
+        """
+        Create an index backed by the manifest named by SCHEMA_DEDUP_MANIFEST: "none", "firestore" or "gcs".
+
+        :return: the index.
+        :raises ValueError: if the manifest type is not known.
+        """
+        manifest_type = str(CONFIG.SCHEMA_DEDUP_MANIFEST).lower()
+        if manifest_type == "none":
+            return cls()
+
+        from sds_common.repositories.schema_manifest_repository import BucketSchemaManifest, FirestoreSchemaManifest
+
+        if manifest_type == "firestore":
+            return cls(FirestoreSchemaManifest())
+        if manifest_type == "gcs":
+            return cls(BucketSchemaManifest())
+        raise ValueError(f"Unknown schema manifest {manifest_type}, expected none, firestore or gcs")
+
+    def find(self, schema: Schema) -> PublishedSchema | None:
+        """
+        Find an already published schema with the same content as a schema. A failure to read the manifest
+        is logged and treated as a miss, so the schema is posted rather than the publish failing.
+
+        :param schema: the schema.
+        :return: the record of the published schema, or None if its content has not been published.
+        """
+        content_hash = schema.content_hash
+        with self._lock:
+            record = self._records.get(content_hash)
+        if record is not None or self.manifest is None or self._misses.get(content_hash):
+            return record
+
+        try:
+            record = self.manifest.get(content_hash)
+        except Exception as e:
+            logger.warning(f"Failed to look up schema {schema.filepath} in the schema manifest: {e}", exc_info=True)
+            return None
+
+        if record is None:
+            self._misses.set(content_hash, True)
+            return None
+
+        with self._lock:
+            self._records[content_hash] = record
+        return record
+
+    def record(self, schema: Schema) -> PublishedSchema:
+        """
+        Record that a schema has been published. A failure to write the manifest is logged rather than raised,
+        as the schema has already been posted.
+
+        :param schema: the schema.
+        :return: the published schema record.
+        """
+        record = PublishedSchema(
+            content_hash=schema.content_hash,
+            survey_id=schema.survey_id,
+            schema_version=schema.schema_version,
+            filepath=schema.filepath,
+            published_at=datetime.now(UTC).isoformat(),
+        )
+        with self._lock:
+            self._records[record.content_hash] = record
+        self._misses.delete(record.content_hash)
+
+        if self.manifest is not None:
+            try:
+                self.manifest.put(record)
+            except Exception as e:
+                logger.warning(f"Failed to record schema {schema.filepath} in the schema manifest: {e}", exc_info=True)
+
+        return record
+
+
+SCHEMA_CONTENT_INDEX = SchemaContentIndex.from_config()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
+from sds_common.config.config import CONFIG
+from sds_common.enums.client_types import ClientType
+from sds_common.interfaces.schema_manifest_interface import SchemaManifestInterface
+from sds_common.models.schema_models import PublishedSchema
+from sds_common.utilities import json_backend
+
+if TYPE_CHECKING:
+    from google.cloud import firestore, storage
+
+
+def _key(content_hash: str) -> str:
+    """
+    Get the document or object key for a content hash, without the algorithm prefix.
+
+    :param content_hash: the content hash, e.g. "sha256:ab12...".
+    :return: the key.
+    """
+    return content_hash.partition(":")[2] or content_hash
+
+
+class FirestoreSchemaManifest(SchemaManifestInterface):
+    """
+    Manifest of published schema content held in a Firestore collection, with a document per content hash.
+    """
+    def __init__(self, collection: firestore.CollectionReference | None = None):
+        self._collection = collection
+
+    @property
+    def collection(self) -> firestore.CollectionReference:
+        """
+        The manifest collection, using the shared Firestore client from the client registry unless one was given.
+        """
+        if self._collection is None:
+            client = CLIENT_REGISTRY.get(ClientType.FIRESTORE, CONFIG.PROJECT_ID, database=CONFIG.FIRESTORE_DB_NAME)
+            self._collection = client.collection(CONFIG.SCHEMA_DEDUP_MANIFEST_COLLECTION)
+        return self._collection
+
+    def get(self, content_hash: str) -> PublishedSchema | None:
+        """
+        Gets the record of the schema published with a content hash from its manifest document.
+
+        :param content_hash: the content hash of the schema.
+        :return: the published schema record, or None if there is no document for the content hash.
+        """
+        snapshot = self.collection.document(_key(content_hash)).get()
+        if not snapshot.exists:
+            return None
+        return PublishedSchema.from_dict(snapshot.to_dict())
+
+    def put(self, record: PublishedSchema):
+        """
+        Writes the manifest document for a published schema.
+
+        :param record: the published schema record.
+        """
+        self.collection.document(_key(record.content_hash)).set(asdict(record))
+
+
+class BucketSchemaManifest(SchemaManifestInterface):
+    """
+    Manifest of published schema content held in a GCS bucket, with a JSON object per content hash.
+    The bucket must not be one that triggers schema publishing when objects are written to it.
+    """
+    def __init__(self, bucket: storage.Bucket | None = None, prefix: str = CONFIG.SCHEMA_DEDUP_MANIFEST_PREFIX):
+        self._bucket = bucket
+        self.prefix = prefix
+
+    @property
+    def bucket(self) -> storage.Bucket:
+        """
+        The manifest bucket named by SCHEMA_DEDUP_MANIFEST_BUCKET, unless one was given.
+
+        :raises ValueError: if no bucket was given and SCHEMA_DEDUP_MANIFEST_BUCKET is not set.
+        """
+        if self._bucket is None:
+            if not CONFIG.SCHEMA_DEDUP_MANIFEST_BUCKET:
+                raise ValueError("SCHEMA_DEDUP_MANIFEST_BUCKET must be set to use a GCS schema manifest")
+            client = CLIENT_REGISTRY.get(ClientType.STORAGE, CONFIG.PROJECT_ID)
+            self._bucket = client.bucket(CONFIG.SCHEMA_DEDUP_MANIFEST_BUCKET)
+        return self._bucket
+
+    def get(self, content_hash: str) -> PublishedSchema | None:
+        """
+        Gets the record of the schema published with a content hash from its manifest object.
+
+        :param content_hash: the content hash of the schema.
+        :return: the published schema record, or None if there is no object for the content hash.
+        """
+        from google.api_core.exceptions import NotFound
+
+        try:
+            data = self.bucket.blob(self._blob_name(content_hash)).download_as_bytes()
+        except NotFound:
+            return None
+        return PublishedSchema.from_dict(json_backend.loads(data))
+
+    def put(self, record: PublishedSchema):
+        """
+        Writes the manifest object for a published schema.
+
+        :param record: the published schema record.
+        """
+        self.bucket.blob(self._blob_name(record.content_hash)).upload_from_string(
+            json_backend.dumps(asdict(record)), content_type="application/json"
+        )
+
+    def _blob_name(self, content_hash: str) -> str:
+        """
+        Get the name of the manifest object for a content hash.
+
+        :param content_hash: the content hash.
+        :return: the object name.
+        """
+        return f"{self.prefix}{_key(content_hash)}.json"
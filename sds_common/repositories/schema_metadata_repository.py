@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.enums.client_types import ClientType
+from sds_common.models.schema_models import SchemaMetadata
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+    from google.cloud.firestore_v1.watch import Watch
+
+logger = logging.getLogger(__name__)
+
+SCHEMAS_COLLECTION = "schemas"
+
+
+class SchemaMetadataRepository:
+    """
+    Read model of the schema metadata in the Firestore schemas collection, served from an in-process index
+    by survey_id and schema version.
+
+    The index is loaded on first use. When listen is set, a snapshot listener keeps it up to date with every
+    schema added, changed or removed afterwards, so lookups never wait on the network after warm-up. If the
+    listener stops or fails to apply a change, the index is marked not ready and the next lookup starts a new
+    listener and waits for a full snapshot. Otherwise the index is loaded once and refreshed with reload().
+    """
+    def __init__(self, collection: firestore.CollectionReference | None = None, listen: bool = True):
+        self._collection = collection
+        self.listen = listen
+        self._by_guid: dict[str, SchemaMetadata] = {}
+        self._by_survey: dict[str, dict[str, SchemaMetadata]] = {}
+        self._versions: dict[str, set[str]] = {}
+        self._ready = threading.Event()
+        self._watch: Watch | None = None
+        self._listener_failed = False
+        self._lock = threading.Lock()
+
+    @property
+    def collection(self) -> firestore.CollectionReference:
+        """
+        The schemas collection, using the shared Firestore client from the client registry unless one was given.
+        """
+        if self._collection is None:
+            client = CLIENT_REGISTRY.get(ClientType.FIRESTORE, CONFIG.PROJECT_ID, database=CONFIG.FIRESTORE_DB_NAME)
+            self._collection = client.collection(SCHEMAS_COLLECTION)
+        return self._collection
+
+    def get_schema_metadata(self, survey_id: str) -> list[SchemaMetadata]:
+        """
+        Get the metadata for every schema of a survey.
+
+        :param survey_id: the survey_id of the schemas.
+        :return: the schema metadata, ordered by SDS schema version. Empty if the survey has no schemas.
+        """
+        self.ensure_ready()
+        with self._lock:
+            survey = self._by_survey.get(survey_id, {})
+            return sorted(survey.values(), key=lambda metadata: metadata.sds_schema_version)
+
+    def get_all_schema_metadata(self) -> list[SchemaMetadata]:
+        """
+        Get the metadata for every schema of every survey.
+
+        :return: the schema metadata, ordered by survey_id and SDS schema version.
+        """
+        self.ensure_ready()
+        with self._lock:
+            return sorted(
+                self._by_guid.values(), key=lambda metadata: (metadata.survey_id, metadata.sds_schema_version)
+            )
+
+    def get_schema_versions(self, survey_id: str) -> set[str]:
+        """
+        Get the schema versions of a survey.
+
+        :param survey_id: the survey_id of the schemas.
+        :return: the schema versions.
+        """
+        self.ensure_ready()
+        with self._lock:
+            return set(self._versions.get(survey_id, ()))
+
+    def has_schema_version(self, survey_id: str, schema_version: str) -> bool:
+        """
+        Check whether a schema version already exists for a survey.
+
+        :param survey_id: the survey_id of the schema.
+        :param schema_version: the schema version.
+        :return: True if the version exists, False otherwise.
+        """
+        self.ensure_ready()
+        with self._lock:
+            return schema_version in self._versions.get(survey_id, ())
+
+    def ensure_ready(self, timeout: float | None = CONFIG.SCHEMA_METADATA_READY_TIMEOUT):
+        """
+        Load the index if it has not been loaded yet, starting the snapshot listener if listen is set.
+
+        :param timeout: the number of seconds to wait for the first snapshot from the listener.
+        :raises TimeoutError: if the listener does not deliver the first snapshot in time.
+        """
+        if self.listen:
+            self._discard_failed_listener()
+
+        if self._ready.is_set():
+            return
+
+        if not self.listen:
+            self.reload()
+            return
+
+        self.start_listening()
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"Timed out waiting for the {SCHEMAS_COLLECTION} collection snapshot")
+
+    def reload(self):
+        """
+        Replace the index with the current contents of the schemas collection.
+        """
+        snapshots = list(self.collection.stream())
+        with self._lock:
+            self._clear()
+            for snapshot in snapshots:
+                self._put_document(snapshot.id, snapshot.to_dict() or {})
+            loaded = len(self._by_guid)
+        self._ready.set()
+        logger.info(f"Loaded metadata for {loaded} schemas")
+
+    def start_listening(self):
+        """
+        Start the snapshot listener that keeps the index up to date. Has no effect if it is already running.
+        """
+        with self._lock:
+            if self._watch is None:
+                self._watch = self.collection.on_snapshot(self._on_snapshot)
+
+    def stop_listening(self):
+        """
+        Stop the snapshot listener. The index is kept, but is no longer updated.
+        """
+        with self._lock:
+            watch, self._watch = self._watch, None
+        if watch is not None:
+            watch.unsubscribe()
+
+    def _on_snapshot(self, _snapshots: list, changes: list, _read_time: Any):
+        """
+        Snapshot listener callback applying the added, modified and removed schemas to the index.
+        The first callback holds every schema in the collection as added, and replaces the whole index.
+        A change that cannot be applied is logged and the listener marked failed, as the index no longer
+        matches the collection, and later callbacks from the failed listener are ignored.
+
+        :param _snapshots: every document in the collection.
+        :param changes: the changes since the previous callback.
+        :param _read_time: the time the snapshot was read.
+        """
+        try:
+            with self._lock:
+                if self._listener_failed:
+                    return
+                if not self._ready.is_set():
+                    self._clear()
+                for change in changes:
+                    data = change.document.to_dict() or {}
+                    if change.type.name == "REMOVED":
+                        self._remove(data.get("guid", change.document.id))
+                        continue
+                    self._put_document(change.document.id, data)
+        except Exception:
+            logger.exception("Failed to apply schema metadata changes, the index will be reloaded")
+            with self._lock:
+                self._listener_failed = True
+                self._ready.clear()
+            return
+
+        if not self._ready.is_set():
+            logger.info(f"Loaded metadata for {len(self._by_guid)} schemas")
+            self._ready.set()
+
+    def _discard_failed_listener(self):
+        """
+        Discard the snapshot listener if it has stopped or failed to apply a change, marking the index
+        not ready so it is loaded again from a new listener.
+        """
+        with self._lock:
+            watch = self._watch
+            if watch is None or (watch.is_active and not self._listener_failed):
+                return
+            self._watch = None
+            self._listener_failed = False
+            self._ready.clear()
+
+        logger.error(f"Snapshot listener for the {SCHEMAS_COLLECTION} collection stopped, restarting it")
+        watch.unsubscribe()
+
+    def _clear(self):
+        """
+        Empty the index. Must be called holding the lock.
+        """
+        self._by_guid.clear()
+        self._by_survey.clear()
+        self._versions.clear()
+
+    def _put_document(self, document_id: str, data: dict):
+        """
+        Add or replace the schema held in a document, logging and skipping documents that are not valid
+        schema metadata. Must be called holding the lock.
+
+        :param document_id: the id of the document.
+        :param data: the document data.
+        """
+        try:
+            self._put(SchemaMetadata.from_dict(data))
+        except TypeError as e:
+            logger.warning(f"Ignoring invalid schema metadata {document_id}: {e}")
+
+    def _put(self, metadata: SchemaMetadata):
+        """
+        Add or replace a schema in the index. Must be called holding the lock.
+
+        :param metadata: the schema metadata.
+        """
+        self._remove(metadata.guid)
+        self._by_guid[metadata.guid] = metadata
+        self._by_survey.setdefault(metadata.survey_id, {})[metadata.guid] = metadata
+        self._versions.setdefault(metadata.survey_id, set()).add(metadata.schema_version)
+
+    def _remove(self, guid: str):
+        """
+        Remove a schema from the index, if it is there. Must be called holding the lock.
+
+        :param guid: the guid of the schema.
+        """
+        metadata = self._by_guid.pop(guid, None)
+        if metadata is None:
+            return
+
+        survey = self._by_survey.get(metadata.survey_id, {})
+        survey.pop(guid, None)
+        if not survey:
+            self._by_survey.pop(metadata.survey_id, None)
+            self._versions.pop(metadata.survey_id, None)
+            return
+
+        # Another schema of the survey may have the same version, so rebuild its versions from what remains.
+        self._versions[metadata.survey_id] = {remaining.schema_version for remaining in survey.values()}
@@ -1,20 +1,96 @@
 from __future__ import annotations
 
+import hashlib
+import sys
+
 from sds_common.models.schema_publish_errors import (
+    SchemaJSONDecodeError,
     SchemaVersionError,
     SurveyIDError,
 )
+from sds_common.utilities import json_backend
 
 
 class Schema:
+    """
+    A schema to be posted to SDS. The schema is held as its parsed JSON, its raw JSON bytes or both,
+    and a missing form is only built when it is first asked for.
+    """
+    __slots__ = ("_content_hash", "_json", "_raw", "filepath", "schema_version", "survey_id")
+
     def __init__(
-        self, schema_json: dict, survey_id: str, schema_version: str, filepath: str
+        self,
+        schema_json: dict | None,
+        survey_id: str,
+        schema_version: str,
+        filepath: str,
+        raw: bytes | None = None,
     ) -> None:
-        self.json = schema_json
+        if schema_json is None and raw is None:
+            raise ValueError("Schema requires either the schema JSON or its raw bytes")
+        self._json = schema_json
+        self._raw = raw
+        self._content_hash = None
         self.filepath = filepath
-        self.survey_id = survey_id
+        self.survey_id = sys.intern(survey_id) if isinstance(survey_id, str) else survey_id
         self.schema_version = schema_version
 
+    @property
+    def json(self) -> dict:
+        """
+        The schema JSON, parsed from the raw bytes on first access.
+        """
+        if self._json is None:
+            self._json = json_backend.loads(self._raw)
+        return self._json
+
+    @json.setter
+    def json(self, schema_json: dict):
+        self._json = schema_json
+        self._raw = None
+        self._content_hash = None
+
+    @property
+    def content_hash(self) -> str:
+        """
+        The SHA-256 fingerprint of the canonicalised schema JSON, so schemas with the same content have the same
+        hash whatever their formatting, key order or file name.
+        """
+        if self._content_hash is None:
+            self._content_hash = "sha256:" + hashlib.sha256(json_backend.canonical_dumps(self.json)).hexdigest()
+        return self._content_hash
+
+    @property
+    def raw(self) -> bytes:
+        """
+        The schema as JSON bytes, as retrieved when the schema was built from bytes, otherwise serialised
+        from the schema JSON on first access.
+        """
+        if self._raw is None:
+            self._raw = json_backend.dumps(self._json)
+        return self._raw
+
+    @classmethod
+    def from_bytes(cls, raw: bytes, filepath: str) -> Schema:
+        """
+        Sets the schema object from the raw schema JSON bytes. Both the bytes and the JSON parsed from them
+        are kept, so the schema is posted as retrieved and is not parsed again when validated or hashed.
+
+        :param raw: the schema JSON bytes.
+        :param filepath: the path to the schema JSON.
+        :return Schema: the schema object.
+        :raises SchemaJSONDecodeError: if the bytes are not valid JSON.
+        :raises SurveyIDError: if the survey ID cannot be fetched from the schema JSON.
+        :raises SchemaVersionError: if the schema version cannot be fetched from the schema JSON.
+        """
+        try:
+            schema_json = json_backend.loads(raw)
+        except json_backend.JSONDecodeError:
+            raise SchemaJSONDecodeError(filepath) from None
+
+        survey_id, schema_version = cls._get_identifiers(schema_json, filepath)
+        return cls(schema_json, survey_id, schema_version, filepath, raw=bytes(raw))
+
     @classmethod
     def set_schema(cls, schema_json: dict, filepath: str) -> Schema:
         """
@@ -26,17 +102,31 @@ class Schema:
         :raises SurveyIDError: if the survey ID cannot be fetched from the schema JSON.
         :raises SchemaVersionError: if the schema version cannot be fetched from the schema JSON.
         """
+        survey_id, schema_version = cls._get_identifiers(schema_json, filepath)
+        return cls(schema_json, survey_id, schema_version, filepath)
+
+    @classmethod
+    def _get_identifiers(cls, schema_json: dict, filepath: str) -> tuple[str, str]:
+        """
+        Fetches the survey ID and schema version from the schema JSON.
+
+        :param schema_json: the schema JSON.
+        :param filepath: the path to the schema JSON.
+        :return: the survey ID and schema version.
+        :raises SurveyIDError: if the survey ID cannot be fetched from the schema JSON.
+        :raises SchemaVersionError: if the schema version cannot be fetched from the schema JSON.
+        """
         try:
             survey_id = cls._get_survey_id_from_json(schema_json)
-        except (KeyError, IndexError):
+        except (KeyError, IndexError, TypeError):
             raise SurveyIDError(filepath) from None
 
         try:
             schema_version = cls._get_schema_version_from_json(schema_json)
-        except KeyError:
+        except (KeyError, TypeError):
             raise SchemaVersionError(filepath) from None
 
-        return cls(schema_json, survey_id, schema_version, filepath)
+        return survey_id, schema_version
 
     @staticmethod
     def _get_survey_id_from_json(schema_json: dict) -> str | None:
@@ -0,0 +1,213 @@
+import asyncio
+import weakref
+from collections.abc import Callable
+from functools import partial
+from typing import Self
+from urllib.parse import urlsplit
+
+try:
+    import httpx
+except ImportError as e:
+    raise ImportError("AsyncHttpService requires httpx, install it with the sds-common[async] extra.") from e
+
+from sds_common.config.config import CONFIG
+from sds_common.services.id_token_provider import ID_TOKEN_PROVIDER, IdTokenProvider
+from sds_common.services.secret_service import SECRET_SERVICE
+
+
+class _LoopState:
+    """
+    The client and per-host semaphores an AsyncHttpService uses on one event loop.
+    """
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def host_semaphore(self, url: str, max_connections_per_host: int) -> asyncio.Semaphore:
+        """
+        Get the semaphore capping the number of requests in flight to the host of a URL.
+
+        :param url: the URL being requested.
+        :param max_connections_per_host: the maximum number of requests in flight to a single host.
+        :return: the semaphore for the host.
+        """
+        host = urlsplit(url).netloc
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(max_connections_per_host)
+        return self.host_semaphores[host]
+
+
+class AsyncHttpService:
+    """
+    Asyncio counterpart of HttpService, backed by a pooled httpx.AsyncClient.
+    The number of requests in flight to any one host is capped, so callers can fan out
+    many requests at once with asyncio.gather without overwhelming a single endpoint.
+
+    Pooled connections and semaphores belong to the event loop they were created on. The client given is used
+    on the first event loop the service is used from, and when a client factory is given each later event loop,
+    such as one started by another asyncio.run call, gets its own client and semaphores.
+    """
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        headers: dict[str, str] | None,
+        token_provider: IdTokenProvider | None = None,
+        max_connections_per_host: int = CONFIG.ASYNC_HTTP_MAX_CONNECTIONS_PER_HOST,
+        client_factory: Callable[[], httpx.AsyncClient] | None = None,
+    ):
+        self.client = client
+        self.headers = headers
+        self.token_provider = token_provider
+        self.max_connections_per_host = max_connections_per_host
+        self.client_factory = client_factory
+        self.secret_service = SECRET_SERVICE
+        self._audience = None
+        self._client_claimed = False
+        self._loops: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def create(
+        cls,
+        authentication_headers: bool,
+        max_connections: int = CONFIG.ASYNC_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = CONFIG.ASYNC_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = CONFIG.ASYNC_HTTP_KEEPALIVE_EXPIRY,
+        max_connections_per_host: int = CONFIG.ASYNC_HTTP_MAX_CONNECTIONS_PER_HOST,
+        http2: bool = CONFIG.ASYNC_HTTP2,
+    ) -> Self:
+        """
+        Factory method to create an instance of AsyncHttpService.
+
+        :param authentication_headers: whether to include authentication headers.
+        :param max_connections: the maximum number of open connections across all hosts.
+        :param max_keepalive_connections: the maximum number of idle connections kept alive for reuse.
+        :param keepalive_expiry: the number of seconds an idle connection is kept alive for.
+        :param max_connections_per_host: the maximum number of requests in flight to a single host.
+        :param http2: whether to negotiate HTTP/2 with hosts that support it.
+        :return: an instance of AsyncHttpService.
+        """
+        client_factory = partial(cls._setup_client, max_connections, max_keepalive_connections, keepalive_expiry, http2)
+        token_provider = ID_TOKEN_PROVIDER if authentication_headers else None
+        return cls(client_factory(), None, token_provider, max_connections_per_host, client_factory)
+
+    @staticmethod
+    def _setup_client(
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http2: bool,
+    ) -> httpx.AsyncClient:
+        """
+        Set up a pooled asynchronous http/s client.
+
+        :param max_connections: the maximum number of open connections across all hosts.
+        :param max_keepalive_connections: the maximum number of idle connections kept alive for reuse.
+        :param keepalive_expiry: the number of seconds an idle connection is kept alive for.
+        :param http2: whether to negotiate HTTP/2 with hosts that support it.
+        :return: an asynchronous http/s client.
+        """
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        # Matches the connection retries of HttpService. The client ignores its own limits and http2 settings
+        # when given a transport, so they are only set on the transport.
+        transport = httpx.AsyncHTTPTransport(retries=3, http2=http2, limits=limits)
+        return httpx.AsyncClient(transport=transport)
+
+    async def make_post_request(self, url: str, data: dict | bytes, params: dict | None = None) -> httpx.Response:
+        """
+        Make a POST request to a specified URL.
+
+        :param url: the URL to send the POST request to.
+        :param data: the JSON data to send in the POST request, or an already encoded JSON document
+            which is sent as is.
+        :param params: the query parameters to include in the POST request.
+        :return: the response from the POST request.
+        """
+        headers = await self._get_headers()
+        state = self._loop_state()
+        async with state.host_semaphore(url, self.max_connections_per_host):
+            if isinstance(data, bytes):
+                headers = {**(headers or {}), "Content-Type": "application/json"}
+                return await state.client.post(url, content=data, headers=headers, params=params)
+            return await state.client.post(url, json=data, headers=headers, params=params)
+
+    async def make_get_request(self, url: str, params: dict | None = None) -> httpx.Response:
+        """
+        Make a GET request to a specified URL.
+
+        :param url: the URL to send the GET request to.
+        :param params: the query parameters to include in the GET request.
+        :return: the response from the GET request.
+        """
+        headers = await self._get_headers()
+        state = self._loop_state()
+        async with state.host_semaphore(url, self.max_connections_per_host):
+            return await state.client.get(url, headers=headers, params=params)
+
+    async def aclose(self):
+        """
+        Close the client used on the running event loop and its pooled connections. Clients used on event loops
+        that have since closed cannot be closed from another loop, and their connections closed with their loop.
+        """
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.client.aclose()
+        elif not self._client_claimed:
+            self._client_claimed = True
+            await self.client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _loop_state(self) -> _LoopState:
+        """
+        Get the client and semaphores used on the running event loop, creating them on first use.
+
+        :return: the state for the running event loop.
+        :raises RuntimeError: if the client is in use on another event loop and there is no client factory.
+        """
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is not None:
+            return state
+
+        if not self._client_claimed:
+            self._client_claimed = True
+            client = self.client
+        elif self.client_factory is not None:
+            client = self.client_factory()
+        else:
+            raise RuntimeError("AsyncHttpService client is bound to another event loop and has no client factory")
+
+        state = _LoopState(client)
+        self._loops[loop] = state
+        return state
+
+    async def _get_headers(self) -> dict[str, str] | None:
+        """
+        Build the headers for a request, adding the current authentication headers from the token provider.
+        Secret and token fetches block, so they run in a worker thread when nothing is cached.
+
+        :return: the headers for the request, or None if there are none.
+        """
+        if self.token_provider is None:
+            return self.headers
+
+        if self._audience is None:
+            self._audience = await asyncio.to_thread(self.secret_service.get_oauth_client_id)
+
+        token = self.token_provider.peek_token(self._audience)
+        if token is None:
+            token = await asyncio.to_thread(self.token_provider.get_token, self._audience)
+
+        return {
+            **(self.headers or {}),
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
@@ -0,0 +1,28 @@
+from sds_common.config.config import CONFIG
+from sds_common.models.dataset_models import DatasetMetadata
+from sds_common.models.dataset_publish_errors import DatasetMetadataRetrievalError
+from sds_common.services.async_http_service import AsyncHttpService
+
+
+class AsyncSdsDatasetRequestService:
+    """
+    Asyncio counterpart of SdsDatasetRequestService, for fanning out many dataset metadata requests at once.
+    """
+    def __init__(self, http_service: AsyncHttpService | None = None):
+        self.http_service = http_service or AsyncHttpService.create(True)
+
+    async def get_dataset_metadata(self, survey_id: str, period_id: str) -> list[DatasetMetadata]:
+        """
+        Call the GET dataset_metadata SDS endpoint and return the response.
+
+        :param survey_id: the survey_id of the dataset.
+        :param period_id: the period_id of the dataset.
+        :return: a list of DatasetMetadata objects.
+        """
+        url = CONFIG.SDS_URL + CONFIG.GET_DATASET_METADATA_ENDPOINT
+        response = await self.http_service.make_get_request(
+            url, params={"survey_id": survey_id, "period_id": period_id}
+        )
+        if response.status_code != 200:
+            raise DatasetMetadataRetrievalError(survey_id, period_id, response.status_code)
+        return [DatasetMetadata(**dataset) for dataset in response.json()]
@@ -0,0 +1,68 @@
+import httpx
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.models.schema_publish_errors import (
+    SchemaMetadataError,
+    SchemaPostError,
+)
+from sds_common.schema.schema import Schema
+from sds_common.services.async_http_service import AsyncHttpService
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSdsSchemaRequestService:
+    """
+    Asyncio counterpart of SdsSchemaRequestService, for fanning out many requests to SDS schema endpoints at once.
+    """
+    def __init__(self, http_service: AsyncHttpService | None = None):
+        self.http_service = http_service or AsyncHttpService.create(True)
+
+    async def get_schema_metadata(self, survey_id: str) -> httpx.Response:
+        """
+        Call the GET schema_metadata SDS endpoint and return the response.
+
+        :param survey_id: the survey_id of the schema.
+        :return: the response from the schema_metadata endpoint.
+        :raises SchemaMetadataError: if the response status code is not 200 or 404.
+        """
+        url = f"{CONFIG.SDS_URL}{CONFIG.GET_SCHEMA_METADATA_ENDPOINT}"
+        response = await self.http_service.make_get_request(url, params={"survey_id": survey_id})
+        # If the response status code is 404, a new survey is being onboarded.
+        if response.status_code != 200 and response.status_code != 404:
+            raise SchemaMetadataError(survey_id, response.status_code)
+        return response
+
+    async def get_all_schema_metadata(self) -> httpx.Response:
+        """
+        Call the GET all_schema_metadata endpoint and return the response.
+
+        :return: the response from the all_schema_metadata endpoint.
+        """
+        url = f"{CONFIG.SDS_URL}{CONFIG.GET_ALL_SCHEMA_METADATA_ENDPOINT}"
+        response = await self.http_service.make_get_request(url)
+        if response.status_code != 200:
+            raise SchemaMetadataError(response.json(), response.status_code)
+        return response
+
+    async def post_schema(self, schema: Schema) -> httpx.Response:
+        """
+        Post the schema to SDS.
+
+        :param schema: the schema to be posted.
+        :return response: the response from the POST request.
+        :raises SchemaPostError: if the response status code is not 200.
+        """
+        logger.info(f"Posting schema for survey {schema.survey_id}")
+        url = f"{CONFIG.SDS_URL}{CONFIG.POST_SCHEMA_ENDPOINT}"
+        response = await self.http_service.make_post_request(
+            url, schema.raw, params={"survey_id": schema.survey_id}
+        )
+        if response.status_code != 200:
+            raise SchemaPostError(schema.filepath, response.status_code)
+        else:
+            logger.info(
+                f"Schema {schema.filepath} posted for survey {schema.survey_id}"
+            )
+            return response
@@ -1,4 +1,10 @@
+import mmap
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from sds_common.config.config import CONFIG
 from sds_common.enums.buckets import Bucket
+from sds_common.models.file_transfer_models import BatchOperationResult, TransferStats
 from sds_common.repositories.bucket_loader import BucketLoader
 from sds_common.repositories.bucket_file_repository import BucketFileRepository
 
@@ -8,23 +14,98 @@ class FileService():
         self.bucket = loader.fetch_bucket(bucket)
         self.bucket_repository = repository_cls(self.bucket)
 
-    def upload_file(self, filepath: str):
+    def upload_file(self, filepath: str, chunk_size: int | None = CONFIG.FILE_TRANSFER_CHUNK_SIZE) -> TransferStats:
         """
         Uploads a file to the associated bucket.
 
         :param filepath: Path to the file to be uploaded.
+        :param chunk_size: The resumable upload chunk size in bytes, defaulting to FILE_TRANSFER_CHUNK_SIZE,
+            or None to upload in a single request.
+        :return TransferStats: The size, duration and throughput of the upload.
+        """
+        return self.bucket_repository.upload_file_from_path(filepath, chunk_size)
+
+    def upload_large_file(
+        self,
+        filepath: str,
+        part_size: int = CONFIG.FILE_TRANSFER_PART_SIZE,
+        max_workers: int = CONFIG.FILE_TRANSFER_MAX_WORKERS,
+    ) -> TransferStats:
+        """
+        Uploads a large file to the associated bucket as parts uploaded in parallel and composed into one file.
+
+        :param filepath: Path to the file to be uploaded.
+        :param part_size: The size of each part in bytes.
+        :param max_workers: The number of parts uploaded at once.
+        :return TransferStats: The size, duration and throughput of the upload.
+        """
+        return self.bucket_repository.upload_file_in_parts(filepath, part_size, max_workers)
+
+    def download_file(
+        self,
+        filename: str,
+        destination: str,
+        slice_size: int = CONFIG.FILE_TRANSFER_PART_SIZE,
+        max_workers: int = CONFIG.FILE_TRANSFER_MAX_WORKERS,
+    ) -> TransferStats:
+        """
+        Downloads a file from the associated bucket to a local path, fetching byte ranges in parallel.
+
+        :param filename: Name of the file to be downloaded.
+        :param destination: The local path to write the file to.
+        :param slice_size: The size of each byte range in bytes.
+        :param max_workers: The number of byte ranges downloaded at once.
+        :return TransferStats: The size, duration and throughput of the download.
+        """
+        return self.bucket_repository.download_file_to_path(filename, destination, slice_size, max_workers)
+
+    def download_file_to_buffer(
+        self,
+        filename: str,
+        slice_size: int = CONFIG.FILE_TRANSFER_PART_SIZE,
+        max_workers: int = CONFIG.FILE_TRANSFER_MAX_WORKERS,
+    ) -> tuple[mmap.mmap, TransferStats]:
+        """
+        Downloads a file from the associated bucket into a memory-mapped buffer, fetching byte ranges in parallel.
+        The caller is responsible for closing the buffer.
+
+        :param filename: Name of the file to be downloaded.
+        :param slice_size: The size of each byte range in bytes.
+        :param max_workers: The number of byte ranges downloaded at once.
+        :return: The buffer holding the file, and the size, duration and throughput of the download.
         """
-        self.bucket_repository.upload_file_from_path(filepath)
+        return self.bucket_repository.download_file_to_buffer(filename, slice_size, max_workers)
 
     def retrieve_json_file(self, filename: str) -> dict:
         """
-        Retrieves a JSON file from the associated bucket.
+        Retrieves a JSON file from the associated bucket. When the bucket repository caches files, such as
+        CachedBucketFileRepository, the dictionary is shared with other callers and must not be modified.
 
         :param filename: Name of the file to be retrieved.
         :return dict: The file loaded as a JSON dictionary.
         """
         return self.bucket_repository.get_file_as_json(filename)
 
+    def retrieve_file_bytes(self, filename: str) -> bytes:
+        """
+        Retrieves the contents of a file from the associated bucket without decoding it.
+
+        :param filename: Name of the file to be retrieved.
+        :return bytes: The file contents.
+        """
+        return self.bucket_repository.get_file_as_bytes(filename)
+
+    def stream_json_file(self, filename: str, path: str | None = None, chunk_size: int | None = None) -> Iterator[Any]:
+        """
+        Streams the items of a JSON array in a file from the associated bucket, without loading the whole file.
+
+        :param filename: Name of the file to be streamed.
+        :param path: Dotted path of object keys leading to the array, e.g. "data", or None for a top level array.
+        :param chunk_size: The number of bytes downloaded at a time.
+        :return: A generator of the array items.
+        """
+        return self.bucket_repository.stream_json_items(filename, path, chunk_size)
+
     def delete_file(self, filename: str):
         """
         Deletes a file from the associated bucket.
@@ -41,3 +122,37 @@ class FileService():
         :return bool: True if the file exists, False otherwise.
         """
         return self.bucket_repository.check_file_exists(filename)
+
+    def delete_files(
+        self, filenames: Iterable[str], max_workers: int = CONFIG.FILE_BATCH_MAX_WORKERS
+    ) -> BatchOperationResult:
+        """
+        Deletes many files from the associated bucket concurrently.
+
+        :param filenames: Names of the files to be deleted.
+        :param max_workers: The number of files deleted at once.
+        :return BatchOperationResult: A result per file, holding the error raised for any file that was not deleted.
+        """
+        return self.bucket_repository.delete_files(filenames, max_workers)
+
+    def check_files_exist(
+        self, filenames: Iterable[str], max_workers: int = CONFIG.FILE_BATCH_MAX_WORKERS
+    ) -> BatchOperationResult:
+        """
+        Checks if many files exist in the associated bucket concurrently.
+
+        :param filenames: Names of the files to be checked.
+        :param max_workers: The number of files checked at once.
+        :return BatchOperationResult: A result per file, holding True if the file exists, False otherwise.
+        """
+        return self.bucket_repository.files_exist(filenames, max_workers)
+
+    def list_files(self, prefix: str | None = None, page_size: int = CONFIG.FILE_LIST_PAGE_SIZE) -> Iterator[str]:
+        """
+        Lists the names of the files in the associated bucket, a page at a time.
+
+        :param prefix: Only list files whose names begin with the prefix.
+        :param page_size: The number of files fetched per request.
+        :return: A generator of file names.
+        """
+        return self.bucket_repository.list_files(prefix, page_size)
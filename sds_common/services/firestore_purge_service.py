@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.models.firestore_models import PurgeStats
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+    from google.cloud.firestore_v1.bulk_writer import BulkWriteFailure, BulkWriter
+
+logger = logging.getLogger(__name__)
+
+
+class FirestorePurgeService:
+    """
+    Deletes Firestore documents together with every document in their subcollections.
+
+    The document trees are walked one level at a time, listing the subcollections of every document in a level
+    concurrently. Deletes are then sent through a BulkWriter from the deepest level up, flushing between levels,
+    so a purge that is interrupted never leaves a subcollection behind whose parent has already been deleted
+    and can no longer be found by a query.
+    """
+    def __init__(
+        self,
+        client: firestore.Client,
+        max_workers: int = CONFIG.FIRESTORE_PURGE_MAX_WORKERS,
+        max_attempts: int = CONFIG.FIRESTORE_PURGE_MAX_ATTEMPTS,
+        page_size: int = CONFIG.FIRESTORE_PURGE_PAGE_SIZE,
+    ):
+        self.client = client
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.page_size = page_size
+
+    def purge_query(self, query: firestore.Query) -> PurgeStats:
+        """
+        Delete every document matched by a query, and their subcollections.
+        Only the document names are read from the query, not the document data.
+
+        :param query: the query matching the documents to delete.
+        :return: the number of documents found and deleted, any that failed, and the throughput.
+        """
+        return self.purge_documents(snapshot.reference for snapshot in query.select([]).stream())
+
+    def purge_documents(self, document_refs: Iterable[firestore.DocumentReference]) -> PurgeStats:
+        """
+        Delete documents and their subcollections.
+
+        :param document_refs: the documents to delete.
+        :return: the number of documents found and deleted, any that failed, and the throughput.
+        """
+        start = time.monotonic()
+        stats = PurgeStats()
+
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix="firestore-purge") as executor:
+            levels = self._walk(list(document_refs), executor)
+
+        stats.documents_found = sum(len(level) for level in levels)
+        self._delete_levels(levels, stats, start)
+
+        stats.duration_seconds = time.monotonic() - start
+        logger.info(
+            f"Purged {stats.documents_deleted} of {stats.documents_found} Firestore documents "
+            f"in {stats.duration_seconds:.2f}s ({stats.documents_per_second:.1f} docs/s)"
+        )
+        if not stats.succeeded:
+            logger.error(f"Failed to delete {len(stats.failed_paths)} Firestore documents")
+
+        return stats
+
+    def _walk(
+        self, document_refs: list[firestore.DocumentReference], executor: ThreadPoolExecutor
+    ) -> list[list[firestore.DocumentReference]]:
+        """
+        Find every document below the given documents, one level of subcollections at a time.
+
+        :param document_refs: the top level documents.
+        :param executor: the executor the subcollections of a level are listed on.
+        :return: the documents at each depth, starting with the given documents.
+        """
+        levels = []
+        level = document_refs
+
+        while level:
+            levels.append(level)
+            level = [child for children in executor.map(self._list_children, level) for child in children]
+
+        return levels
+
+    def _list_children(self, document_ref: firestore.DocumentReference) -> list[firestore.DocumentReference]:
+        """
+        List the documents in every subcollection of a document. Documents that do not exist but have
+        subcollections of their own are included, so their subcollections are found too.
+
+        :param document_ref: the parent document.
+        :return: the child documents.
+        """
+        return [
+            child
+            for collection in document_ref.collections()
+            for child in collection.list_documents(page_size=self.page_size)
+        ]
+
+    def _delete_levels(self, levels: list[list[firestore.DocumentReference]], stats: PurgeStats, start: float):
+        """
+        Delete the documents at each depth with a BulkWriter, deepest first, waiting for a level to be written
+        before starting on its parents. Documents whose descendants could not be deleted are kept, and reported
+        as failed.
+
+        :param levels: the documents at each depth.
+        :param stats: the stats to record the outcome on.
+        :param start: the monotonic time the purge started, for progress reporting.
+        """
+        from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
+
+        lock = threading.Lock()
+        failed_paths: set[str] = set()
+
+        def on_success(_reference, _result, _bulk_writer):
+            with lock:
+                stats.documents_deleted += 1
+
+        def on_error(failure: BulkWriteFailure, _bulk_writer: BulkWriter) -> bool:
+            if failure.attempts < self.max_attempts:
+                return True
+            logger.warning(f"Failed to delete {failure.operation.reference.path}: {failure.message}")
+            with lock:
+                failed_paths.add(failure.operation.reference.path)
+            return False
+
+        bulk_writer = self.client.bulk_writer(BulkWriterOptions(retry=BulkRetry.exponential))
+        bulk_writer.on_write_result(on_success)
+        bulk_writer.on_write_error(on_error)
+
+        try:
+            for depth in range(len(levels) - 1, -1, -1):
+                for document_ref in levels[depth]:
+                    if self._has_failed_descendant(document_ref.path, failed_paths):
+                        failed_paths.add(document_ref.path)
+                        continue
+                    bulk_writer.delete(document_ref)
+                bulk_writer.flush()
+
+                logger.info(
+                    f"Purged {stats.documents_deleted} of {stats.documents_found} Firestore documents "
+                    f"after {time.monotonic() - start:.2f}s"
+                )
+        finally:
+            bulk_writer.close()
+
+        stats.failed_paths = sorted(failed_paths)
+
+    @staticmethod
+    def _has_failed_descendant(path: str, failed_paths: set[str]) -> bool:
+        """
+        Check whether a document has a descendant that could not be deleted.
+
+        :param path: the path of the document.
+        :param failed_paths: the paths of the documents that could not be deleted.
+        :return: True if a descendant of the document failed to be deleted, False otherwise.
+        """
+        prefix = f"{path}/"
+        return any(failed_path.startswith(prefix) for failed_path in failed_paths)
@@ -0,0 +1,242 @@
+import hashlib
+import os
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.models.file_transfer_models import BatchOperationResult, FileOperationResult
+from sds_common.models.schema_publish_errors import SchemaFetchError
+from sds_common.services.http_service import HttpService
+from sds_common.utilities import json_backend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GithubFetchStats:
+    downloaded: int = 0
+    not_modified: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.downloaded + self.not_modified
+
+
+@dataclass
+class CachedSchemaFile:
+    etag: str | None
+    last_modified: str | None
+    body: bytes
+
+
+class GithubSchemaFetcher:
+    """
+    Fetches schema files from the sds-schema-definitions repository over a single pooled session.
+
+    Every file fetched is cached with its ETag and Last-Modified validators. Fetching it again sends a
+    conditional request, and a 304 Not Modified response is answered from the cache without downloading the
+    body. When cache_dir is set the cache is also kept on disk, so a later run only downloads files that have
+    changed since the last one.
+
+    Cached bodies are shared between callers and must be treated as read-only.
+    """
+    def __init__(
+        self,
+        base_url: str = CONFIG.GITHUB_SCHEMA_URL,
+        cache_dir: str | None = CONFIG.GITHUB_SCHEMA_CACHE_DIR or None,
+        max_workers: int = CONFIG.GITHUB_FETCH_CONCURRENCY,
+    ):
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.stats = GithubFetchStats()
+        self._entries: dict[str, CachedSchemaFile] = {}
+        self._http_service: HttpService | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def http_service(self) -> HttpService:
+        """
+        The HttpService shared by every fetch, created on first use with a connection pool large enough
+        for both fetch_many and a schema publish to fetch at full concurrency.
+        """
+        if self._http_service is None:
+            with self._lock:
+                if self._http_service is None:
+                    pool_maxsize = max(self.max_workers, CONFIG.SCHEMA_PUBLISH_RETRIEVE_CONCURRENCY)
+                    self._http_service = HttpService.create(False, pool_maxsize)
+        return self._http_service
+
+    def fetch(self, path: str) -> bytes:
+        """
+        Fetch a schema file, revalidating any cached copy instead of downloading it again.
+
+        :param path: the path to the schema file in the repository.
+        :return: the raw bytes of the file.
+        :raises SchemaFetchError: if the file cannot be fetched.
+        """
+        url = self.base_url + path
+        cached = self._get_cached(url)
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        logger.info(f"Fetching schema from {url}")
+        response = self.http_service.make_get_request(url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Schema at {url} not modified, using cached copy")
+            with self._lock:
+                self.stats.not_modified += 1
+            return cached.body
+
+        if response.status_code != 200:
+            raise SchemaFetchError(path, response.status_code, url)
+
+        entry = CachedSchemaFile(
+            response.headers.get("ETag"), response.headers.get("Last-Modified"), response.content
+        )
+        with self._lock:
+            self.stats.downloaded += 1
+        if entry.etag or entry.last_modified:
+            self._store(url, entry)
+        return entry.body
+
+    def fetch_many(self, paths: Iterable[str], max_workers: int | None = None) -> BatchOperationResult:
+        """
+        Fetch many schema files concurrently. A file that cannot be fetched does not stop the others.
+
+        :param paths: the paths to the schema files in the repository.
+        :param max_workers: the number of files fetched at once, defaulting to the fetcher's max_workers.
+        :return: the result for each file, in the order given, with the raw bytes of each file fetched.
+        """
+        paths = list(paths)
+        if not paths:
+            return BatchOperationResult()
+
+        before = GithubFetchStats(self.stats.downloaded, self.stats.not_modified)
+        workers = min(max_workers or self.max_workers, len(paths))
+        with ThreadPoolExecutor(workers, thread_name_prefix="github-fetch") as executor:
+            results = list(executor.map(self._fetch_result, paths))
+
+        logger.info(
+            f"Fetched {len(paths)} schemas from GitHub: {self.stats.downloaded - before.downloaded} downloaded, "
+            f"{self.stats.not_modified - before.not_modified} not modified"
+        )
+        return BatchOperationResult(results)
+
+    def clear(self):
+        """
+        Discard every cached file held in memory. Files cached on disk are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _fetch_result(self, path: str) -> FileOperationResult:
+        """
+        Fetch a schema file, capturing any error in the result.
+
+        :param path: the path to the schema file in the repository.
+        :return: the result of the fetch.
+        """
+        try:
+            return FileOperationResult(path, self.fetch(path))
+        except Exception as e:
+            logger.exception(f"Failed to fetch schema {path}")
+            return FileOperationResult(path, error=e)
+
+    def _get_cached(self, url: str) -> CachedSchemaFile | None:
+        """
+        Get the cached copy of a file, loading it from disk into memory if needed.
+
+        :param url: the URL of the file.
+        :return: the cached copy, or None if the file is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None:
+            return entry
+
+        entry = self._read_disk(url)
+        if entry is not None:
+            with self._lock:
+                self._entries[url] = entry
+        return entry
+
+    def _store(self, url: str, entry: CachedSchemaFile):
+        """
+        Cache a file in memory and, when cache_dir is set, on disk.
+
+        :param url: the URL of the file.
+        :param entry: the file and its validators.
+        """
+        with self._lock:
+            self._entries[url] = entry
+        try:
+            self._write_disk(url, entry)
+        except OSError as e:
+            logger.warning(f"Failed to cache schema from {url} on disk: {e}")
+
+    def _disk_path(self, url: str) -> str | None:
+        """
+        Get the path of the disk cache file for a URL.
+
+        :param url: the URL of the file.
+        :return: the path, or None if there is no disk cache.
+        """
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _read_disk(self, url: str) -> CachedSchemaFile | None:
+        """
+        Read a file from the disk cache. Each cache file holds a line of JSON with the URL and validators,
+        followed by the body.
+
+        :param url: the URL of the file.
+        :return: the cached copy, or None if the file is not cached on disk or the cache file is unreadable.
+        """
+        path = self._disk_path(url)
+        if path is None or not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "rb") as file:
+                metadata = json_backend.loads(file.readline())
+                body = file.read()
+        except (OSError, json_backend.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable schema cache file {path}: {e}")
+            return None
+
+        if metadata.get("url") != url:
+            return None
+        return CachedSchemaFile(metadata.get("etag"), metadata.get("last_modified"), body)
+
+    def _write_disk(self, url: str, entry: CachedSchemaFile):
+        """
+        Write a file to the disk cache. The file is written to a temporary path and renamed,
+        so readers never see a partial file.
+
+        :param url: the URL of the file.
+        :param entry: the file and its validators.
+        """
+        path = self._disk_path(url)
+        if path is None:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        metadata = json_backend.dumps({"url": url, "etag": entry.etag, "last_modified": entry.last_modified})
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(metadata)
+            file.write(b"\n")
+            file.write(entry.body)
+        os.replace(temporary_path, path)
+
+
+GITHUB_SCHEMA_FETCHER = GithubSchemaFetcher()
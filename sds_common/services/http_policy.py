@@ -0,0 +1,528 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from copy import deepcopy
+from dataclasses import replace
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.models.http_errors import CircuitOpenError
+from sds_common.models.http_policy_models import HttpPolicy, HttpPolicyMetrics
+from sds_common.utilities.instrumentation import Span, get_instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of requests. Every request adds ratio tokens and every retry
+    takes one, so when a host is failing most requests the retries stop before they multiply the load on it.
+    The bucket starts full with max_tokens, so a quiet service can still retry an occasional failure.
+    """
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max(max_tokens, 1.0)
+        self._tokens = self.max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """
+        Record a request, adding ratio tokens to the bucket.
+        """
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """
+        Take a token for a retry if there is one.
+
+        :return: True if the retry is within budget, False otherwise.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single host. After failure_threshold consecutive failures the circuit opens and
+    requests are rejected without being sent. Once reset_timeout has passed a single trial request is let
+    through: if it succeeds the circuit closes, otherwise it opens again for another reset_timeout.
+    """
+    def __init__(self, host: str, failure_threshold: int, reset_timeout: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """
+        Check the circuit allows a request to be sent.
+
+        :raises CircuitOpenError: if the circuit is open, or half open with the trial request already in flight.
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return
+
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == CircuitState.OPEN and retry_in <= 0:
+                self.state = CircuitState.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+            raise CircuitOpenError(self.host, max(retry_in, 0.0))
+
+    def record_success(self):
+        """
+        Record a request that the host handled, closing the circuit if it was the trial request.
+        """
+        with self._lock:
+            if self.state != CircuitState.CLOSED:
+                logger.info(f"Circuit breaker for {self.host} closed")
+            self.state = CircuitState.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """
+        Record a request that the host failed to handle, opening the circuit once the threshold is reached
+        or if it was the trial request.
+
+        :return: True if this failure opened the circuit, False otherwise.
+        """
+        with self._lock:
+            self._failures += 1
+            if self.state == CircuitState.HALF_OPEN or (
+                self.state == CircuitState.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self.state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+                return True
+            return False
+
+
+class HttpPolicyEngine:
+    """
+    Sends requests with timeouts, retries and circuit breaking applied.
+
+    Each request uses the policy of the longest endpoint path prefix matching its URL, or the default policy.
+    Requests are retried with exponential backoff and full jitter, or after the Retry-After the server asks for,
+    until the policy's attempts or total timeout run out or the shared retry budget is spent. Requests to a host
+    whose circuit is open fail immediately with CircuitOpenError.
+    """
+    def __init__(
+        self,
+        policy: HttpPolicy | None = None,
+        endpoint_policies: dict[str, HttpPolicy] | None = None,
+        retry_budget: RetryBudget | None = None,
+        failure_threshold: int = CONFIG.HTTP_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CONFIG.HTTP_CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.policy = policy or HttpPolicy()
+        self.endpoint_policies = dict(endpoint_policies or {})
+        self.retry_budget = retry_budget or RetryBudget(
+            CONFIG.HTTP_RETRY_BUDGET_RATIO, CONFIG.HTTP_RETRY_BUDGET_MAX_TOKENS
+        )
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._metrics = HttpPolicyMetrics()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> HttpPolicyEngine:
+        """
+        Create an engine with the timeouts, retries and circuit breaker settings from config.
+        Per-endpoint read timeouts are read from HTTP_ENDPOINT_READ_TIMEOUTS, as comma separated
+        path=seconds pairs, for example "/v1/schema=60,/v1/dataset_metadata=10". Malformed pairs are
+        skipped with a warning, so a typo in the setting cannot stop the services being imported.
+
+        :return: the engine.
+        """
+        policy = HttpPolicy(
+            connect_timeout=CONFIG.HTTP_CONNECT_TIMEOUT,
+            read_timeout=CONFIG.HTTP_READ_TIMEOUT,
+            total_timeout=CONFIG.HTTP_TOTAL_TIMEOUT,
+            max_attempts=CONFIG.HTTP_MAX_ATTEMPTS,
+            backoff_base=CONFIG.HTTP_BACKOFF_BASE,
+            backoff_max=CONFIG.HTTP_BACKOFF_MAX,
+            max_retry_after=CONFIG.HTTP_MAX_RETRY_AFTER,
+        )
+
+        endpoint_policies = {
+            path: replace(policy, read_timeout=seconds)
+            for path, seconds in cls._parse_endpoint_read_timeouts(str(CONFIG.HTTP_ENDPOINT_READ_TIMEOUTS)).items()
+        }
+        return cls(policy, endpoint_policies)
+
+    @staticmethod
+    def _parse_endpoint_read_timeouts(value: str) -> dict[str, float]:
+        """
+        Parse per-endpoint read timeouts given as comma separated path=seconds pairs, skipping malformed pairs.
+
+        :param value: the setting, for example "/v1/schema=60,/v1/dataset_metadata=10".
+        :return: the read timeout in seconds for each path prefix.
+        """
+        timeouts = {}
+        for pair in filter(None, (item.strip() for item in value.split(","))):
+            path, separator, seconds = (part.strip() for part in pair.partition("="))
+            try:
+                timeout = float(seconds) if path and separator else None
+            except ValueError:
+                timeout = None
+
+            if timeout is None or not timeout > 0:
+                logger.warning(
+                    f"Ignoring HTTP_ENDPOINT_READ_TIMEOUTS entry {pair!r}, expected path=seconds with a positive number"
+                )
+                continue
+            timeouts[path] = timeout
+        return timeouts
+
+    def set_endpoint_policy(self, path_prefix: str, policy: HttpPolicy):
+        """
+        Use a policy for requests to URLs whose path starts with the given prefix.
+
+        :param path_prefix: the path prefix, for example "/v1/schema".
+        :param policy: the policy.
+        """
+        self.endpoint_policies[path_prefix] = policy
+
+    def policy_for(self, url: str) -> HttpPolicy:
+        """
+        Get the policy for a URL.
+
+        :param url: the URL.
+        :return: the policy of the longest matching endpoint path prefix, or the default policy.
+        """
+        endpoint = self.endpoint_for(url)
+        if endpoint is None:
+            return self.policy
+        return self.endpoint_policies[endpoint]
+
+    def endpoint_for(self, url: str) -> str | None:
+        """
+        Get the endpoint path prefix a URL matches.
+
+        :param url: the URL.
+        :return: the longest endpoint path prefix with a policy that matches the URL, or None if none match.
+        """
+        path = urlsplit(url).path
+        matches = [prefix for prefix in self.endpoint_policies if path.startswith(prefix)]
+        return max(matches, key=len) if matches else None
+
+    def breaker_for(self, url: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker for the host of a URL, creating it on first use.
+
+        :param url: the URL.
+        :return: the circuit breaker.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+                self._breakers[host] = breaker
+            return breaker
+
+    def metrics(self) -> HttpPolicyMetrics:
+        """
+        Get a snapshot of the request, retry and circuit breaker counts since the engine was created or reset.
+
+        :return: the metrics.
+        """
+        with self._lock:
+            return deepcopy(self._metrics)
+
+    def reset_metrics(self):
+        """
+        Reset the metrics to zero.
+        """
+        with self._lock:
+            self._metrics = HttpPolicyMetrics()
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the session, applying the policy for its URL.
+
+        :param session: the session to send the request with.
+        :param method: the HTTP method.
+        :param url: the URL.
+        :param kwargs: any other arguments for session.request, other than timeout.
+        :return: the response, which may be an error response once no more retries are allowed.
+        :raises CircuitOpenError: if the circuit for the host is open.
+        :raises requests.RequestException: if the request fails without a response and cannot be retried.
+        """
+        method = method.upper()
+        parts = urlsplit(url)
+        data = kwargs.get("data")
+        attributes = {
+            "http.method": method,
+            "http.host": parts.netloc,
+            "http.path": parts.path,
+            "http.endpoint": self.endpoint_for(url) or "default",
+            "bytes_sent": len(data) if isinstance(data, bytes) else None,
+        }
+        with get_instrumentation().start_span("http.request", attributes) as span:
+            response = self._send(session, method, url, span, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            content_length = response.headers.get("Content-Length")
+            if content_length is not None and content_length.isdigit():
+                span.set_attribute("bytes", int(content_length))
+            return response
+
+    def _send(self, session: requests.Session, method: str, url: str, span: Span, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying it as the policy for its URL allows.
+
+        :param session: the session to send the request with.
+        :param method: the HTTP method, in upper case.
+        :param url: the URL.
+        :param span: the span of the request, to record the number of attempts on.
+        :param kwargs: any other arguments for session.request, other than timeout.
+        :return: the response.
+        """
+        policy = self.policy_for(url)
+        breaker = self.breaker_for(url)
+        deadline = time.monotonic() + policy.total_timeout
+        self.retry_budget.deposit()
+        self._count("requests")
+
+        attempt = 1
+        while True:
+            span.set_attribute("http.attempts", attempt)
+            try:
+                breaker.before_request()
+            except CircuitOpenError:
+                self._count("circuit_rejections")
+                raise
+
+            self._count("attempts")
+            timeout = (policy.connect_timeout, max(min(policy.read_timeout, deadline - time.monotonic()), 0.001))
+
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except requests.RequestException as e:
+                self._record_outcome(breaker, failed=True)
+                reason = self._exception_reason(e, method, policy)
+                delay = self._backoff(policy, attempt)
+                if reason is None or not self._allow_retry(policy, attempt, deadline, delay):
+                    raise
+                logger.warning(f"{method} {url} failed with {type(e).__name__}, retrying in {delay:.2f}s")
+            except BaseException:
+                # Anything else, such as a bad argument or an interrupt, still ends the attempt, so a half-open
+                # circuit does not wait forever for the outcome of its trial request.
+                self._record_outcome(breaker, failed=True)
+                raise
+            else:
+                self._record_outcome(breaker, failed=response.status_code >= 500)
+                reason = self._status_reason(response.status_code, method, policy)
+                if reason is None:
+                    return response
+
+                delay = self._retry_delay(response, policy, attempt)
+                if delay is None or not self._allow_retry(policy, attempt, deadline, delay):
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                response.close()
+
+            self._count_retry(reason)
+            time.sleep(delay)
+            attempt += 1
+
+    def _allow_retry(self, policy: HttpPolicy, attempt: int, deadline: float, delay: float) -> bool:
+        """
+        Check a failed attempt may be retried after the given delay.
+
+        :param policy: the policy of the request.
+        :param attempt: the number of the attempt that failed, starting at 1.
+        :param deadline: the monotonic time the request must finish by.
+        :param delay: the number of seconds to wait before retrying.
+        :return: True if the attempt may be retried, False otherwise.
+        """
+        if attempt >= policy.max_attempts:
+            return False
+
+        if time.monotonic() + delay >= deadline:
+            self._count("retries_denied_by_deadline")
+            return False
+
+        if not self.retry_budget.try_withdraw():
+            self._count("retries_denied_by_budget")
+            return False
+
+        return True
+
+    def _retry_delay(self, response: requests.Response, policy: HttpPolicy, attempt: int) -> float | None:
+        """
+        Get the delay before retrying a response, honouring its Retry-After header.
+
+        :param response: the response.
+        :param policy: the policy of the request.
+        :param attempt: the number of the attempt that failed, starting at 1.
+        :return: the number of seconds to wait, or None if the server asked for a longer wait than the policy allows.
+        """
+        retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            return self._backoff(policy, attempt)
+        if retry_after > policy.max_retry_after:
+            return None
+        return retry_after
+
+    @staticmethod
+    def _backoff(policy: HttpPolicy, attempt: int) -> float:
+        """
+        Get an exponential backoff delay with full jitter.
+
+        :param policy: the policy of the request.
+        :param attempt: the number of the attempt that failed, starting at 1.
+        :return: a random number of seconds between zero and the exponential backoff for the attempt.
+        """
+        return random.uniform(0, min(policy.backoff_max, policy.backoff_base * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def _parse_retry_after(value: str | None) -> float | None:
+        """
+        Parse a Retry-After header given as either a number of seconds or an HTTP date.
+
+        :param value: the header value.
+        :return: the number of seconds to wait, or None if there is no valid header.
+        """
+        if not value:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _status_reason(status_code: int, method: str, policy: HttpPolicy) -> str | None:
+        """
+        Get the retry reason for a response status.
+
+        :param status_code: the response status.
+        :param method: the HTTP method.
+        :param policy: the policy of the request.
+        :return: the reason the response can be retried, or None if it cannot.
+        """
+        if status_code in policy.retry_statuses_any_method or (
+            status_code in policy.retry_statuses_idempotent and method in policy.idempotent_methods
+        ):
+            return f"status_{status_code}"
+        return None
+
+    @staticmethod
+    def _exception_reason(error: requests.RequestException, method: str, policy: HttpPolicy) -> str | None:
+        """
+        Get the retry reason for a request that failed without a response. Requests that could not connect,
+        whether the connection timed out or was refused, are retried for any method, as nothing was sent.
+        Other failures are only retried for idempotent methods.
+
+        :param error: the error raised.
+        :param method: the HTTP method.
+        :param policy: the policy of the request.
+        :return: the reason the request can be retried, or None if it cannot.
+        """
+        if isinstance(error, requests.ConnectTimeout):
+            return "connect_timeout"
+        if isinstance(error, requests.ConnectionError) and HttpPolicyEngine._failed_to_connect(error):
+            return "connect_error"
+        if method not in policy.idempotent_methods:
+            return None
+        if isinstance(error, requests.Timeout):
+            return "read_timeout"
+        if isinstance(error, requests.ConnectionError):
+            return "connection_error"
+        return None
+
+    @staticmethod
+    def _failed_to_connect(error: BaseException) -> bool:
+        """
+        Check whether an error was caused by failing to open a connection, by looking through the urllib3
+        errors it wraps.
+
+        :param error: the error raised.
+        :return: True if no connection was made, False otherwise.
+        """
+        seen = set()
+        pending = [error]
+        while pending:
+            current = pending.pop()
+            if current is None or id(current) in seen:
+                continue
+            seen.add(id(current))
+            if isinstance(current, (NewConnectionError, ConnectTimeoutError)):
+                return True
+
+            pending.extend((getattr(current, "reason", None), current.__cause__, current.__context__))
+            pending.extend(arg for arg in getattr(current, "args", ()) if isinstance(arg, BaseException))
+        return False
+
+    def _record_outcome(self, breaker: CircuitBreaker, failed: bool):
+        """
+        Record the outcome of an attempt on the circuit breaker of its host.
+
+        :param breaker: the circuit breaker.
+        :param failed: whether the attempt failed.
+        """
+        if not failed:
+            breaker.record_success()
+            return
+
+        if breaker.record_failure():
+            self._count("circuit_trips")
+            logger.error(f"Circuit breaker for {breaker.host} opened for {breaker.reset_timeout:.1f}s")
+
+    def _count(self, name: str):
+        """
+        Increment a metric.
+
+        :param name: the name of the metric.
+        """
+        with self._lock:
+            setattr(self._metrics, name, getattr(self._metrics, name) + 1)
+
+    def _count_retry(self, reason: str):
+        """
+        Increment the retry metrics.
+
+        :param reason: the reason for the retry.
+        """
+        with self._lock:
+            self._metrics.retries += 1
+            self._metrics.retries_by_reason[reason] = self._metrics.retries_by_reason.get(reason, 0) + 1
+
+
+HTTP_POLICY_ENGINE = HttpPolicyEngine.from_config()
@@ -1,72 +1,124 @@
 from typing import Self
 
 import requests
+from requests.adapters import DEFAULT_POOLSIZE as DEFAULT_POOL_MAXSIZE
 from requests.adapters import HTTPAdapter
-from urllib3 import Retry
-import google.oauth2.id_token
-from google.cloud import iam_credentials_v1
 
-from sds_common.config.config import CONFIG
-from sds_common.services.secret_service import SecretService
+from sds_common.services.http_policy import HTTP_POLICY_ENGINE, HttpPolicyEngine
+from sds_common.services.id_token_provider import (
+    ID_TOKEN_PROVIDER,
+    IMPERSONATED_ID_TOKEN_PROVIDER,
+    IdTokenProvider,
+)
+from sds_common.services.secret_service import SECRET_SERVICE
 
 
 class HttpService:
-    def __init__(self, session: requests.Session, headers: dict[str, str] | None):
+    """
+    Makes http/s requests through a pooled session. Timeouts, retries and circuit breaking are applied by the
+    policy engine, which by default is shared by every HttpService so each host has a single circuit breaker.
+    """
+    def __init__(
+        self,
+        session: requests.Session,
+        headers: dict[str, str] | None,
+        token_provider: IdTokenProvider | None = None,
+        policy_engine: HttpPolicyEngine = HTTP_POLICY_ENGINE,
+    ):
         self.session = session
         self.headers = headers
-        self.secret_service = SecretService()
+        self.token_provider = token_provider
+        self.policy_engine = policy_engine
+        self.secret_service = SECRET_SERVICE
+        self._audience = None
 
     @classmethod
-    def create(cls, authentication_headers: bool) -> Self:
+    def create(cls, authentication_headers: bool, pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> Self:
         """
         Factory method to create an instance of HttpService.
+        Authentication headers are resolved from the shared ID token provider on every request,
+        so no token is fetched until the first request is made.
 
         :param authentication_headers: whether to include authentication headers.
+        :param pool_maxsize: the number of connections kept open to each host, which should be at least the
+            number of threads making requests at once.
         :return: an instance of HttpService.
         """
-        session = cls._setup_session()
-        headers = cls.generate_authentication_headers() if authentication_headers else None
-        return cls(session, headers)
+        session = cls._setup_session(pool_maxsize)
+        token_provider = ID_TOKEN_PROVIDER if authentication_headers else None
+        return cls(session, None, token_provider)
 
     @staticmethod
-    def _setup_session() -> requests.Session:
+    def _setup_session(pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> requests.Session:
         """
-        Set up an http/s session.
+        Set up an http/s session. The adapter does not retry, as retries are made by the policy engine.
 
+        :param pool_maxsize: the number of connections kept open to each host.
         :return: an http/s session.
         """
         session = requests.Session()
-        retry = Retry(connect=3, backoff_factor=0.5)
-        adapter = HTTPAdapter(max_retries=retry)
+        adapter = HTTPAdapter(max_retries=0, pool_maxsize=pool_maxsize)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
         return session
 
-    def make_post_request(self, url: str, data: dict, params: dict = None) -> requests.Response:
+    def make_post_request(self, url: str, data: dict | bytes, params: dict = None) -> requests.Response:
         """
         Make a POST request to a specified URL.
 
         :param url: the URL to send the POST request to.
-        :param data: the JSON data to send in the POST request.
+        :param data: the JSON data to send in the POST request, or an already encoded JSON document
+            which is sent as is.
         :param params: the query parameters to include in the POST request.
         :return: the response from the POST request.
+        :raises CircuitOpenError: if the circuit breaker for the host is open.
         """
+        if isinstance(data, bytes):
+            headers = {**(self._get_headers() or {}), "Content-Type": "application/json"}
+            return self.policy_engine.send(self.session, "POST", url, data=data, headers=headers, params=params)
 
-        response = self.session.post(url, json=data, headers=self.headers, params=params)
+        response = self.policy_engine.send(
+            self.session, "POST", url, json=data, headers=self._get_headers(), params=params
+        )
         return response
 
-    def make_get_request(self, url: str, params: dict = None) -> requests.Response:
+    def make_get_request(
+        self, url: str, params: dict = None, headers: dict[str, str] | None = None, stream: bool = False
+    ) -> requests.Response:
         """
         Make a GET request to a specified URL.
 
         :param url: the URL to send the GET request to.
         :param params: the query parameters to include in the GET request.
+        :param headers: any headers to send in addition to the authentication headers.
+        :param stream: whether to leave the body unread, to be read from response.raw. The response must then
+            be closed by the caller.
         :return: the response from the GET request.
+        :raises CircuitOpenError: if the circuit breaker for the host is open.
         """
-        response = self.session.get(url, headers=self.headers, params=params)
+        if headers:
+            headers = {**(self._get_headers() or {}), **headers}
+        else:
+            headers = self._get_headers()
+
+        response = self.policy_engine.send(self.session, "GET", url, headers=headers, params=params, stream=stream)
         return response
 
+    def _get_headers(self) -> dict[str, str] | None:
+        """
+        Build the headers for a request, adding the current authentication headers from the token provider.
+
+        :return: the headers for the request, or None if there are none.
+        """
+        if self.token_provider is None:
+            return self.headers
+
+        if self._audience is None:
+            self._audience = self.secret_service.get_oauth_client_id()
+
+        return {**(self.headers or {}), **self.token_provider.get_authentication_headers(self._audience)}
+
     @staticmethod
     def generate_authentication_headers() -> dict[str, str]:
         """
@@ -75,19 +127,8 @@ class HttpService:
 
         :return dict[str, str]: the headers required for remote authentication.
         """
-        secret_service = SecretService()
-        oauth_client_id = secret_service.get_oauth_client_id()
-        auth_req = google.auth.transport.requests.Request()
-        auth_token = google.oauth2.id_token.fetch_id_token(
-            auth_req, audience=oauth_client_id
-        )
-
-        headers = {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json",
-        }
-
-        return headers
+        oauth_client_id = SECRET_SERVICE.get_oauth_client_id()
+        return ID_TOKEN_PROVIDER.get_authentication_headers(oauth_client_id)
 
     @staticmethod
     def generate_authentication_headers_by_impersonation() -> dict[str, str]:
@@ -99,23 +140,5 @@ class HttpService:
 
         :return dict[str, str]: the headers required for remote authentication.
         """
-        secret_service = SecretService()
-        oauth_client_id = secret_service.get_oauth_client_id()
-        impersonated_sa_email = f"{CONFIG.PROJECT_ID}@appspot.gserviceaccount.com"
-        iam_credentials_client = iam_credentials_v1.IAMCredentialsClient()
-        resource_name = f"projects/-/serviceAccounts/{impersonated_sa_email}"
-
-        response = iam_credentials_client.generate_id_token(
-            name=resource_name,
-            audience=oauth_client_id,
-            include_email=True
-        )
-
-        auth_token = response.token
-
-        headers = {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json",
-        }
-
-        return headers
+        oauth_client_id = SECRET_SERVICE.get_oauth_client_id()
+        return IMPERSONATED_ID_TOKEN_PROVIDER.get_authentication_headers(oauth_client_id)
@@ -0,0 +1,242 @@
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.enums.client_types import ClientType
+
+logger = logging.getLogger(__name__)
+
+# Seconds before expiry at which a cached token is no longer handed out.
+EXPIRY_LEEWAY = 30
+
+
+def fetch_id_token_from_metadata_server(audience: str) -> str:
+    """
+    Fetch an ID token for the audience using the metadata server.
+    This is only available when the application is run on GCP.
+
+    :param audience: the audience the ID token is issued for.
+    :return: the ID token.
+    """
+    import google.auth.transport.requests
+    import google.oauth2.id_token
+
+    auth_req = google.auth.transport.requests.Request()
+    return google.oauth2.id_token.fetch_id_token(auth_req, audience=audience)
+
+
+def fetch_id_token_by_impersonation(audience: str) -> str:
+    """
+    Fetch an ID token for the audience by impersonating the default App Engine service account.
+    This is only used when the application is run locally. User account requires the role
+    "Service Account Token Creator".
+
+    :param audience: the audience the ID token is issued for.
+    :return: the ID token.
+    """
+    impersonated_sa_email = f"{CONFIG.PROJECT_ID}@appspot.gserviceaccount.com"
+    iam_credentials_client = CLIENT_REGISTRY.get(ClientType.IAM_CREDENTIALS)
+    resource_name = f"projects/-/serviceAccounts/{impersonated_sa_email}"
+
+    response = iam_credentials_client.generate_id_token(
+        name=resource_name,
+        audience=audience,
+        include_email=True
+    )
+    return response.token
+
+
+@dataclass
+class CachedIdToken:
+    token: str
+    expires_at: float
+    read: bool = False
+
+
+class IdTokenProvider:
+    """
+    Process-wide, thread-safe cache of ID tokens keyed by audience.
+    Tokens are refreshed in the background shortly before they expire, with a synchronous fetch
+    as a fallback if the cached token has expired (e.g. the background refresh failed).
+    A token that has not been read since it was fetched is not refreshed, so audiences that are no longer
+    used stop being refreshed.
+    """
+    def __init__(
+        self,
+        fetch_token: Callable[[str], str] = fetch_id_token_from_metadata_server,
+        refresh_margin: int = CONFIG.ID_TOKEN_REFRESH_MARGIN,
+        default_lifetime: int = 3600,
+    ):
+        self._fetch_token = fetch_token
+        self._refresh_margin = refresh_margin
+        self._default_lifetime = default_lifetime
+        self._tokens: dict[str, CachedIdToken] = {}
+        self._timers: dict[str, threading.Timer] = {}
+        self._generations: dict[str, int] = {}
+        self._audience_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, audience: str) -> str:
+        """
+        Get a valid ID token for the audience, fetching one if none is cached or the cached token has expired.
+
+        :param audience: the audience the ID token is issued for.
+        :return: the ID token.
+        """
+        cached = self._tokens.get(audience)
+        if not self._is_valid(cached):
+            with self._get_audience_lock(audience):
+                # Another thread may have fetched the token while this one was waiting for the lock.
+                cached = self._tokens.get(audience)
+                if not self._is_valid(cached):
+                    cached = self._refresh(audience)
+
+        cached.read = True
+        return cached.token
+
+    def peek_token(self, audience: str) -> str | None:
+        """
+        Get the cached ID token for the audience without fetching, for callers that must not block.
+
+        :param audience: the audience the ID token is issued for.
+        :return: the cached ID token, or None if there is no valid cached token.
+        """
+        cached = self._tokens.get(audience)
+        if not self._is_valid(cached):
+            return None
+
+        cached.read = True
+        return cached.token
+
+    def get_authentication_headers(self, audience: str) -> dict[str, str]:
+        """
+        Create headers for authentication through SDS load balancer.
+
+        :param audience: the audience the ID token is issued for.
+        :return dict[str, str]: the headers required for remote authentication.
+        """
+        return {
+            "Authorization": f"Bearer {self.get_token(audience)}",
+            "Content-Type": "application/json",
+        }
+
+    def invalidate(self, audience: str | None = None):
+        """
+        Drop cached tokens and cancel their scheduled refreshes. A fetch already in flight for an invalidated
+        audience still returns its token to the caller waiting on it, but the token is not cached.
+
+        :param audience: the audience to invalidate, or None to invalidate every audience.
+        """
+        with self._lock:
+            audiences = [audience] if audience is not None else list(self._tokens.keys() | self._audience_locks.keys())
+            for key in audiences:
+                self._generations[key] = self._generations.get(key, 0) + 1
+                self._tokens.pop(key, None)
+                timer = self._timers.pop(key, None)
+                if timer is not None:
+                    timer.cancel()
+
+    @staticmethod
+    def _is_valid(cached: CachedIdToken | None) -> bool:
+        """
+        Check the cached token exists and will not expire while a request is in flight.
+
+        :param cached: the cached token, if any.
+        :return: True if the token can be used, False otherwise.
+        """
+        return cached is not None and cached.expires_at - EXPIRY_LEEWAY > time.time()
+
+    def _get_audience_lock(self, audience: str) -> threading.Lock:
+        """
+        Get the lock serialising token fetches for a single audience.
+
+        :param audience: the audience of the token.
+        :return: the lock for the audience.
+        """
+        with self._lock:
+            return self._audience_locks.setdefault(audience, threading.Lock())
+
+    def _refresh(self, audience: str) -> CachedIdToken:
+        """
+        Fetch a new token for the audience, cache it and schedule its background refresh, unless the audience
+        was invalidated while the token was being fetched.
+
+        :param audience: the audience the ID token is issued for.
+        :return: the new token.
+        """
+        with self._lock:
+            generation = self._generations.get(audience, 0)
+
+        token = self._fetch_token(audience)
+        cached = CachedIdToken(token, self._get_expiry(token))
+
+        with self._lock:
+            if self._generations.get(audience, 0) == generation:
+                self._tokens[audience] = cached
+                self._schedule_refresh(audience, cached)
+
+        return cached
+
+    def _background_refresh(self, audience: str):
+        """
+        Refresh the token for the audience from the refresh timer thread, if it has been read since it was
+        fetched. Failures are logged and left to the synchronous fallback in get_token.
+
+        :param audience: the audience the ID token is issued for.
+        """
+        with self._lock:
+            cached = self._tokens.get(audience)
+            if cached is None or not cached.read:
+                logger.debug(f"Not refreshing unused ID token for {audience}")
+                self._timers.pop(audience, None)
+                return
+
+        try:
+            with self._get_audience_lock(audience):
+                self._refresh(audience)
+        except Exception as e:
+            logger.warning(f"Background refresh of ID token failed: {e}", exc_info=True)
+
+    def _schedule_refresh(self, audience: str, cached: CachedIdToken):
+        """
+        Schedule a refresh of the token ahead of its expiry, replacing any existing schedule.
+        Must be called while holding the provider lock.
+
+        :param audience: the audience the ID token is issued for.
+        :param cached: the token to schedule the refresh for.
+        """
+        previous = self._timers.pop(audience, None)
+        if previous is not None:
+            previous.cancel()
+
+        remaining = cached.expires_at - time.time()
+        # Tokens with little lifetime left are refreshed halfway through it instead.
+        delay = remaining - self._refresh_margin if remaining > 2 * self._refresh_margin else remaining / 2
+        delay = max(delay, 1)
+        timer = threading.Timer(delay, self._background_refresh, args=(audience,))
+        timer.daemon = True
+        self._timers[audience] = timer
+        timer.start()
+
+    def _get_expiry(self, token: str) -> float:
+        """
+        Read the expiry time from the token's exp claim, falling back to the default lifetime.
+
+        :param token: the ID token.
+        :return: the expiry time as a unix timestamp.
+        """
+        import google.auth.jwt
+
+        try:
+            claims = google.auth.jwt.decode(token, verify=False)
+            return float(claims["exp"])
+        except (ValueError, KeyError, TypeError):
+            return time.time() + self._default_lifetime
+
+
+ID_TOKEN_PROVIDER = IdTokenProvider(fetch_id_token_from_metadata_server)
+IMPERSONATED_ID_TOKEN_PROVIDER = IdTokenProvider(fetch_id_token_by_impersonation)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Self
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
+from sds_common.config.config import CONFIG
+from sds_common.config.logging_config import logging
+from sds_common.enums.client_types import ClientType
+
+if TYPE_CHECKING:
+    from google.cloud.pubsub_v1 import SubscriberClient
+    from google.cloud.pubsub_v1.subscriber.futures import StreamingPullFuture
+    from google.cloud.pubsub_v1.subscriber.message import Message
+
+logger = logging.getLogger(__name__)
+
+
+class PubSubConsumer:
+    """
+    Consumes messages from a Pub/Sub subscription over a streaming pull, so messages are delivered as soon as
+    they are published rather than on the next poll.
+
+    The subscriber client keeps the ack deadline of every outstanding message extended until it is acked,
+    nacked or held for max_lease_duration, and sends acks in batches. Flow control caps the number and size
+    of outstanding messages, so a slow consumer is not sent more messages than it can handle.
+
+    Messages are either passed to a handler on a pool of worker threads, acked when the handler returns and
+    nacked if it raises, or handed off through a bounded queue to be read with get() or await_messages().
+    """
+    def __init__(
+        self,
+        subscription_id: str,
+        max_messages: int = CONFIG.PUBSUB_CONSUMER_MAX_MESSAGES,
+        max_bytes: int = CONFIG.PUBSUB_CONSUMER_MAX_BYTES,
+        max_workers: int = CONFIG.PUBSUB_CONSUMER_MAX_WORKERS,
+        queue_size: int = CONFIG.PUBSUB_CONSUMER_QUEUE_SIZE,
+        max_lease_duration: int = CONFIG.PUBSUB_CONSUMER_MAX_LEASE_DURATION,
+        decoder: Callable[[bytes], Any] = json.loads,
+    ):
+        self.subscription_id = subscription_id
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.max_lease_duration = max_lease_duration
+        self.decoder = decoder
+        self._queue: queue.Queue[Message] = queue.Queue(maxsize=queue_size)
+        self._streaming_pull_future: StreamingPullFuture | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber(self) -> SubscriberClient:
+        """
+        The shared Pub/Sub subscriber client from the client registry.
+        """
+        return CLIENT_REGISTRY.get(ClientType.SUBSCRIBER)
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the streaming pull is open.
+        """
+        return self._streaming_pull_future is not None and not self._streaming_pull_future.done()
+
+    def start(self, handler: Callable[[Message], None] | None = None):
+        """
+        Open the streaming pull. Calling start on a running consumer has no effect.
+
+        :param handler: called with each message on a worker thread. The message is acked when the handler returns
+            and nacked if it raises. If None, messages are queued to be read with get() or await_messages().
+        """
+        from google.cloud.pubsub_v1 import types
+        from google.cloud.pubsub_v1.subscriber.scheduler import ThreadScheduler
+
+        with self._lock:
+            if self.running:
+                return
+
+            flow_control = types.FlowControl(
+                max_messages=self.max_messages,
+                max_bytes=self.max_bytes,
+                max_lease_duration=self.max_lease_duration,
+            )
+            executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"pubsub-{self.subscription_id}")
+            subscription_path = self.subscriber.subscription_path(CONFIG.PROJECT_ID, self.subscription_id)
+
+            self._streaming_pull_future = self.subscriber.subscribe(
+                subscription_path,
+                callback=self._handle if handler is None else self._run_handler(handler),
+                flow_control=flow_control,
+                scheduler=ThreadScheduler(executor),
+            )
+
+    def stop(self, timeout: float | None = None):
+        """
+        Close the streaming pull and nack any queued messages that have not been read, so they are redelivered.
+
+        :param timeout: the number of seconds to wait for the streaming pull to shut down.
+        """
+        with self._lock:
+            future, self._streaming_pull_future = self._streaming_pull_future, None
+
+        if future is not None:
+            future.cancel()
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                logger.debug(f"Streaming pull for subscription {self.subscription_id} closed", exc_info=True)
+
+        for message in self._drain():
+            message.nack()
+
+    def get(self, timeout: float | None = None) -> Message | None:
+        """
+        Take the next queued message. The caller is responsible for acking or nacking it.
+
+        :param timeout: the number of seconds to wait for a message, or None to wait indefinitely.
+        :return: the message, or None if no message arrived in time.
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def await_messages(
+        self,
+        predicate: Callable[[Any], bool] | None = None,
+        count: int = 1,
+        timeout: float = CONFIG.PUBSUB_CONSUMER_AWAIT_TIMEOUT,
+    ) -> list[Any]:
+        """
+        Wait until a number of messages matching the predicate have arrived, returning as soon as they have.
+        Messages already waiting in the queue when the count is reached are returned too, if they match.
+        Every message read is decoded and acked, whether or not it matches.
+
+        :param predicate: called with each decoded message, returning True for the messages being waited for.
+            If None, every message matches.
+        :param count: the number of matching messages to wait for.
+        :param timeout: the maximum number of seconds to wait.
+        :return: the decoded matching messages, which may be fewer than count if the timeout is reached.
+        """
+        self.start()
+        deadline = time.monotonic() + timeout
+        matched = []
+
+        while len(matched) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            message = self.get(timeout=remaining)
+            if message is not None:
+                self._collect(message, predicate, matched)
+
+        if matched:
+            for message in self._drain():
+                self._collect(message, predicate, matched)
+
+        return matched
+
+    def purge(self) -> int:
+        """
+        Ack and discard every message waiting in the queue.
+
+        :return: the number of messages discarded.
+        """
+        messages = self._drain()
+        for message in messages:
+            message.ack()
+        return len(messages)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handle(self, message: Message):
+        """
+        Streaming pull callback that hands a message off to the queue. Blocks the worker while the queue is full,
+        which holds back further messages until the queue is read.
+
+        :param message: the message received.
+        """
+        self._queue.put(message)
+
+    @staticmethod
+    def _run_handler(handler: Callable[[Message], None]) -> Callable[[Message], None]:
+        """
+        Wrap a handler so its message is acked when it returns and nacked if it raises.
+
+        :param handler: the message handler.
+        :return: the streaming pull callback.
+        """
+        def callback(message: Message):
+            try:
+                handler(message)
+            except Exception:
+                logger.exception(f"Failed to handle Pub/Sub message {message.message_id}")
+                message.nack()
+                return
+            message.ack()
+
+        return callback
+
+    def _collect(self, message: Message, predicate: Callable[[Any], bool] | None, matched: list[Any]):
+        """
+        Decode and ack a message, adding it to the matched messages if it satisfies the predicate.
+        Messages that cannot be decoded are acked and logged.
+
+        :param message: the message.
+        :param predicate: the predicate the decoded message must satisfy, or None to match every message.
+        :param matched: the matched messages so far.
+        """
+        message.ack()
+        try:
+            data = self.decoder(message.data)
+        except Exception:
+            logger.warning(f"Failed to decode Pub/Sub message {message.message_id}", exc_info=True)
+            return
+
+        if predicate is None or predicate(data):
+            matched.append(data)
+
+    def _drain(self) -> list[Message]:
+        """
+        Take every message currently in the queue without waiting.
+
+        :return: the messages.
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self._queue.get_nowait())
+            except queue.Empty:
+                return messages
@@ -1,22 +1,278 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterable
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Self
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
 from sds_common.config.config import CONFIG
-from google.cloud.pubsub_v1 import PublisherClient
+from sds_common.config.logging_config import logging
+from sds_common.enums.client_types import ClientType
+from sds_common.models.pub_sub_models import PublishOutcome
 from sds_common.models.schema_publish_errors import SchemaPublishError
+from sds_common.utilities.instrumentation import get_instrumentation
+
+if TYPE_CHECKING:
+    from google.cloud.pubsub_v1 import PublisherClient
+    from google.cloud.pubsub_v1.publisher.futures import Future
+    from google.cloud.pubsub_v1.types import BatchSettings, PublisherOptions
+
+logger = logging.getLogger(__name__)
 
 
 class PubSubService:
-    def __init__(self):
-        self.publisher = PublisherClient()
+    """
+    Publishes messages to Pub/Sub topics.
+
+    The publisher client batches messages in the background and publish calls return a future per message.
+    When track_outcomes is set, every future is kept until flush() is called, which waits for them and returns
+    the outcome of each message. Otherwise failures are only logged, so long lived services do not hold on to
+    a future per message sent.
+    """
+    def __init__(
+        self,
+        batch_settings: BatchSettings | None = None,
+        publisher_options: PublisherOptions | None = None,
+        track_outcomes: bool = False,
+    ):
+        self.batch_settings = batch_settings
+        self.publisher_options = publisher_options
+        self.track_outcomes = track_outcomes
+        self._publisher = None
+        self._topic_paths: dict[str, str] = {}
+        self._pending: list[tuple[PublishOutcome, Future]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def batched(
+        cls,
+        max_messages: int = CONFIG.PUBSUB_BATCH_MAX_MESSAGES,
+        max_bytes: int = CONFIG.PUBSUB_BATCH_MAX_BYTES,
+        max_latency: float = CONFIG.PUBSUB_BATCH_MAX_LATENCY,
+        flow_control_max_messages: int = CONFIG.PUBSUB_FLOW_CONTROL_MAX_MESSAGES,
+        flow_control_max_bytes: int = CONFIG.PUBSUB_FLOW_CONTROL_MAX_BYTES,
+        enable_message_ordering: bool = False,
+    ) -> Self:
+        """
+        Factory method to create a PubSubService for bulk publishing, which batches messages into fewer requests,
+        blocks callers once too many messages are waiting to be sent, and tracks the outcome of every message.
 
-    def send_message(self, error: SchemaPublishError, topic_id: str):
+        :param max_messages: the maximum number of messages in a batch.
+        :param max_bytes: the maximum size of a batch in bytes.
+        :param max_latency: the maximum number of seconds a message waits for its batch to fill.
+        :param flow_control_max_messages: the number of unsent messages at which publish calls block.
+        :param flow_control_max_bytes: the size of unsent messages in bytes at which publish calls block.
+        :param enable_message_ordering: whether messages with the same ordering key are delivered in order.
+        :return: an instance of PubSubService.
+        """
+        from google.cloud.pubsub_v1 import types
+
+        batch_settings = types.BatchSettings(max_messages=max_messages, max_bytes=max_bytes, max_latency=max_latency)
+        publisher_options = types.PublisherOptions(
+            enable_message_ordering=enable_message_ordering,
+            flow_control=types.PublishFlowControl(
+                message_limit=flow_control_max_messages,
+                byte_limit=flow_control_max_bytes,
+                limit_exceeded_behavior=types.LimitExceededBehavior.BLOCK,
+            ),
+        )
+        return cls(batch_settings, publisher_options, track_outcomes=True)
+
+    @property
+    def publisher(self) -> PublisherClient:
+        """
+        The shared Pub/Sub publisher client, fetched from the client registry on first use
+        so that importing this module does not create a client.
+        """
+        if self._publisher is None:
+            options = {}
+            if self.batch_settings is not None:
+                options["batch_settings"] = self.batch_settings
+            if self.publisher_options is not None:
+                options["publisher_options"] = self.publisher_options
+            self._publisher = CLIENT_REGISTRY.get(ClientType.PUBLISHER, **options)
+        return self._publisher
+
+    def send_message(
+        self, error: SchemaPublishError | dict | str | bytes, topic_id: str, ordering_key: str = ""
+    ) -> Future:
         """
         Sends a Pub/Sub message to the specified topic.
 
-        :param error: The SchemaPublishError object containing message info to send.
+        :param error: The SchemaPublishError object containing message info to send, or any other message as
+            a dictionary to be sent as JSON, a string or bytes.
         :param topic_id: The ID of the topic to send the message to.
+        :param ordering_key: Messages with the same ordering key are delivered in order, if the publisher
+            has message ordering enabled.
+        :return: A future resolving to the message ID once the message has been sent.
         """
-        topic_path = self.publisher.topic_path(CONFIG.PROJECT_ID, topic_id)
-        message_json = error.generate_message_content()
-        self.publisher.publish(topic_path, data=message_json.encode("utf-8"))
+        future = self._publish(self._get_topic_path(topic_id), topic_id, error, ordering_key)
+        outcome = PublishOutcome(topic_id, ordering_key)
+
+        if self.track_outcomes:
+            with self._lock:
+                self._pending.append((outcome, future))
+        else:
+            future.add_done_callback(lambda done: self._log_failure(outcome, done))
+
+        return future
+
+    def send_many(
+        self,
+        messages: Iterable[SchemaPublishError | dict | str | bytes],
+        topic_id: str,
+        ordering_key: str = "",
+        timeout: float | None = CONFIG.PUBSUB_PUBLISH_TIMEOUT,
+    ) -> list[PublishOutcome]:
+        """
+        Sends many Pub/Sub messages to the specified topic, letting the publisher batch them, and waits for them all.
+
+        :param messages: The messages to send, each a SchemaPublishError, dictionary, string or bytes.
+        :param topic_id: The ID of the topic to send the messages to.
+        :param ordering_key: Messages with the same ordering key are delivered in order, if the publisher
+            has message ordering enabled.
+        :param timeout: The number of seconds to wait for each message to be sent.
+        :return: The outcome of each message, in the order given. A message the publisher rejects when it is
+            handed over, such as one that is too large, fails without stopping the others being sent.
+        """
+        topic_path = self._get_topic_path(topic_id)
+        sent: list[tuple[PublishOutcome, Future | None]] = []
+        for message in messages:
+            outcome = PublishOutcome(topic_id, ordering_key)
+            try:
+                future = self._publish(topic_path, topic_id, message, ordering_key)
+            except Exception as e:
+                logger.exception(f"Pub/Sub publisher rejected a message for topic {topic_id}")
+                outcome.error = e
+                future = None
+            sent.append((outcome, future))
+
+        for outcome, future in sent:
+            if future is not None:
+                self._resolve(outcome, future, timeout)
+
+        return [outcome for outcome, _ in sent]
+
+    def flush(self, timeout: float | None = CONFIG.PUBSUB_PUBLISH_TIMEOUT) -> list[PublishOutcome]:
+        """
+        Waits for every message sent with send_message since the last flush.
+        Only messages sent while track_outcomes is set are waited for.
+
+        :param timeout: The number of seconds to wait for each message to be sent.
+        :return: The outcome of each message, in the order they were sent.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        for outcome, future in pending:
+            self._resolve(outcome, future, timeout)
+
+        failed = sum(not outcome.succeeded for outcome, _ in pending)
+        if failed:
+            logger.error(f"Failed to publish {failed} of {len(pending)} Pub/Sub messages")
+
+        return [outcome for outcome, _ in pending]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def _publish(
+        self,
+        topic_path: str,
+        topic_id: str,
+        message: SchemaPublishError | dict | str | bytes,
+        ordering_key: str,
+    ) -> Future:
+        """
+        Hands a message to the publisher, timing it from now until the publisher has sent it.
+
+        :param topic_path: The path of the topic to send the message to.
+        :param topic_id: The ID of the topic.
+        :param message: The message to send.
+        :param ordering_key: The ordering key of the message.
+        :return: A future resolving to the message ID once the message has been sent.
+        :raises Exception: any error the publisher raises on being handed the message, after ending its span.
+        """
+        data = self._encode_message(message)
+        span = get_instrumentation().start_span("pubsub.publish", {"pubsub.topic": topic_id, "bytes": len(data)})
+        try:
+            future = self.publisher.publish(topic_path, data=data, ordering_key=ordering_key)
+        except BaseException as e:
+            span.end(e)
+            raise
+        future.add_done_callback(lambda done: span.end(done.exception()))
+        return future
+
+    def _get_topic_path(self, topic_id: str) -> str:
+        """
+        Get the full path of a topic in the configured project, building it once per topic.
+
+        :param topic_id: The ID of the topic.
+        :return: The topic path.
+        """
+        topic_path = self._topic_paths.get(topic_id)
+        if topic_path is None:
+            topic_path = self.publisher.topic_path(CONFIG.PROJECT_ID, topic_id)
+            self._topic_paths[topic_id] = topic_path
+        return topic_path
+
+    def _resolve(self, outcome: PublishOutcome, future: Future, timeout: float | None):
+        """
+        Wait for a message to be sent and record the result on its outcome. If a message with an ordering key
+        fails, publishing is resumed for the key so later messages with the key are not rejected.
+
+        :param outcome: The outcome to record the result on.
+        :param future: The future returned when the message was published.
+        :param timeout: The number of seconds to wait.
+        """
+        try:
+            error = future.exception(timeout=timeout)
+        except FutureTimeoutError as e:
+            # The message may still be sent, so publishing for its ordering key is left paused.
+            outcome.error = e
+            return
+
+        if error is None:
+            outcome.message_id = future.result()
+            return
+
+        outcome.error = error
+        if outcome.ordering_key:
+            self.publisher.resume_publish(self._get_topic_path(outcome.topic_id), outcome.ordering_key)
+
+    @staticmethod
+    def _log_failure(outcome: PublishOutcome, future: Future):
+        """
+        Log a message that failed to send, for messages whose outcome is not tracked.
+
+        :param outcome: The outcome of the message.
+        :param future: The completed future returned when the message was published.
+        """
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Failed to publish Pub/Sub message to topic {outcome.topic_id}: {error}")
+
+    @staticmethod
+    def _encode_message(message: SchemaPublishError | dict | str | bytes) -> bytes:
+        """
+        Encode a message as the bytes sent to Pub/Sub.
+
+        :param message: A SchemaPublishError, a dictionary to be sent as JSON, a string or bytes.
+        :return: The message data.
+        """
+        if isinstance(message, SchemaPublishError):
+            message = message.generate_message_content()
+        elif isinstance(message, dict):
+            message = json.dumps(message)
+
+        if isinstance(message, str):
+            return message.encode("utf-8")
+        return message
 
 
 PUB_SUB_SERVICE = PubSubService()
@@ -1,8 +1,17 @@
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from sds_common.config.config import CONFIG
 from sds_common.config.logging_config import logging
+from sds_common.models.schema_models import SchemaMetadataIndex
 from sds_common.models.schema_publish_errors import (
     SchemaDuplicationError,
+    SchemaMetadataError,
     SchemaVersionMismatchError,
 )
+from sds_common.repositories.schema_metadata_repository import SchemaMetadataRepository
 from sds_common.schema.schema import Schema
 from sds_common.services.sds_schema_request_service import SdsSchemaRequestService
 from sds_common.utilities.utils import split_filename
@@ -11,18 +20,79 @@ logger = logging.getLogger(__name__)
 
 
 class SchemaValidatorService:
-    def __init__(self):
+    def __init__(self, metadata_repository: SchemaMetadataRepository | None = None):
         self.sds_schema_request_service = SdsSchemaRequestService()
+        self.metadata_repository = metadata_repository
+        self._survey_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
 
-    def validate_schema(self, schema: Schema):
+    def validate_schema(self, schema: Schema, metadata_index: SchemaMetadataIndex | None = None):
         """
         Validate the schema by verifying the version and checking for duplicate versions.
 
         :param schema: The schema object to validate.
+        :param metadata_index: the index of the run the schema is validated in, or None to fetch the metadata
+            for the schema's survey from SDS.
         """
         logger.info(f"Validating schema {schema.filepath}")
         self._verify_version(schema)
-        self._check_duplicate_versions(schema)
+        self._check_duplicate_versions(schema, metadata_index)
+
+    def start_metadata_run(
+        self,
+        survey_ids: Iterable[str] | None = None,
+        concurrency: int = CONFIG.SCHEMA_PUBLISH_RETRIEVE_CONCURRENCY,
+    ) -> SchemaMetadataIndex:
+        """
+        Build an index of schema metadata for validating a batch of schemas, rather than fetching the metadata
+        for every schema. Each run has its own index, so runs made at the same time do not affect each other.
+
+        :param survey_ids: the surveys to prefetch metadata for, one request per distinct survey. If None, the
+            metadata for every survey is fetched with a single all_schema_metadata request.
+        :param concurrency: the number of per-survey requests made at once.
+        :return: the index, to pass to each validation in the run.
+        """
+        if survey_ids is None and self.metadata_repository is not None:
+            records = self.metadata_repository.get_all_schema_metadata()
+            return SchemaMetadataIndex.from_metadata(vars(record) for record in records)
+
+        metadata_index = SchemaMetadataIndex()
+        if survey_ids is None:
+            try:
+                response = self.sds_schema_request_service.get_all_schema_metadata()
+                return SchemaMetadataIndex.from_metadata(response.json())
+            except SchemaMetadataError as e:
+                # Fall back to fetching each survey's metadata the first time one of its schemas is validated.
+                logger.warning(
+                    f"Failed to prefetch all schema metadata, falling back to per survey lookups: {e.error_message}"
+                )
+                return metadata_index
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(partial(self._index_survey_versions, metadata_index), set(survey_ids)))
+        return metadata_index
+
+    @staticmethod
+    def record_published(schema: Schema, metadata_index: SchemaMetadataIndex | None):
+        """
+        Add a newly posted schema version to the index of its run, so later schemas in the run are checked
+        against it.
+
+        :param schema: the schema that was posted.
+        :param metadata_index: the index of the run the schema was posted in, if any.
+        """
+        if metadata_index is not None:
+            metadata_index.add(schema.survey_id, schema.schema_version)
+
+    def check_duplicate_versions(self, schema: Schema, metadata_index: SchemaMetadataIndex | None = None):
+        """
+        Check that the schema_version for the schema is not already present in SDS, or posted earlier in the run.
+
+        :param schema: the schema to be posted.
+        :param metadata_index: the index of the run the schema is posted in, or None to fetch the metadata from SDS.
+        :raises SchemaDuplicationError: if the schema version already exists.
+        """
+        self._check_duplicate_versions(schema, metadata_index)
 
     @staticmethod
     def _verify_version(schema: Schema):
@@ -36,19 +106,55 @@ class SchemaValidatorService:
         if schema.schema_version != trimmed_filename:
             raise SchemaVersionMismatchError(schema.filepath)
 
-    def _check_duplicate_versions(self, schema: Schema):
+    def _check_duplicate_versions(self, schema: Schema, metadata_index: SchemaMetadataIndex | None):
         """
         Check that the schema_version for the new schema is not already present in SDS.
 
         :param schema: the schema to be posted.
+        :param metadata_index: the index of the run, or None to fetch the metadata from SDS.
         :raises SchemaDuplicationError: if the schema version already exists in SDS.
         """
-        schema_metadata = self.sds_schema_request_service.get_schema_metadata(schema.survey_id)
+        if metadata_index is None:
+            versions = self._fetch_survey_versions(schema.survey_id)
+            if schema.schema_version in versions:
+                raise SchemaDuplicationError(schema.filepath)
+            return
+
+        if not metadata_index.has_survey(schema.survey_id):
+            self._index_survey_versions(metadata_index, schema.survey_id)
+
+        if metadata_index.contains(schema.survey_id, schema.schema_version):
+            raise SchemaDuplicationError(schema.filepath)
+
+    def _index_survey_versions(self, metadata_index: SchemaMetadataIndex, survey_id: str):
+        """
+        Fetch the schema versions for a survey into the metadata index, once per survey even when
+        schemas for the same survey are validated concurrently.
+
+        :param metadata_index: the index to add the versions to.
+        :param survey_id: the survey to fetch the versions for.
+        """
+        with self._lock:
+            survey_lock = self._survey_locks.setdefault(survey_id, threading.Lock())
+
+        with survey_lock:
+            if not metadata_index.has_survey(survey_id):
+                metadata_index.set_versions(survey_id, self._fetch_survey_versions(survey_id))
+
+    def _fetch_survey_versions(self, survey_id: str) -> set[str]:
+        """
+        Fetch the schema versions already present in SDS for a survey.
+
+        :param survey_id: the survey to fetch the versions for.
+        :return: the schema versions for the survey.
+        """
+        if self.metadata_repository is not None:
+            return self.metadata_repository.get_schema_versions(survey_id)
+
+        schema_metadata = self.sds_schema_request_service.get_schema_metadata(survey_id)
 
         # If the schema_metadata endpoint returns a 404, then the survey is new and there are no duplicate versions.
         if schema_metadata.status_code == 404:
-            return
+            return set()
 
-        for version in schema_metadata.json():
-            if schema.schema_version == version["schema_version"]:
-                raise SchemaDuplicationError(schema.filepath)
+        return {version["schema_version"] for version in schema_metadata.json()}
@@ -1,12 +1,24 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
 from sds_common.config.config import CONFIG
-from sds_common.models.dataset_models import DatasetMetadata
+from sds_common.config.logging_config import logging
+from sds_common.models.dataset_models import DatasetMetadata, DatasetMetadataBatchResult
 from sds_common.models.dataset_publish_errors import DatasetMetadataRetrievalError
 from sds_common.services.http_service import HttpService
+from sds_common.utilities.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 
 class SdsDatasetRequestService:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_ttl: float = CONFIG.DATASET_METADATA_CACHE_TTL,
+        cache_max_size: int = CONFIG.DATASET_METADATA_CACHE_MAX_SIZE,
+    ):
         self.http_service = HttpService.create(True)
+        self.metadata_cache: TTLCache[tuple[str, str], list[DatasetMetadata]] = TTLCache(cache_ttl, cache_max_size)
 
     def get_dataset_metadata(self, survey_id: str, period_id: str) -> list[DatasetMetadata]:
         """
@@ -21,3 +33,58 @@ class SdsDatasetRequestService:
         if response.status_code != 200:
             raise DatasetMetadataRetrievalError(survey_id, period_id, response.status_code)
         return [DatasetMetadata(**dataset) for dataset in response.json()]
+
+    def get_dataset_metadata_many(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        max_workers: int = CONFIG.DATASET_METADATA_CONCURRENCY,
+    ) -> DatasetMetadataBatchResult:
+        """
+        Get the dataset metadata for many (survey_id, period_id) pairs, requesting each distinct pair once and
+        running the requests concurrently. Results are cached per pair for the cache TTL, so repeated pairs
+        across calls are not requested again. A failure for one pair does not stop the others.
+
+        :param pairs: the (survey_id, period_id) pairs to get the dataset metadata for.
+        :param max_workers: the number of requests made at once.
+        :return: the DatasetMetadata objects for each pair that succeeded, and the error for each pair that failed.
+        """
+        result = DatasetMetadataBatchResult()
+        to_fetch = []
+
+        for pair in dict.fromkeys(pairs):
+            cached = self.metadata_cache.get(pair)
+            if cached is not None:
+                result.metadata[pair] = cached
+            else:
+                to_fetch.append(pair)
+
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers, thread_name_prefix="dataset-metadata") as executor:
+                for pair, outcome in zip(to_fetch, executor.map(self._fetch_pair, to_fetch)):
+                    if isinstance(outcome, DatasetMetadataRetrievalError):
+                        result.errors[pair] = outcome
+                    else:
+                        result.metadata[pair] = outcome
+                        self.metadata_cache.set(pair, outcome)
+
+        logger.info(
+            f"Retrieved dataset metadata for {len(result.metadata)} survey and period pairs "
+            f"({len(to_fetch)} requested, {len(result.errors)} failed)"
+        )
+        return result
+
+    def _fetch_pair(self, pair: tuple[str, str]) -> list[DatasetMetadata] | DatasetMetadataRetrievalError:
+        """
+        Get the dataset metadata for a single pair, returning rather than raising any error.
+
+        :param pair: the (survey_id, period_id) pair.
+        :return: the DatasetMetadata objects, or the error if they could not be retrieved.
+        """
+        survey_id, period_id = pair
+        try:
+            return self.get_dataset_metadata(survey_id, period_id)
+        except DatasetMetadataRetrievalError as e:
+            return e
+        except Exception as e:
+            logger.warning(f"Failed to request dataset metadata for {survey_id} and {period_id}", exc_info=True)
+            return DatasetMetadataRetrievalError(survey_id, period_id, None, str(e))
@@ -1,6 +1,7 @@
 import requests
 from sds_common.config.logging_config import logging
 from sds_common.config.config import CONFIG
+from sds_common.models.schema_models import SchemaMetadata
 from sds_common.models.schema_publish_errors import (
     SchemaMetadataError,
     SchemaPostError,
@@ -33,6 +34,19 @@ class SdsSchemaRequestService:
             raise SchemaMetadataError(survey_id, response.status_code)
         return response
 
+    def get_schema_metadata_records(self, survey_id: str) -> list[SchemaMetadata]:
+        """
+        Call the GET schema_metadata SDS endpoint and return the schema metadata as typed records.
+
+        :param survey_id: the survey_id of the schema.
+        :return: the schema metadata for the survey, or an empty list for a new survey.
+        :raises SchemaMetadataError: if the response status code is not 200 or 404.
+        """
+        response = self.get_schema_metadata(survey_id)
+        if response.status_code == 404:
+            return []
+        return [SchemaMetadata.from_dict(record) for record in response.json()]
+
     def get_all_schema_metadata(self) -> requests.Response:
         """
         Call the GET schema_metadata endpoint and return the response.
@@ -55,7 +69,7 @@ class SdsSchemaRequestService:
         """
         logger.info(f"Posting schema for survey {schema.survey_id}")
         url = f"{CONFIG.SDS_URL}{CONFIG.POST_SCHEMA_ENDPOINT}"
-        response = self.http_service.make_post_request(url, schema.json, params={"survey_id": schema.survey_id})
+        response = self.http_service.make_post_request(url, schema.raw, params={"survey_id": schema.survey_id})
         if response.status_code != 200:
             raise SchemaPostError(schema.filepath, response.status_code)
         else:
@@ -1,16 +1,59 @@
+from __future__ import annotations
+
 import json
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
+from sds_common.clients.client_registry import CLIENT_REGISTRY
 from sds_common.config.config import CONFIG
-from google.api_core.exceptions import GoogleAPICallError, RetryError
-from google.cloud import secretmanager
+from sds_common.config.logging_config import logging
+from sds_common.enums.client_types import ClientType
 from sds_common.models.schema_publish_errors import SecretAccessError, SecretKeyError
+from sds_common.utilities.instrumentation import get_instrumentation
+from sds_common.utilities.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from google.cloud import secretmanager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SecretPayload:
+    data: dict
+    version: str
+
+
+# Parsed secret payloads keyed by secret ID, shared by every SecretService so that services created per
+# request still read each secret once per SECRET_CACHE_TTL.
+SECRET_PAYLOAD_CACHE: TTLCache[str, SecretPayload] = TTLCache(CONFIG.SECRET_CACHE_TTL)
 
 
 class SecretService:
-    def __init__(self):
-        self.client = secretmanager.SecretManagerServiceClient()
+    """
+    Service to access secrets from Google Cloud Secret Manager.
+    Every instance shares the SecretManagerServiceClient held by the client registry and, unless given its own
+    cache, the parsed secret payloads cached for SECRET_CACHE_TTL seconds.
+    """
+    def __init__(
+        self,
+        cache: TTLCache[str, SecretPayload] = SECRET_PAYLOAD_CACHE,
+        stale_while_revalidate: bool = CONFIG.SECRET_STALE_WHILE_REVALIDATE,
+    ):
         self.project_id = CONFIG.PROJECT_ID
         self.secret_id = CONFIG.SECRET_ID
+        self.stale_while_revalidate = stale_while_revalidate
+        self._cache = cache
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def client(self) -> secretmanager.SecretManagerServiceClient:
+        """
+        The Secret Manager client shared by every SecretService, created on first use.
+        """
+        return CLIENT_REGISTRY.get(ClientType.SECRET_MANAGER)
 
     def get_oauth_client_id(self) -> str | None:
         """
@@ -20,24 +63,112 @@ class SecretService:
         :raises SecretKeyError: If the client ID key is not found in the secret.
         """
         try:
-            secret = self._get_secret_version()
-            secret_json = json.loads(secret)
+            secret_json = self.get_secret_payload(self.secret_id).data
             return secret_json["web"]["client_id"]
         except KeyError:
             raise SecretKeyError("N/A") from None
 
-    def _get_secret_version(self) -> str | None:
+    def get_secret_payload(self, secret_id: str) -> SecretPayload:
+        """
+        Get the parsed JSON payload of the latest version of a secret, using the cache where possible.
+        In stale-while-revalidate mode an expired payload is returned immediately and refreshed in the background.
+
+        :param secret_id: the ID of the secret.
+        :return: the parsed secret payload and the version it was read from.
+        :raises SecretAccessError: If unable to access the secret version.
+        """
+        entry = self._cache.get_entry(secret_id)
+
+        if entry is not None and not self._cache.is_expired(entry):
+            return entry.value
+
+        if entry is not None and self.stale_while_revalidate:
+            self._refresh_in_background(secret_id)
+            return entry.value
+
+        return self._load_secret_payload(secret_id)
+
+    def invalidate(self, secret_id: str | None = None, version: str | None = None):
+        """
+        Invalidate cached secret payloads so the next read fetches the latest version.
+
+        :param secret_id: the secret to invalidate, or None for the configured secret.
+        :param version: only invalidate if the cached payload was read from this version, e.g. "3"
+            or a full version resource name. If None, the payload is invalidated regardless of version.
+        """
+        secret_id = secret_id or self.secret_id
+        entry = self._cache.get_entry(secret_id)
+
+        if entry is None:
+            return
+
+        if version is None or self._version_number(entry.value.version) == self._version_number(version):
+            self._cache.delete(secret_id)
+
+    def _load_secret_payload(self, secret_id: str) -> SecretPayload:
+        """
+        Fetch, parse and cache the latest version of a secret.
+
+        :param secret_id: the ID of the secret.
+        :return: the parsed secret payload and the version it was read from.
+        :raises SecretAccessError: If unable to access the secret version.
+        """
+        secret, version = self._get_secret_version(secret_id)
+        payload = SecretPayload(json.loads(secret), version)
+        self._cache.set(secret_id, payload)
+        return payload
+
+    def _refresh_in_background(self, secret_id: str):
+        """
+        Reload a secret on a background thread, unless a refresh for it is already in flight.
+
+        :param secret_id: the ID of the secret.
+        """
+        with self._refresh_lock:
+            if secret_id in self._refreshing:
+                return
+            self._refreshing.add(secret_id)
+
+        def refresh():
+            try:
+                self._load_secret_payload(secret_id)
+            except Exception as e:
+                logger.warning(f"Background refresh of secret {secret_id} failed: {e}", exc_info=True)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(secret_id)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _get_secret_version(self, secret_id: str | None = None) -> tuple[str, str]:
         """
         Access the latest secret version from Google Cloud Secret Manager.
 
-        :return: The Secret value.
+        :param secret_id: the ID of the secret, or None for the configured secret.
+        :return: The Secret value and the resource name of the version it was read from.
         :raises SecretAccessError: If unable to access the secret version.
         """
-        try:
-            name = (
-                f"projects/{self.project_id}/secrets/{self.secret_id}/versions/latest"
-            )
-            response = self.client.access_secret_version(name=name)
-            return response.payload.data.decode("UTF-8")
-        except (GoogleAPICallError, RetryError) as e:
-            raise SecretAccessError(e.__str__()) from e
+        from google.api_core.exceptions import GoogleAPICallError, RetryError
+
+        secret_id = secret_id or self.secret_id
+        with get_instrumentation().start_span("secret.access", {"secret.id": secret_id}) as span:
+            try:
+                name = f"projects/{self.project_id}/secrets/{secret_id}/versions/latest"
+                response = self.client.access_secret_version(name=name)
+                span.set_attribute("bytes", len(response.payload.data))
+                return response.payload.data.decode("UTF-8"), response.name
+            except (GoogleAPICallError, RetryError) as e:
+                raise SecretAccessError(e.__str__()) from e
+
+    @staticmethod
+    def _version_number(version: str) -> str:
+        """
+        Get the version number from a version or version resource name.
+
+        :param version: the version, e.g. "3" or "projects/p/secrets/s/versions/3".
+        :return: the version number.
+        """
+        return str(version).rsplit("/", 1)[-1]
+
+
+SECRET_SERVICE = SecretService()
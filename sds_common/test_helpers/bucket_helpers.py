@@ -1,3 +1,6 @@
+from sds_common.repositories.bucket_file_repository import BucketFileRepository
+
+
 def delete_blobs_with_test_survey_id(bucket, test_survey_id: str):
     """
     Method to delete all blobs related to the test survey id in the specified bucket.
@@ -5,7 +8,9 @@ def delete_blobs_with_test_survey_id(bucket, test_survey_id: str):
     :param bucket: the bucket to clean
     :param test_survey_id: the test survey id
     """
-    blobs = bucket.list_blobs(prefix=test_survey_id)
+    repository = BucketFileRepository(bucket)
+    result = repository.delete_files(repository.list_files(prefix=test_survey_id))
 
-    for blob in blobs:
-        blob.delete()
+    if not result.all_succeeded:
+        failed = ", ".join(item.filename for item in result.failed)
+        raise RuntimeError(f"Failed to delete blobs for test survey {test_survey_id}: {failed}")
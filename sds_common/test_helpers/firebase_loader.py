@@ -1,11 +1,37 @@
-from google.cloud import firestore
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
 from sds_common.config.config import CONFIG
+from sds_common.enums.client_types import ClientType
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
 
 
 class FirebaseLoader:
     def __init__(self):
-        self.client = self._connect_client()
-        self.schemas_collection = self._set_collection("schemas")
+        self._client = None
+        self._schemas_collection = None
+
+    @property
+    def client(self) -> firestore.Client:
+        """
+        The firestore client, connected on first use.
+        """
+        if self._client is None:
+            self._client = self._connect_client()
+        return self._client
+
+    @property
+    def schemas_collection(self) -> firestore.CollectionReference:
+        """
+        The schemas collection reference, set up on first use.
+        """
+        if self._schemas_collection is None:
+            self._schemas_collection = self._set_collection("schemas")
+        return self._schemas_collection
 
     def get_client(self) -> firestore.Client:
         """
@@ -29,8 +55,8 @@ class FirebaseLoader:
 
         :return: Firestore client
         """
-        return firestore.Client(
-            project=CONFIG.PROJECT_ID, database=CONFIG.FIRESTORE_DB_NAME
+        return CLIENT_REGISTRY.get(
+            ClientType.FIRESTORE, CONFIG.PROJECT_ID, database=CONFIG.FIRESTORE_DB_NAME
         )
 
     def _set_collection(self, collection) -> firestore.CollectionReference:
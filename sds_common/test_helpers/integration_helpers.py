@@ -1,6 +1,7 @@
 import time
 
-from google.cloud import storage
+from sds_common.clients.client_registry import CLIENT_REGISTRY
+from sds_common.enums.client_types import ClientType
 from sds_common.test_helpers.firebase_loader import firebase_loader
 from sds_common.test_helpers.firestore_helpers import (
     perform_delete_on_collection_with_test_survey_id,
@@ -8,7 +9,18 @@ from sds_common.test_helpers.firestore_helpers import (
 from sds_common.test_helpers.pub_sub_helper import PubSubHelper
 from sds_common.test_helpers.common_test_data import test_survey_id
 
-storage_client = storage.Client()
+
+def __getattr__(name: str):
+    """
+    Lazily resolve module level clients so that importing the helpers does not create them.
+
+    :param name: the attribute being accessed.
+    :return: the shared client.
+    :raises AttributeError: if the attribute does not exist.
+    """
+    if name == "storage_client":
+        return CLIENT_REGISTRY.get(ClientType.STORAGE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def cleanup():
@@ -49,12 +61,7 @@ def inject_wait_time(seconds: int):
 
 def poll_subscription(pubsub_helper, subscriber_id, timeout=45) -> list[dict] | None:
     """
-    Polls a subscription for messages until the timeout is reached.
+    Waits for messages on a subscription over a streaming pull, returning as soon as they arrive
+    or None once the timeout is reached.
     """
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        response = pubsub_helper.pull_and_acknowledge_messages(subscriber_id)
-        if response:
-            return response
-        time.sleep(3)
-    return None
+    return pubsub_helper.await_messages(subscriber_id, timeout=timeout)
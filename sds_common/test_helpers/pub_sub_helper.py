@@ -1,15 +1,20 @@
 import json
 import time
+from collections.abc import Callable
+from typing import Any
 
-from google.cloud import pubsub_v1
+from sds_common.clients.client_registry import CLIENT_REGISTRY
 from sds_common.config.config import CONFIG
+from sds_common.enums.client_types import ClientType
+from sds_common.services.pub_sub_consumer import PubSubConsumer
 
 
 class PubSubHelper:
     def __init__(self, topic_id: str) -> None:
-        self.subscriber_client = pubsub_v1.SubscriberClient()
-        self.publisher_client = pubsub_v1.PublisherClient()
+        self.subscriber_client = CLIENT_REGISTRY.get(ClientType.SUBSCRIBER)
+        self.publisher_client = CLIENT_REGISTRY.get(ClientType.PUBLISHER)
         self.topic_id = topic_id
+        self._consumers: dict[str, PubSubConsumer] = {}
 
     def try_create_subscriber(self, subscriber_id: str, attempts: int = 5) -> None:
         """
@@ -85,6 +90,26 @@ class PubSubHelper:
 
         return messages
 
+    def await_messages(
+        self,
+        subscriber_id: str,
+        predicate: Callable[[dict], bool] | None = None,
+        count: int = 1,
+        timeout: float = CONFIG.PUBSUB_CONSUMER_AWAIT_TIMEOUT,
+    ) -> list[dict] | None:
+        """
+        Waits for messages on a subscriber over a streaming pull, returning as soon as they arrive.
+        Any other messages already received are also returned if they match.
+
+        :param subscriber_id: the unique id of the subscriber.
+        :param predicate: called with each formatted message, returning True for the messages being waited for.
+        :param count: the number of matching messages to wait for.
+        :param timeout: the maximum number of seconds to wait.
+        :return list[dict] | None: The formatted matching messages, or None if no messages were received.
+        """
+        messages = self._get_consumer(subscriber_id).await_messages(predicate, count, timeout)
+        return messages or None
+
     def purge_messages(self, subscriber_id: str) -> None:
         """
         Purges all messages published to a subscriber by seeking through future timestamp.
@@ -99,6 +124,9 @@ class PubSubHelper:
             request={"subscription": subscription_path, "time": "2999-01-01T00:00:00Z"}
         )
 
+        if subscriber_id in self._consumers:
+            self._consumers[subscriber_id].purge()
+
     def format_received_message_data(self, received_message) -> dict:
         """
         Formats a messages received from a topic.
@@ -106,21 +134,21 @@ class PubSubHelper:
         :param received_message: The message received from the topic.
         :return dict: The formatted message data.
         """
-        return json.loads(
-            received_message.message.data.decode("utf-8").replace("'", '"')
-        )
+        return self._decode_message_data(received_message.message.data)
 
     def try_delete_subscriber(self, subscriber_id: str, attempts: int = 5) -> None:
-        subscriber = pubsub_v1.SubscriberClient()
+        consumer = self._consumers.pop(subscriber_id, None)
+        if consumer is not None:
+            consumer.stop()
+
         subscription_path = self.subscriber_client.subscription_path(
             CONFIG.PROJECT_ID, subscriber_id
         )
 
         if self._subscription_exists(subscriber_id):
-            with subscriber:
-                subscriber.delete_subscription(
-                    request={"subscription": subscription_path}
-                )
+            self.subscriber_client.delete_subscription(
+                request={"subscription": subscription_path}
+            )
         while attempts != 0:
             if self._wait_and_check_subscription_deleted(subscriber_id):
                 return
@@ -129,6 +157,27 @@ class PubSubHelper:
 
         print(f"Fail to delete subscriber. Subscription path: {subscription_path}")
 
+    def _get_consumer(self, subscriber_id: str) -> PubSubConsumer:
+        """
+        Gets the streaming pull consumer for a subscriber, creating it on first use.
+
+        :param subscriber_id: the unique id of the subscriber.
+        :return PubSubConsumer: the consumer for the subscriber.
+        """
+        if subscriber_id not in self._consumers:
+            self._consumers[subscriber_id] = PubSubConsumer(subscriber_id, decoder=self._decode_message_data)
+        return self._consumers[subscriber_id]
+
+    @staticmethod
+    def _decode_message_data(data: bytes) -> Any:
+        """
+        Decodes the data of a message received from a topic.
+
+        :param data: The message data.
+        :return: The decoded message data.
+        """
+        return json.loads(data.decode("utf-8").replace("'", '"'))
+
     def _subscription_exists(self, subscriber_id: str) -> bool:
         """
         Checks a subscription exists.
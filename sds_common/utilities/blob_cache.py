@@ -0,0 +1,250 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
+
+
+@dataclass
+class BlobCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    revalidations: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits + self.revalidations
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class BlobCacheEntry:
+    generation: int
+    value: Any
+    size: int
+    validated_at: float
+
+    @property
+    def age(self) -> float:
+        """
+        The number of seconds since the entry was last confirmed to match the blob in the bucket.
+        """
+        return time.monotonic() - self.validated_at
+
+
+class BlobCache:
+    """
+    Thread-safe two tier cache of parsed blob contents, keyed by bucket, blob name and generation.
+
+    The memory tier is an LRU of parsed values limited by the total size of the blobs they were parsed from.
+    A blob may be held in memory in more than one form, such as its raw bytes and its parsed JSON, each stored
+    under its own variant name. The optional disk tier keeps the raw bytes of each blob generation under
+    cache_dir, so a new process can revalidate against the bucket instead of downloading again.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+    def __init__(self, ttl: float, max_memory_bytes: int, cache_dir: str | None = None, disk_max_age: float = 86400):
+        self.ttl = ttl
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = cache_dir
+        self.disk_max_age = disk_max_age
+        self.stats = BlobCacheStats()
+        self._entries: OrderedDict[tuple[str, str, str], BlobCacheEntry] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, bucket: str, name: str, variant: str = "") -> BlobCacheEntry | None:
+        """
+        Get the in-memory entry for a blob, whether or not it is due for revalidation.
+
+        :param bucket: the name of the bucket.
+        :param name: the name of the blob.
+        :param variant: the form the blob is held in.
+        :return: the cache entry, or None if the blob is not cached in memory.
+        """
+        with self._lock:
+            entry = self._entries.get((bucket, name, variant))
+            if entry is not None:
+                self._entries.move_to_end((bucket, name, variant))
+            return entry
+
+    def record(self, outcome: str):
+        """
+        Count the outcome of a cache lookup.
+
+        :param outcome: the name of the BlobCacheStats counter to increment.
+        """
+        with self._lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+    def is_fresh(self, entry: BlobCacheEntry) -> bool:
+        """
+        Check whether an entry was validated recently enough to be used without asking the bucket.
+
+        :param entry: the cache entry.
+        :return: True if the entry is younger than the TTL, False otherwise.
+        """
+        return entry.age < self.ttl
+
+    def set(
+        self, bucket: str, name: str, generation: int, value: Any, data: bytes, variant: str = ""
+    ) -> BlobCacheEntry:
+        """
+        Store the parsed value of a blob generation in memory, and its raw bytes on disk if a cache_dir is set.
+
+        :param bucket: the name of the bucket.
+        :param name: the name of the blob.
+        :param generation: the generation of the blob the value was parsed from.
+        :param value: the parsed value.
+        :param data: the raw bytes of the blob.
+        :param variant: the form the blob is held in.
+        :return: the new cache entry.
+        """
+        entry = BlobCacheEntry(generation, value, len(data), time.monotonic())
+        self._store((bucket, name, variant), entry)
+        self._write_disk(bucket, name, generation, data)
+        return entry
+
+    def mark_validated(self, bucket: str, name: str, entry: BlobCacheEntry, variant: str = ""):
+        """
+        Record that an entry still matches the blob in the bucket, restarting its TTL.
+
+        :param bucket: the name of the bucket.
+        :param name: the name of the blob.
+        :param entry: the cache entry.
+        :param variant: the form the blob is held in.
+        """
+        entry.validated_at = time.monotonic()
+        self._store((bucket, name, variant), entry)
+
+    def read_disk(self, bucket: str, name: str) -> tuple[int, bytes] | None:
+        """
+        Read the newest generation of a blob from the disk tier.
+
+        :param bucket: the name of the bucket.
+        :param name: the name of the blob.
+        :return: the generation and raw bytes of the blob, or None if it is not cached on disk.
+        """
+        directory = self._disk_directory(bucket, name)
+        if directory is None or not os.path.isdir(directory):
+            return None
+
+        for generation in sorted((int(file) for file in os.listdir(directory) if file.isdigit()), reverse=True):
+            path = os.path.join(directory, str(generation))
+            try:
+                if time.time() - os.path.getmtime(path) > self.disk_max_age:
+                    os.remove(path)
+                    continue
+                with open(path, "rb") as file:
+                    return generation, file.read()
+            except OSError:
+                continue
+
+        return None
+
+    def invalidate(self, bucket: str, name: str):
+        """
+        Remove every variant of a blob from both tiers.
+
+        :param bucket: the name of the bucket.
+        :param name: the name of the blob.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] == (bucket, name)]:
+                self._memory_bytes -= self._entries.pop(key).size
+
+        self._remove_disk_generations(bucket, name, keep=None)
+
+    def clear(self):
+        """
+        Remove every entry from the memory tier and reset the stats. The disk tier is left in place.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+            self.stats = BlobCacheStats()
+
+    def _store(self, key: tuple[str, str, str], entry: BlobCacheEntry):
+        """
+        Put an entry in the memory tier, evicting least recently used entries until it fits within max_memory_bytes.
+        Blobs larger than max_memory_bytes are not kept in memory.
+
+        :param key: the bucket, blob name and variant.
+        :param entry: the cache entry.
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous.size
+
+            if entry.size > self.max_memory_bytes:
+                return
+
+            self._entries[key] = entry
+            self._memory_bytes += entry.size
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted.size
+
+    def _write_disk(self, bucket: str, name: str, generation: int, data: bytes):
+        """
+        Write the raw bytes of a blob generation to the disk tier, replacing any older generations.
+        The file is written to a temporary path and renamed, so readers never see a partial file.
+
+        :param bucket: the name of the bucket.
+        :param name: the name of the blob.
+        :param generation: the generation of the blob.
+        :param data: the raw bytes of the blob.
+        """
+        directory = self._disk_directory(bucket, name)
+        if directory is None:
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, str(generation))
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+
+        self._remove_disk_generations(bucket, name, keep=generation)
+
+    def _remove_disk_generations(self, bucket: str, name: str, keep: int | None):
+        """
+        Delete the cached generations of a blob from the disk tier.
+
+        :param bucket: the name of the bucket.
+        :param name: the name of the blob.
+        :param keep: a generation to keep, or None to delete them all.
+        """
+        directory = self._disk_directory(bucket, name)
+        if directory is None or not os.path.isdir(directory):
+            return
+
+        for file in os.listdir(directory):
+            if file.isdigit() and int(file) != keep:
+                try:
+                    os.remove(os.path.join(directory, file))
+                except OSError:
+                    pass
+
+    def _disk_directory(self, bucket: str, name: str) -> str | None:
+        """
+        The directory holding the cached generations of a blob. Blob names are hashed, as they may contain
+        characters that are not valid in file names.
+
+        :param bucket: the name of the bucket.
+        :param name: the name of the blob.
+        :return: the directory, or None if the disk tier is disabled.
+        """
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, quote(bucket, safe=""), hashlib.sha256(name.encode("utf-8")).hexdigest())
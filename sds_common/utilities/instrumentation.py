@@ -0,0 +1,339 @@
+"""
+Spans and latency histograms for outbound calls.
+
+Services time every call to SDS, GCS, Pub/Sub and Secret Manager through the instrumentation returned by
+get_instrumentation(). By default this is a no-op that records nothing. Set INSTRUMENTATION_BACKEND to "memory"
+to keep finished spans in process, for tests and benchmarks, or to "otel" to emit OpenTelemetry spans and
+histograms through the globally configured tracer and meter providers, installing the sds-common[otel] extra.
+
+Span nesting follows the span that is current in the calling thread or task. Spans started on worker threads,
+such as the parallel parts of a GCS transfer, are not nested under the span of the caller.
+"""
+from __future__ import annotations
+
+import contextvars
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+from sds_common.config.config import CONFIG
+
+# Span attributes that are also recorded as histogram attributes. Others, such as blob names and URL paths,
+# would give every file its own time series. Requests are broken down by the endpoint policy prefix their
+# path matched instead of by path.
+METRIC_ATTRIBUTES = frozenset({
+    "http.method",
+    "http.host",
+    "http.endpoint",
+    "http.status_code",
+    "gcs.bucket",
+    "pubsub.topic",
+    "secret.id",
+})
+
+
+class Span:
+    """
+    A timed operation. The base class records nothing and is shared by every no-op span.
+    Spans are context managers, ending when the block exits and recording any exception raised in it.
+    """
+    def set_attribute(self, key: str, value: Any):
+        """
+        Set an attribute of the span.
+
+        :param key: the attribute name.
+        :param value: the attribute value.
+        """
+
+    def end(self, error: BaseException | None = None):
+        """
+        End the span.
+
+        :param error: the error the operation failed with, if it failed.
+        """
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self.end(exc)
+        return False
+
+
+_NOOP_SPAN = Span()
+
+
+class Instrumentation:
+    """
+    Instrumentation that records nothing. Starting a span returns a shared span object, so instrumented calls
+    cost little more than a method call when instrumentation is off.
+    """
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:
+        """
+        Start a span. Used as a context manager, the span is the current span inside the block and ends when
+        the block exits. Otherwise it must be ended explicitly, for operations that finish in a callback.
+
+        :param name: the name of the operation, for example "gcs.download".
+        :param attributes: the attributes of the span.
+        :return: the span.
+        """
+        return _NOOP_SPAN
+
+
+@dataclass
+class FinishedSpan:
+    name: str
+    attributes: dict[str, Any]
+    start_time: float
+    duration_seconds: float
+    parent: str | None = None
+    error: BaseException | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class OperationSummary:
+    name: str
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    p50_seconds: float = 0.0
+    p95_seconds: float = 0.0
+    max_seconds: float = 0.0
+    bytes: int = 0
+    durations: list[float] = field(default_factory=list, repr=False)
+
+
+class _InMemorySpan(Span):
+    def __init__(self, instrumentation: InMemoryInstrumentation, name: str, attributes: dict[str, Any]):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.attributes = dict(attributes)
+        parent = _CURRENT_SPAN.get()
+        self.parent = parent.name if parent is not None else None
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._token = None
+        self._ended = False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def end(self, error: BaseException | None = None):
+        if self._ended:
+            return
+        self._ended = True
+        self.instrumentation.record(
+            FinishedSpan(
+                self.name, self.attributes, self.start_time, time.perf_counter() - self._start, self.parent, error
+            )
+        )
+
+    def __enter__(self) -> Self:
+        self._token = _CURRENT_SPAN.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        _CURRENT_SPAN.reset(self._token)
+        return super().__exit__(exc_type, exc, traceback)
+
+
+_CURRENT_SPAN: contextvars.ContextVar[_InMemorySpan | None] = contextvars.ContextVar(
+    "sds_common_current_span", default=None
+)
+
+
+class InMemoryInstrumentation(Instrumentation):
+    """
+    Instrumentation keeping every finished span in memory, for tests and benchmarks.
+    """
+    def __init__(self):
+        self.spans: list[FinishedSpan] = []
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:
+        return _InMemorySpan(self, name, attributes or {})
+
+    def record(self, span: FinishedSpan):
+        """
+        Keep a finished span.
+
+        :param span: the finished span.
+        """
+        with self._lock:
+            self.spans.append(span)
+
+    def finished_spans(self, name: str | None = None) -> list[FinishedSpan]:
+        """
+        Get the finished spans, in the order they ended.
+
+        :param name: only get spans of this operation.
+        :return: the spans.
+        """
+        with self._lock:
+            return [span for span in self.spans if name is None or span.name == name]
+
+    def summary(self) -> dict[str, OperationSummary]:
+        """
+        Summarise the latency, errors and bytes transferred of each operation.
+
+        :return: a summary per operation name.
+        """
+        summaries: dict[str, OperationSummary] = {}
+        for span in self.finished_spans():
+            summary = summaries.setdefault(span.name, OperationSummary(span.name))
+            summary.count += 1
+            summary.errors += not span.succeeded
+            summary.total_seconds += span.duration_seconds
+            summary.bytes += span.attributes.get("bytes") or 0
+            summary.durations.append(span.duration_seconds)
+
+        for summary in summaries.values():
+            durations = sorted(summary.durations)
+            summary.p50_seconds = statistics.median(durations)
+            summary.p95_seconds = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            summary.max_seconds = durations[-1]
+
+        return summaries
+
+    def clear(self):
+        """
+        Discard every finished span.
+        """
+        with self._lock:
+            self.spans.clear()
+
+
+class _OpenTelemetrySpan(Span):
+    def __init__(self, instrumentation: OpenTelemetryInstrumentation, name: str, attributes: dict[str, Any]):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.attributes = dict(attributes)
+        self.span = instrumentation.tracer.start_span(name, attributes=self._valid(attributes))
+        self._start = time.perf_counter()
+        self._token = None
+        self._ended = False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+        if value is not None:
+            self.span.set_attribute(key, value)
+
+    def end(self, error: BaseException | None = None):
+        if self._ended:
+            return
+        self._ended = True
+        if error is not None:
+            self.span.record_exception(error)
+            self.span.set_status(self.instrumentation.error_status)
+        self.span.end()
+        self.instrumentation.record(self.name, self.attributes, time.perf_counter() - self._start, error)
+
+    def __enter__(self) -> Self:
+        from opentelemetry import context, trace
+
+        self._token = context.attach(trace.set_span_in_context(self.span))
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        from opentelemetry import context
+
+        context.detach(self._token)
+        return super().__exit__(exc_type, exc, traceback)
+
+    @staticmethod
+    def _valid(attributes: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in attributes.items() if value is not None}
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Instrumentation emitting OpenTelemetry spans, a histogram of operation durations in seconds and a histogram
+    of bytes transferred, through the globally configured tracer and meter providers.
+    """
+    def __init__(self, name: str = "sds_common"):
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryInstrumentation requires opentelemetry-api, install it with the sds-common[otel] extra."
+            ) from e
+
+        self.tracer = trace.get_tracer(name)
+        meter = metrics.get_meter(name)
+        self.duration_histogram = meter.create_histogram(
+            "sds_common.operation.duration", unit="s", description="Duration of outbound calls"
+        )
+        self.bytes_histogram = meter.create_histogram(
+            "sds_common.operation.bytes", unit="By", description="Bytes transferred by outbound calls"
+        )
+        self.error_status = trace.Status(trace.StatusCode.ERROR)
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:
+        return _OpenTelemetrySpan(self, name, attributes or {})
+
+    def record(self, name: str, attributes: dict[str, Any], duration: float, error: BaseException | None):
+        """
+        Record the duration and bytes transferred of a finished operation on the histograms.
+
+        :param name: the name of the operation.
+        :param attributes: the attributes of the span.
+        :param duration: the duration of the operation in seconds.
+        :param error: the error the operation failed with, if it failed.
+        """
+        metric_attributes = {
+            key: value for key, value in attributes.items() if key in METRIC_ATTRIBUTES and value is not None
+        }
+        metric_attributes["operation"] = name
+        metric_attributes["error"] = error is not None
+        self.duration_histogram.record(duration, metric_attributes)
+
+        transferred = attributes.get("bytes")
+        if transferred is not None:
+            self.bytes_histogram.record(transferred, metric_attributes)
+
+
+def create_instrumentation(backend: str) -> Instrumentation:
+    """
+    Create the instrumentation for a backend name.
+
+    :param backend: "none", "memory" or "otel".
+    :return: the instrumentation.
+    :raises ValueError: if the backend is not known.
+    """
+    if backend == "none":
+        return Instrumentation()
+    if backend == "memory":
+        return InMemoryInstrumentation()
+    if backend == "otel":
+        return OpenTelemetryInstrumentation()
+    raise ValueError(f"Unknown instrumentation backend {backend}, expected none, memory or otel")
+
+
+_instrumentation = create_instrumentation(str(CONFIG.INSTRUMENTATION_BACKEND).lower())
+
+
+def get_instrumentation() -> Instrumentation:
+    """
+    Get the instrumentation used by every service.
+
+    :return: the instrumentation.
+    """
+    return _instrumentation
+
+
+def set_instrumentation(instrumentation: Instrumentation) -> Instrumentation:
+    """
+    Replace the instrumentation used by every service, for example with an InMemoryInstrumentation in a test.
+
+    :param instrumentation: the new instrumentation.
+    :return: the instrumentation it replaced.
+    """
+    global _instrumentation
+    previous, _instrumentation = _instrumentation, instrumentation
+    return previous
@@ -0,0 +1,54 @@
+"""
+JSON encoding and decoding using orjson when it is installed, falling back to the standard library json module.
+Install orjson with the sds-common[fast-json] extra.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson.JSONDecodeError is a subclass of json.JSONDecodeError, so callers can catch this for either backend.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """
+    Decode a JSON document.
+
+    :param data: the JSON document, as UTF-8 encoded bytes or a string.
+    :return: the decoded value.
+    :raises JSONDecodeError: if the document is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as a UTF-8 JSON document.
+
+    :param value: the value to encode.
+    :return: the JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def canonical_dumps(value: Any) -> bytes:
+    """
+    Encode a value as a canonical UTF-8 JSON document, with object keys sorted and no whitespace, so values
+    that are equal encode to the same bytes however the input was formatted. The standard library encoder is
+    always used, even when orjson is installed, as the two format some floats differently, for example 1e+20
+    and 1e20, and processes with and without orjson must agree.
+
+    :param value: the value to encode.
+    :return: the canonical JSON document.
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
@@ -0,0 +1,243 @@
+import codecs
+import json
+import re
+from collections.abc import Iterator
+from typing import IO, Any
+
+JSON_WHITESPACE = " \t\n\r"
+
+# Characters that can continue a number, so a number followed by one of them may be cut off at the end of a chunk.
+NUMBER_CONTINUATIONS = "0123456789.eE+-"
+
+# The characters that matter when skipping over a value: string quotes and escapes, and container brackets.
+_STRUCTURAL_CHARS = re.compile(r'["\\\[\]{}]')
+_STRING_CHARS = re.compile(r'["\\]')
+
+
+class JsonStreamReader:
+    """
+    Incrementally parses JSON from a file-like object read in fixed size chunks.
+
+    Only the unread part of the current chunk and the value currently being decoded are held in memory,
+    so peak memory is bounded by chunk_size plus the size of the largest array item decoded. Values of
+    object members passed over on the way to the array are scanned without being decoded or buffered.
+    """
+    def __init__(self, stream: IO, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def iter_items(self, path: str | None = None) -> Iterator[Any]:
+        """
+        Yield the items of a JSON array one at a time.
+
+        :param path: dotted path of object keys leading to the array, e.g. "data", or None for a top level array.
+        :return: a generator of the array items.
+        :raises KeyError: if the path is not found in the document.
+        :raises ValueError: if the document is not valid JSON or the path does not lead to an array.
+        """
+        for key in path.split(".") if path else []:
+            self._seek_key(key)
+
+        self._expect("[")
+
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode_value()
+
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in array, got {separator!r}")
+
+    def _seek_key(self, key: str):
+        """
+        Move past the opening of an object and its members up to and including the ':' after the key.
+        Values of earlier members are skipped without being decoded.
+
+        :param key: the key to find.
+        :raises KeyError: if the object does not contain the key.
+        """
+        self._expect("{")
+
+        while True:
+            if self._peek() == "}":
+                raise KeyError(key)
+
+            member_key = self._decode_value()
+            self._expect(":")
+
+            if member_key == key:
+                return
+
+            self._skip_value()
+            if self._peek() == ",":
+                self._pos += 1
+
+    def _skip_value(self):
+        """
+        Move past the next JSON value without decoding it, so a large value is never held in memory.
+        Strings, arrays and objects are scanned for their closing quote or bracket and are not validated.
+
+        :raises ValueError: if the stream ends before the value does.
+        """
+        first = self._peek()
+        if first is None or first not in "[{\"":
+            self._decode_value()
+            return
+
+        depth = 0
+        in_string = False
+        escaped = False
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            if escaped and pos < len(buffer):
+                # The character after a backslash at the end of the previous chunk.
+                pos += 1
+                escaped = False
+
+            while pos < len(buffer):
+                match = (_STRING_CHARS if in_string else _STRUCTURAL_CHARS).search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+
+                char = match.group()
+                pos = match.end()
+                if char == "\\":
+                    if pos == len(buffer):
+                        escaped = True
+                        break
+                    pos += 1
+                elif char == '"':
+                    in_string = not in_string
+                    if not in_string and depth == 0:
+                        self._pos = pos
+                        return
+                elif char in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self._pos = pos
+                        return
+
+            self._pos = pos
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _expect(self, char: str):
+        """
+        Consume the next non-whitespace character, which must be the expected character.
+
+        :param char: the expected character.
+        :raises ValueError: if a different character is found.
+        """
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, got {found!r}")
+        self._pos += 1
+
+    def _peek(self) -> str | None:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        :return: the next character, or None at the end of the stream.
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def _decode_value(self) -> Any:
+        """
+        Decode the next JSON value, reading more of the stream until the whole value is buffered.
+
+        :return: the decoded value.
+        :raises ValueError: if the value is not valid JSON.
+        """
+        self._peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number or literal ending at the end of the buffer may continue in the next chunk, as may a
+                # number followed by a character that can continue it, such as the "1" decoded from "1.5".
+                if self._eof or (end < len(self._buffer) and not self._may_continue(value, end)):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            # Grow reads geometrically so large values are decoded in linear time.
+            self._fill(max(self._chunk_size, len(self._buffer) - self._pos))
+
+    def _may_continue(self, value: Any, end: int) -> bool:
+        """
+        Check whether a decoded value is a number that the rest of the stream could still extend.
+
+        :param value: the decoded value.
+        :param end: the position in the buffer after the value.
+        :return: True if the value is a number followed by a character that can continue a number.
+        """
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        return is_number and self._buffer[end] in NUMBER_CONTINUATIONS
+
+    def _fill(self, size: int | None = None) -> bool:
+        """
+        Read the next chunk from the stream, discarding the consumed part of the buffer.
+
+        :param size: the number of bytes or characters to read, defaulting to the chunk size.
+        :return: True if data was read, False at the end of the stream.
+        """
+        chunk = self._read(size or self._chunk_size)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+        if not chunk:
+            self._eof = True
+            return False
+        return True
+
+    def _read(self, size: int) -> str:
+        """
+        Read text from the stream, decoding bytes as UTF-8. A multi-byte character split across reads
+        is held back until the rest of it has been read.
+
+        :param size: the number of bytes or characters to read.
+        :return: the text read, or an empty string at the end of the stream.
+        """
+        while True:
+            data = self._stream.read(size)
+            if not isinstance(data, bytes):
+                return data
+
+            text = self._text_decoder.decode(data, final=not data)
+            if text or not data:
+                return text
+
+
+def iter_json_items(stream: IO, path: str | None = None, chunk_size: int = 1024 * 1024) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array from a file-like object without loading the whole document.
+
+    :param stream: a file-like object opened in binary or text mode.
+    :param path: dotted path of object keys leading to the array, e.g. "data", or None for a top level array.
+    :param chunk_size: the number of bytes read from the stream at a time.
+    :return: a generator of the array items.
+    """
+    return JsonStreamReader(stream, chunk_size).iter_items(path)
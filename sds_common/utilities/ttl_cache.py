@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheEntry[V]:
+    value: V
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        """
+        The number of seconds since the entry was stored.
+        """
+        return time.monotonic() - self.stored_at
+
+
+class TTLCache[K: Hashable, V]:
+    """
+    Thread-safe in-memory cache where entries expire a fixed number of seconds after being stored.
+    When max_size is set, the least recently used entry is evicted once the cache is full.
+    """
+    def __init__(self, ttl: float, max_size: int | None = None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[K, CacheEntry[V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """
+        Get the value stored for the key if it has not expired.
+
+        :param key: the cache key.
+        :return: the cached value, or None if it is missing or expired.
+        """
+        entry = self.get_entry(key)
+        if entry is None or self.is_expired(entry):
+            return None
+        return entry.value
+
+    def get_entry(self, key: K) -> CacheEntry[V] | None:
+        """
+        Get the entry stored for the key, including expired entries.
+
+        :param key: the cache key.
+        :return: the cache entry, or None if there is no entry for the key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: K, value: V):
+        """
+        Store the value for the key, evicting the least recently used entry if the cache is full.
+
+        :param key: the cache key.
+        :param value: the value to cache.
+        """
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.monotonic())
+            self._entries.move_to_end(key)
+            if self.max_size is not None and len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: K):
+        """
+        Remove the entry for the key, if there is one.
+
+        :param key: the cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def is_expired(self, entry: CacheEntry[V]) -> bool:
+        """
+        Check whether the entry is older than the cache TTL.
+
+        :param entry: the cache entry.
+        :return: True if the entry has expired, False otherwise.
+        """
+        return entry.age >= self.ttl
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,13 +1,13 @@
-import json
+from collections.abc import Iterable
 from pathlib import Path
 
 import requests
 
-
 from sds_common.config.logging_config import logging
-from sds_common.config.config import CONFIG
-from sds_common.models.schema_publish_errors import FilepathError, SchemaJSONDecodeError, SchemaFetchError
-from sds_common.services.http_service import HttpService
+from sds_common.models.file_transfer_models import BatchOperationResult
+from sds_common.models.schema_publish_errors import FilepathError, SchemaJSONDecodeError
+from sds_common.services.github_schema_fetcher import GITHUB_SCHEMA_FETCHER
+from sds_common.utilities import json_backend
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +35,9 @@ def decode_json_response(response: requests.Response) -> dict | None:
     :raises SchemaJSONDecodeError: if the response cannot be decoded.
     """
     try:
-        decoded_response = response.json()
+        decoded_response = json_backend.loads(response.content)
         return decoded_response
-    except json.JSONDecodeError:
+    except json_backend.JSONDecodeError:
         raise SchemaJSONDecodeError("N/A") from None
 
 
@@ -48,13 +48,33 @@ def fetch_raw_schema_from_github(path: str) -> dict:
     :param path: the path to the schema JSON.
     :return dict: the schema JSON.
     :raises SchemaFetchError: if the schema cannot be fetched.
+    :raises SchemaJSONDecodeError: if the schema is not valid JSON.
     """
-    url = CONFIG.GITHUB_SCHEMA_URL + path
-    logger.info(f"Fetching schema from {url}")
-    http_service = HttpService.create(False)
-    response = http_service.make_get_request(url)
+    try:
+        return json_backend.loads(fetch_raw_schema_bytes_from_github(path))
+    except json_backend.JSONDecodeError:
+        raise SchemaJSONDecodeError(path) from None
 
-    if response.status_code != 200:
-        raise SchemaFetchError(path, response.status_code, url)
-    schema = decode_json_response(response)
-    return schema
+
+def fetch_raw_schema_bytes_from_github(path: str) -> bytes:
+    """
+    Fetches the schema from the ONSdigital GitHub repository as raw JSON bytes, without decoding it.
+    Schemas fetched before are revalidated with a conditional request rather than downloaded again.
+
+    :param path: the path to the schema JSON.
+    :return bytes: the schema JSON bytes.
+    :raises SchemaFetchError: if the schema cannot be fetched.
+    """
+    return GITHUB_SCHEMA_FETCHER.fetch(path)
+
+
+def fetch_raw_schemas(paths: Iterable[str], max_workers: int | None = None) -> BatchOperationResult:
+    """
+    Fetches many schemas from the ONSdigital GitHub repository concurrently, as raw JSON bytes.
+    Only schemas that have changed since they were last fetched are downloaded.
+
+    :param paths: the paths to the schema JSON files.
+    :param max_workers: the number of schemas fetched at once, defaulting to GITHUB_FETCH_CONCURRENCY.
+    :return: the result for each path, holding the schema JSON bytes or the error it failed with.
+    """
+    return GITHUB_SCHEMA_FETCHER.fetch_many(paths, max_workers)
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock
+
+from sds_common.clients.client_registry import ClientRegistry
+from sds_common.enums.client_types import ClientType
+
+
+def test_override_returns_callable_instances_as_is():
+    registry = ClientRegistry()
+    fake = MagicMock()
+
+    registry.override(ClientType.STORAGE, fake)
+
+    assert registry.get(ClientType.STORAGE, "project") is fake
+    fake.assert_not_called()
+
+
+def test_override_factory_creates_a_client_per_key():
+    registry = ClientRegistry()
+    registry.override_factory(ClientType.STORAGE, lambda project, **_options: MagicMock(project=project))
+
+    assert registry.get(ClientType.STORAGE, "a").project == "a"
+    assert registry.get(ClientType.STORAGE, "b").project == "b"
+    assert registry.get(ClientType.STORAGE, "a") is registry.get(ClientType.STORAGE, "a")
+
+
+def test_least_recently_used_client_is_closed_when_evicted():
+    registry = ClientRegistry(max_size=2)
+    registry.override_factory(ClientType.STORAGE, lambda project, **_options: MagicMock(project=project))
+    first = registry.get(ClientType.STORAGE, "a")
+    second = registry.get(ClientType.STORAGE, "b")
+    registry.get(ClientType.STORAGE, "a")
+
+    registry.get(ClientType.STORAGE, "c")
+
+    second.close.assert_called_once()
+    first.close.assert_not_called()
@@ -0,0 +1,62 @@
+import json
+from unittest.mock import MagicMock
+
+from sds_common.interfaces.schema_manifest_interface import SchemaManifestInterface
+from sds_common.models.schema_models import ALREADY_PUBLISHED_HEADER, PublishedSchema
+from sds_common.publishers.github_schema_publisher import GithubSchemaPublisher
+from sds_common.repositories.schema_content_index import SchemaContentIndex
+
+
+def schema_bytes(survey_id: str, schema_version: str) -> bytes:
+    return json.dumps(
+        {"properties": {"survey_id": {"enum": [survey_id]}, "schema_version": {"const": schema_version}}}
+    ).encode("utf-8")
+
+
+class CountingManifest(SchemaManifestInterface):
+    def __init__(self, record: PublishedSchema | None = None, error: Exception | None = None):
+        self.record = record
+        self.error = error
+        self.lookups = 0
+
+    def get(self, content_hash: str) -> PublishedSchema | None:
+        self.lookups += 1
+        if self.error is not None:
+            raise self.error
+        return self.record
+
+    def put(self, record: PublishedSchema):
+        self.record = record
+
+
+def make_publisher(manifest: CountingManifest) -> GithubSchemaPublisher:
+    publisher = GithubSchemaPublisher(SchemaContentIndex(manifest, miss_ttl=0))
+    publisher._retrieve_schema_bytes = lambda file_name: schema_bytes("068", "v1")
+    publisher.validator = MagicMock()
+    publisher.schema_request_service = MagicMock()
+    publisher.schema_request_service.post_schema.return_value = MagicMock(status_code=200)
+    return publisher
+
+
+def test_published_content_is_looked_up_once_and_not_posted():
+    manifest = CountingManifest(PublishedSchema("sha256:abc", "068", "v1", "068/v1.json", "2026-01-01T00:00:00"))
+    publisher = make_publisher(manifest)
+
+    response = publisher.publish_schema("068/v1-copy.json")
+
+    assert response.headers[ALREADY_PUBLISHED_HEADER] == "sha256:abc"
+    assert manifest.lookups == 1
+    publisher.validator.validate_schema.assert_not_called()
+    publisher.schema_request_service.post_schema.assert_not_called()
+
+
+def test_manifest_lookup_failure_is_treated_as_a_miss():
+    manifest = CountingManifest(error=RuntimeError("manifest unavailable"))
+    publisher = make_publisher(manifest)
+
+    response = publisher.publish_schema("068/v1.json")
+
+    assert response.status_code == 200
+    assert manifest.lookups == 1
+    publisher.validator.validate_schema.assert_called_once()
+    publisher.schema_request_service.post_schema.assert_called_once()
@@ -0,0 +1,97 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from sds_common.enums.publish_plan_reasons import PublishPlanReason
+from sds_common.models.schema_publish_errors import SchemaFetchError, SchemaJSONDecodeError, SchemaMetadataError
+from sds_common.publishers.schema_publish_planner import SchemaPublishPlanner
+from sds_common.schema.schema import Schema
+
+
+def schema_bytes(survey_id: str, schema_version: str) -> bytes:
+    return json.dumps(
+        {"properties": {"survey_id": {"enum": [survey_id]}, "schema_version": {"const": schema_version}}}
+    ).encode("utf-8")
+
+
+def make_publisher(files: dict[str, bytes | Exception]) -> MagicMock:
+    def load_schema(file_name: str) -> Schema:
+        content = files[file_name]
+        if isinstance(content, Exception):
+            raise content
+        return Schema.from_bytes(content, file_name)
+
+    publisher = MagicMock()
+    publisher.load_schema.side_effect = load_schema
+    return publisher
+
+
+class MetadataRepository:
+    def __init__(self, published: list[tuple[str, str]]):
+        self.published = published
+
+    def get_all_schema_metadata(self):
+        return [SimpleNamespace(survey_id=survey_id, schema_version=version) for survey_id, version in self.published]
+
+
+def test_each_file_is_planned_with_its_reason():
+    files = {
+        "068/v1.json": schema_bytes("068", "v1"),
+        "068/v2.json": schema_bytes("068", "v2"),
+        "068/v3.json": schema_bytes("068", "v4"),
+        "068/broken.json": SchemaJSONDecodeError("068/broken.json"),
+        "068/no_version.json": b'{"properties": {"survey_id": {"enum": ["068"]}}}',
+    }
+    planner = SchemaPublishPlanner(make_publisher(files), MetadataRepository([("068", "v1")]))
+
+    plan = planner.plan(files)
+
+    assert [entry.reason for entry in plan.entries] == [
+        PublishPlanReason.DUPLICATE,
+        PublishPlanReason.NEW,
+        PublishPlanReason.VERSION_MISMATCH,
+        PublishPlanReason.INVALID,
+        PublishPlanReason.INVALID,
+    ]
+    assert plan.to_publish == ["068/v2.json"]
+
+
+def test_later_file_with_a_planned_version_is_a_duplicate():
+    files = {
+        "first/v1.json": schema_bytes("068", "v1"),
+        "second/v1.json": schema_bytes("068", "v1"),
+        "other/v1.json": schema_bytes("141", "v1"),
+    }
+    planner = SchemaPublishPlanner(make_publisher(files), MetadataRepository([]))
+
+    plan = planner.plan(files)
+
+    assert [entry.reason for entry in plan.entries] == [
+        PublishPlanReason.NEW,
+        PublishPlanReason.DUPLICATE,
+        PublishPlanReason.NEW,
+    ]
+
+
+def test_failure_to_fetch_a_file_is_raised():
+    files = {
+        "068/v1.json": schema_bytes("068", "v1"),
+        "068/v2.json": SchemaFetchError("068/v2.json", 503, "https://github.example/068/v2.json"),
+    }
+    planner = SchemaPublishPlanner(make_publisher(files), MetadataRepository([]))
+
+    with pytest.raises(SchemaFetchError):
+        planner.plan(files)
+
+
+def test_failure_to_fetch_metadata_is_raised():
+    files = {"068/v1.json": schema_bytes("068", "v1")}
+    planner = SchemaPublishPlanner(make_publisher(files))
+    planner.validator.sds_schema_request_service = MagicMock()
+    planner.validator.sds_schema_request_service.get_all_schema_metadata.side_effect = SchemaMetadataError("all", 503)
+    planner.validator.sds_schema_request_service.get_schema_metadata.side_effect = SchemaMetadataError("068", 503)
+
+    with pytest.raises(SchemaMetadataError):
+        planner.plan(files)
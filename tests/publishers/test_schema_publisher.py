@@ -0,0 +1,110 @@
+import json
+import random
+import threading
+import time
+from unittest.mock import MagicMock
+
+from sds_common.models.schema_publish_errors import SchemaDuplicationError, SchemaJSONDecodeError
+from sds_common.publishers.github_schema_publisher import GithubSchemaPublisher
+from sds_common.publishers.schema_publisher import SchemaPublisher
+
+
+def schema_bytes(survey_id: str, schema_version: str) -> bytes:
+    return json.dumps(
+        {"properties": {"survey_id": {"enum": [survey_id]}, "schema_version": {"const": schema_version}}}
+    ).encode("utf-8")
+
+
+class FakePublisher(SchemaPublisher):
+    def __init__(self, files: dict[str, bytes | Exception]):
+        super().__init__()
+        self.files = files
+        self.posted: list[str] = []
+        self._lock = threading.Lock()
+        self.schema_request_service = MagicMock()
+        self.schema_request_service.post_schema.side_effect = self._post
+
+    def _post(self, schema):
+        time.sleep(random.uniform(0, 0.005))
+        if schema.schema_version == "fails":
+            raise RuntimeError("SDS unavailable")
+        with self._lock:
+            self.posted.append(schema.filepath)
+        return MagicMock(status_code=200)
+
+    def _retrieve_schema(self, file_name: str) -> dict:
+        return json.loads(self._retrieve_schema_bytes(file_name))
+
+    def _retrieve_schema_bytes(self, file_name: str) -> bytes:
+        content = self.files[file_name]
+        if isinstance(content, Exception):
+            raise content
+        return content
+
+    def publish_schema(self, file_name: str):
+        return self._post_schema(*self._prepare_schema(file_name))
+
+
+def test_schemas_for_a_survey_are_posted_in_order():
+    files = {f"{survey_id}/v{version}.json": schema_bytes(survey_id, f"v{version}")
+             for version in range(10) for survey_id in ("068", "141", "221")}
+    publisher = FakePublisher(files)
+
+    results = publisher.publish_many(files, retrieve_concurrency=4, post_concurrency=3)
+
+    assert [result.file_name for result in results] == list(files)
+    assert all(result.succeeded for result in results)
+    for survey_id in ("068", "141", "221"):
+        posted = [file_name for file_name in publisher.posted if file_name.startswith(survey_id)]
+        assert posted == [f"{survey_id}/v{version}.json" for version in range(10)]
+
+
+def test_failure_of_one_schema_does_not_stop_the_others():
+    files = {
+        "068/v1.json": schema_bytes("068", "v1"),
+        "068/broken.json": SchemaJSONDecodeError("068/broken.json"),
+        "068/fails.json": schema_bytes("068", "fails"),
+        "068/v2.json": schema_bytes("068", "v2"),
+    }
+    publisher = FakePublisher(files)
+
+    results = publisher.publish_many(files)
+
+    assert [result.succeeded for result in results] == [True, False, False, True]
+    assert isinstance(results[1].error, SchemaJSONDecodeError)
+    assert isinstance(results[2].error, RuntimeError)
+    assert publisher.posted == ["068/v1.json", "068/v2.json"]
+
+
+def test_concurrent_runs_keep_their_own_metadata_index():
+    publisher = GithubSchemaPublisher()
+    publisher.validator.sds_schema_request_service = MagicMock()
+    publisher.validator.sds_schema_request_service.get_all_schema_metadata.return_value.json.return_value = []
+    files = {
+        "first/v1.json": schema_bytes("068", "v1"),
+        "second/v1.json": schema_bytes("068", "v1"),
+        "other/v1.json": schema_bytes("141", "v1"),
+    }
+    publisher._retrieve_schema_bytes = files.__getitem__
+
+    first_posting, other_run_done = threading.Event(), threading.Event()
+
+    def post_schema(schema):
+        if schema.filepath == "first/v1.json":
+            first_posting.set()
+            other_run_done.wait(5)
+        return MagicMock(status_code=200)
+
+    publisher.schema_request_service = MagicMock()
+    publisher.schema_request_service.post_schema.side_effect = post_schema
+
+    results = []
+    run = threading.Thread(target=lambda: results.extend(publisher.publish_many(list(files)[:2])))
+    run.start()
+    first_posting.wait(5)
+    assert publisher.publish_many(["other/v1.json"])[0].succeeded
+    other_run_done.set()
+    run.join(5)
+
+    assert results[0].succeeded
+    assert isinstance(results[1].error, SchemaDuplicationError)
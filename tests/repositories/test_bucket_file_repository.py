@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from sds_common.repositories.bucket_file_repository import BucketFileRepository
+from sds_common.utilities.instrumentation import InMemoryInstrumentation, set_instrumentation
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = InMemoryInstrumentation()
+    previous = set_instrumentation(instrumentation)
+    yield instrumentation
+    set_instrumentation(previous)
+
+
+def make_bucket(missing: set[str]) -> MagicMock:
+    def blob(filename: str) -> MagicMock:
+        mock_blob = MagicMock()
+        if filename in missing:
+            mock_blob.delete.side_effect = FileNotFoundError(filename)
+        return mock_blob
+
+    bucket = MagicMock()
+    bucket.name = "bucket"
+    bucket.blob.side_effect = blob
+    return bucket
+
+
+def test_batch_delete_is_timed_by_one_span_with_counts(instrumentation):
+    repository = BucketFileRepository(make_bucket(missing={"b.json"}))
+
+    result = repository.delete_files(["a.json", "b.json", "c.json"])
+
+    assert [item.succeeded for item in result.results] == [True, False, True]
+    span = instrumentation.finished_spans("gcs.delete_many")[0]
+    assert span.attributes == {"gcs.bucket": "bucket", "gcs.items": 3, "gcs.failures": 1}
+
+
+def test_batch_exists_is_timed_by_one_span_with_counts(instrumentation):
+    repository = BucketFileRepository(make_bucket(missing=set()))
+
+    repository.files_exist(["a.json", "b.json"])
+
+    span = instrumentation.finished_spans("gcs.exists_many")[0]
+    assert span.attributes["gcs.items"] == 2
+    assert span.attributes["gcs.failures"] == 0
+
+
+def test_listing_span_ends_when_the_generator_is_closed(instrumentation):
+    bucket = make_bucket(missing=set())
+    bucket.list_blobs.return_value = iter(SimpleNamespace(name=f"{index}.json") for index in range(5))
+    repository = BucketFileRepository(bucket)
+
+    files = repository.list_files("prefix/")
+    assert [next(files), next(files)] == ["0.json", "1.json"]
+    files.close()
+
+    span = instrumentation.finished_spans("gcs.list")[0]
+    assert span.attributes["gcs.items"] == 2
+    assert span.attributes["gcs.prefix"] == "prefix/"
+    assert span.succeeded
@@ -0,0 +1,106 @@
+from google.api_core.exceptions import NotModified
+
+from sds_common.repositories.cached_bucket_file_repository import CachedBucketFileRepository
+from sds_common.utilities.blob_cache import BlobCache, BlobCacheStats
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.generation = None
+
+    def download_as_bytes(self, if_generation_not_match: int | None = None) -> bytes:
+        generation, data = self.bucket.files[self.name]
+        self.bucket.downloads.append((self.name, if_generation_not_match))
+        if generation == if_generation_not_match:
+            raise NotModified("not modified")
+        self.generation = generation
+        return data
+
+
+class FakeBucket:
+    def __init__(self, files: dict[str, tuple[int, bytes]]):
+        self.name = "bucket"
+        self.files = files
+        self.downloads: list[tuple[str, int | None]] = []
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+
+def test_fresh_entry_is_served_without_contacting_the_bucket():
+    bucket = FakeBucket({"a.json": (1, b'{"a": 1}')})
+    repository = CachedBucketFileRepository(bucket, BlobCache(ttl=60, max_memory_bytes=1024))
+
+    assert repository.get_file_as_json("a.json") == {"a": 1}
+    assert repository.get_file_as_json("a.json") == {"a": 1}
+
+    assert bucket.downloads == [("a.json", None)]
+    assert repository.cache.stats == BlobCacheStats(memory_hits=1, misses=1)
+
+
+def test_stale_entry_is_revalidated_with_its_generation():
+    bucket = FakeBucket({"a.json": (1, b'{"a": 1}')})
+    repository = CachedBucketFileRepository(bucket, BlobCache(ttl=0, max_memory_bytes=1024))
+
+    first = repository.get_file_as_json("a.json")
+    second = repository.get_file_as_json("a.json")
+
+    assert second is first
+    assert bucket.downloads == [("a.json", None), ("a.json", 1)]
+    assert repository.cache.stats.revalidations == 1
+    assert repository.cache.stats.misses == 1
+
+
+def test_changed_generation_is_downloaded_in_the_revalidation_request():
+    bucket = FakeBucket({"a.json": (1, b'{"a": 1}')})
+    repository = CachedBucketFileRepository(bucket, BlobCache(ttl=0, max_memory_bytes=1024))
+    repository.get_file_as_json("a.json")
+
+    bucket.files["a.json"] = (2, b'{"a": 2}')
+
+    assert repository.get_file_as_json("a.json") == {"a": 2}
+    assert repository.cache.get("bucket", "a.json", "json").generation == 2
+    assert bucket.downloads == [("a.json", None), ("a.json", 1)]
+    assert repository.cache.stats.misses == 2
+
+
+def test_not_modified_from_the_disk_tier_parses_the_cached_bytes(tmp_path):
+    bucket = FakeBucket({"a.json": (1, b'{"a": 1}')})
+    warm = CachedBucketFileRepository(bucket, BlobCache(ttl=60, max_memory_bytes=1024, cache_dir=str(tmp_path)))
+    warm.get_file_as_json("a.json")
+    repository = CachedBucketFileRepository(bucket, BlobCache(ttl=60, max_memory_bytes=1024, cache_dir=str(tmp_path)))
+
+    assert repository.get_file_as_json("a.json") == {"a": 1}
+
+    assert bucket.downloads == [("a.json", None), ("a.json", 1)]
+    assert repository.cache.stats.disk_hits == 1
+    assert repository.cache.get("bucket", "a.json", "json").generation == 1
+
+
+def test_least_recently_used_files_are_evicted_by_byte_budget():
+    bucket = FakeBucket(dict.fromkeys(("a.json", "b.json", "c.json"), (1, b'{"n": "0123456789"}')))
+    size = len(bucket.files["a.json"][1])
+    repository = CachedBucketFileRepository(bucket, BlobCache(ttl=60, max_memory_bytes=2 * size))
+
+    repository.get_file_as_json("a.json")
+    repository.get_file_as_json("b.json")
+    repository.get_file_as_json("a.json")
+    repository.get_file_as_json("c.json")
+
+    assert repository.cache.get("bucket", "a.json", "json") is not None
+    assert repository.cache.get("bucket", "b.json", "json") is None
+    assert repository.cache.get("bucket", "c.json", "json") is not None
+    assert repository.cache._memory_bytes == 2 * size
+
+
+def test_file_larger_than_the_byte_budget_is_not_cached():
+    bucket = FakeBucket({"a.json": (1, b'{"n": "0123456789"}')})
+    repository = CachedBucketFileRepository(bucket, BlobCache(ttl=60, max_memory_bytes=4))
+
+    repository.get_file_as_json("a.json")
+    repository.get_file_as_json("a.json")
+
+    assert bucket.downloads == [("a.json", None), ("a.json", None)]
+    assert repository.cache.stats.misses == 2
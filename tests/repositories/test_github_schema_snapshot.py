@@ -0,0 +1,130 @@
+import io
+import tarfile
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sds_common.models.schema_publish_errors import SchemaSnapshotError
+from sds_common.repositories.github_schema_snapshot import GithubSchemaSnapshot
+
+FILES = {
+    "repo-abc123/schemas/068/v1.json": b'{"a": 1}',
+    "repo-abc123/schemas/068/v2.json": b'{"a": 2}',
+    "repo-abc123/README.md": b"# schemas",
+    "repo-abc123/../outside.json": b'{"escaped": true}',
+}
+
+
+def tarball(files: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def zipball(files: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+class UnseekableStream(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self._data.readinto(buffer)
+
+
+@pytest.mark.parametrize("build", [tarball, zipball])
+@pytest.mark.parametrize("seekable", [True, False])
+def test_schema_files_are_extracted(build, seekable):
+    data = build(FILES)
+    archive = io.BytesIO(data) if seekable else UnseekableStream(data)
+
+    snapshot = GithubSchemaSnapshot.from_archive(archive, "abc123")
+
+    assert snapshot.paths() == ["schemas/068/v1.json", "schemas/068/v2.json"]
+    assert snapshot.read("schemas/068/v2.json") == b'{"a": 2}'
+
+
+@pytest.mark.parametrize("strip_components", [0, 1])
+def test_paths_outside_the_archive_are_rejected(strip_components):
+    files = {"../evil.json": b"{}", "repo-abc123/../../evil.json": b"{}", "repo-abc123/schemas/068/v1.json": b"{}"}
+    archive = io.BytesIO(tarball(files))
+
+    snapshot = GithubSchemaSnapshot.from_archive(archive, "abc123", include=("*",), strip_components=strip_components)
+
+    assert all("evil" not in path for path in snapshot)
+    assert len(snapshot) == 1
+
+
+def test_paths_outside_the_repository_directory_are_rejected():
+    snapshot = GithubSchemaSnapshot.from_archive(io.BytesIO(tarball(FILES)), "abc123", include=("*",))
+
+    assert "outside.json" not in snapshot
+
+
+def test_include_patterns_filter_files():
+    snapshot = GithubSchemaSnapshot.from_archive(io.BytesIO(tarball(FILES)), "abc123", include=("*.md", "*/v1.json"))
+
+    assert snapshot.paths() == ["README.md", "schemas/068/v1.json"]
+
+
+def test_strip_components_keeps_leading_directories():
+    snapshot = GithubSchemaSnapshot.from_archive(
+        io.BytesIO(zipball(FILES)), "abc123", include=("repo-*/schemas/*",), strip_components=0
+    )
+
+    assert snapshot.paths() == ["repo-abc123/schemas/068/v1.json", "repo-abc123/schemas/068/v2.json"]
+
+
+def test_files_are_extracted_to_disk(tmp_path):
+    snapshot = GithubSchemaSnapshot.from_archive(io.BytesIO(tarball(FILES)), "abc123", extract_dir=str(tmp_path))
+
+    assert (tmp_path / "schemas" / "068" / "v1.json").read_bytes() == b'{"a": 1}'
+    assert snapshot.read("schemas/068/v1.json") == b'{"a": 1}'
+
+
+def test_missing_path_raises_snapshot_error():
+    snapshot = GithubSchemaSnapshot.from_archive(io.BytesIO(tarball(FILES)), "abc123")
+
+    with pytest.raises(SchemaSnapshotError):
+        snapshot.read("schemas/068/v3.json")
+
+
+def test_download_streams_the_archive():
+    body = tarball(FILES)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        snapshot = GithubSchemaSnapshot.download("abc123", f"http://127.0.0.1:{server.server_port}/tarball/")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert snapshot.paths() == ["schemas/068/v1.json", "schemas/068/v2.json"]
@@ -0,0 +1,93 @@
+import threading
+from types import SimpleNamespace
+
+from sds_common.repositories.schema_metadata_repository import SchemaMetadataRepository
+
+
+def metadata(guid: str, survey_id: str, schema_version: str, sds_schema_version: int = 1) -> dict:
+    return {
+        "guid": guid,
+        "survey_id": survey_id,
+        "schema_location": f"{survey_id}/{guid}.json",
+        "sds_schema_version": sds_schema_version,
+        "sds_published_at": "2026-01-01T00:00:00Z",
+        "schema_version": schema_version,
+    }
+
+
+def change(change_type: str, data: dict, error: Exception | None = None):
+    def to_dict():
+        if error is not None:
+            raise error
+        return data
+
+    document = SimpleNamespace(id=data["guid"], to_dict=to_dict)
+    return SimpleNamespace(type=SimpleNamespace(name=change_type), document=document)
+
+
+class FakeWatch:
+    def __init__(self):
+        self.is_active = True
+        self.unsubscribed = False
+
+    def unsubscribe(self):
+        self.unsubscribed = True
+
+
+class FakeCollection:
+    """
+    Delivers the documents as the first snapshot from another thread as soon as a listener is started,
+    as Firestore does.
+    """
+    def __init__(self, documents: list[dict]):
+        self.documents = documents
+        self.callbacks = []
+        self.watches = []
+
+    def on_snapshot(self, callback):
+        self.callbacks.append(callback)
+        self.watches.append(FakeWatch())
+        changes = [change("ADDED", data) for data in self.documents]
+        threading.Thread(target=callback, args=([], changes, None)).start()
+        return self.watches[-1]
+
+
+def test_versions_are_indexed_per_survey():
+    collection = FakeCollection([metadata("a", "068", "v1"), metadata("b", "068", "v1", 2), metadata("c", "141", "v2")])
+    repository = SchemaMetadataRepository(collection)
+
+    assert repository.get_schema_versions("068") == {"v1"}
+    assert repository.has_schema_version("141", "v2")
+    assert not repository.has_schema_version("141", "v1")
+
+    collection.callbacks[-1]([], [change("REMOVED", metadata("a", "068", "v1"))], None)
+    assert repository.has_schema_version("068", "v1")
+
+    collection.callbacks[-1]([], [change("REMOVED", metadata("b", "068", "v1", 2))], None)
+    assert not repository.has_schema_version("068", "v1")
+    assert repository.get_schema_versions("068") == set()
+
+
+def test_failed_change_restarts_the_listener_with_a_full_snapshot():
+    collection = FakeCollection([metadata("a", "068", "v1")])
+    repository = SchemaMetadataRepository(collection)
+    assert repository.has_schema_version("068", "v1")
+
+    collection.callbacks[-1]([], [change("ADDED", metadata("b", "068", "v2"), ValueError("bad document"))], None)
+    collection.documents.append(metadata("b", "068", "v2"))
+
+    assert repository.get_schema_versions("068") == {"v1", "v2"}
+    assert collection.watches[0].unsubscribed
+    assert len(collection.watches) == 2
+
+
+def test_stopped_listener_is_restarted():
+    collection = FakeCollection([metadata("a", "068", "v1")])
+    repository = SchemaMetadataRepository(collection)
+    assert repository.has_schema_version("068", "v1")
+
+    collection.watches[0].is_active = False
+    collection.documents = [metadata("c", "141", "v1")]
+
+    assert not repository.has_schema_version("068", "v1")
+    assert repository.has_schema_version("141", "v1")
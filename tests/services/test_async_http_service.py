@@ -0,0 +1,51 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sds_common.services.async_http_service import AsyncHttpService
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_service_can_be_used_from_successive_event_loops(server_url):
+    service = AsyncHttpService.create(False, max_connections_per_host=2)
+
+    async def fetch_many():
+        responses = await asyncio.gather(*(service.make_get_request(server_url) for _ in range(5)))
+        return [response.status_code for response in responses]
+
+    assert asyncio.run(fetch_many()) == [200] * 5
+    assert asyncio.run(fetch_many()) == [200] * 5
+
+
+def test_service_without_client_factory_rejects_another_event_loop(server_url):
+    service = AsyncHttpService(AsyncHttpService._setup_client(10, 5, 5.0, False), None)
+
+    async def fetch():
+        return (await service.make_get_request(server_url)).status_code
+
+    assert asyncio.run(fetch()) == 200
+    with pytest.raises(RuntimeError):
+        asyncio.run(fetch())
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+from sds_common.services.firestore_purge_service import FirestorePurgeService
+
+
+class FakeDocument:
+    def __init__(self, path: str, collections: dict[str, list["FakeDocument"]] | None = None):
+        self.path = path
+        self._collections = collections or {}
+
+    def collections(self) -> list[SimpleNamespace]:
+        return [
+            SimpleNamespace(list_documents=lambda page_size, children=children: list(children))
+            for children in self._collections.values()
+        ]
+
+
+class FakeBulkWriter:
+    """
+    Records the deletes sent in each flush, failing a delete for the given number of attempts before it succeeds.
+    """
+    def __init__(self, failures: dict[str, int]):
+        self.failures = failures
+        self.flushes: list[list[str]] = []
+        self.attempts: dict[str, int] = {}
+        self.closed = False
+        self._pending: list[FakeDocument] = []
+
+    def on_write_result(self, callback):
+        self.on_success = callback
+
+    def on_write_error(self, callback):
+        self.on_error = callback
+
+    def delete(self, document: FakeDocument):
+        self._pending.append(document)
+
+    def flush(self):
+        self.flushes.append([document.path for document in self._pending])
+        for document in self._pending:
+            while True:
+                attempts = self.attempts[document.path] = self.attempts.get(document.path, 0) + 1
+                if attempts > self.failures.get(document.path, 0):
+                    self.on_success(document, None, self)
+                    break
+                failure = SimpleNamespace(
+                    attempts=attempts, operation=SimpleNamespace(reference=document), message="unavailable"
+                )
+                if not self.on_error(failure, self):
+                    break
+        self._pending = []
+
+    def close(self):
+        self.closed = True
+
+
+def make_tree() -> list[FakeDocument]:
+    grandchild = FakeDocument("surveys/a/versions/1/items/x")
+    child = FakeDocument("surveys/a/versions/1", {"items": [grandchild]})
+    return [FakeDocument("surveys/a", {"versions": [child]}), FakeDocument("surveys/b")]
+
+
+def make_service(failures: dict[str, int], max_attempts: int = 3) -> tuple[FirestorePurgeService, FakeBulkWriter]:
+    bulk_writer = FakeBulkWriter(failures)
+    client = SimpleNamespace(bulk_writer=lambda _options: bulk_writer)
+    return FirestorePurgeService(client, max_workers=2, max_attempts=max_attempts), bulk_writer
+
+
+def test_documents_are_deleted_deepest_level_first():
+    service, bulk_writer = make_service({})
+
+    stats = service.purge_documents(make_tree())
+
+    assert bulk_writer.flushes == [
+        ["surveys/a/versions/1/items/x"],
+        ["surveys/a/versions/1"],
+        ["surveys/a", "surveys/b"],
+    ]
+    assert bulk_writer.closed
+    assert (stats.documents_found, stats.documents_deleted, stats.succeeded) == (4, 4, True)
+
+
+def test_failed_delete_is_retried_until_it_succeeds():
+    service, bulk_writer = make_service({"surveys/a/versions/1": 2})
+
+    stats = service.purge_documents(make_tree())
+
+    assert bulk_writer.attempts["surveys/a/versions/1"] == 3
+    assert stats.documents_deleted == 4
+    assert stats.succeeded
+
+
+def test_document_is_kept_when_a_descendant_fails_after_every_attempt():
+    service, bulk_writer = make_service({"surveys/a/versions/1/items/x": 5})
+
+    stats = service.purge_documents(make_tree())
+
+    assert bulk_writer.attempts["surveys/a/versions/1/items/x"] == 3
+    assert bulk_writer.flushes[1:] == [[], ["surveys/b"]]
+    assert stats.documents_deleted == 1
+    assert stats.failed_paths == ["surveys/a", "surveys/a/versions/1", "surveys/a/versions/1/items/x"]
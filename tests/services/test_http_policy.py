@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from sds_common.models.http_policy_models import HttpPolicy
+from sds_common.services.http_policy import CircuitState, HttpPolicyEngine
+from sds_common.utilities.instrumentation import InMemoryInstrumentation, set_instrumentation
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_connection_refused_is_retried_for_any_method(method):
+    engine = HttpPolicyEngine(HttpPolicy(max_attempts=3, backoff_base=0.001), failure_threshold=10)
+
+    with pytest.raises(requests.ConnectionError):
+        engine.send(requests.Session(), method, "http://127.0.0.1:1/v1/schema", data=b"{}")
+
+    metrics = engine.metrics()
+    assert metrics.attempts == 3
+    assert metrics.retries_by_reason == {"connect_error": 2}
+
+
+def test_malformed_endpoint_read_timeouts_are_skipped():
+    timeouts = HttpPolicyEngine._parse_endpoint_read_timeouts("/v1/schema, /v1/a=abc, =3, /v1/b=-1, /v1/ok = 12")
+
+    assert timeouts == {"/v1/ok": 12.0}
+
+
+def test_unexpected_error_ends_the_half_open_trial_request():
+    engine = HttpPolicyEngine(HttpPolicy(max_attempts=1), failure_threshold=1, reset_timeout=0)
+    breaker = engine.breaker_for("http://sds/v1/schema")
+    breaker.record_failure()
+    session = MagicMock()
+    session.request.side_effect = TypeError("unexpected keyword argument")
+
+    with pytest.raises(TypeError):
+        engine.send(session, "GET", "http://sds/v1/schema")
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker._trial_in_flight
+
+
+def test_streamed_response_body_is_not_read():
+    engine = HttpPolicyEngine(HttpPolicy(max_attempts=1))
+    response = MagicMock(status_code=200, headers={"Content-Length": "12"})
+    type(response).content = property(lambda _: pytest.fail("the streamed body was read"))
+    session = MagicMock()
+    session.request.return_value = response
+
+    instrumentation = InMemoryInstrumentation()
+    previous = set_instrumentation(instrumentation)
+    try:
+        assert engine.send(session, "GET", "http://sds/v1/schema", stream=True) is response
+    finally:
+        set_instrumentation(previous)
+
+    assert instrumentation.finished_spans("http.request")[0].attributes["bytes"] == 12
@@ -0,0 +1,61 @@
+import threading
+
+from sds_common.services.id_token_provider import IdTokenProvider
+
+AUDIENCE = "https://sds.example"
+
+
+class CountingFetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, audience: str) -> str:
+        self.calls += 1
+        return f"token-{self.calls}"
+
+
+def test_unread_token_is_not_refreshed_in_the_background():
+    fetcher = CountingFetcher()
+    provider = IdTokenProvider(fetcher)
+    provider._refresh(AUDIENCE)
+
+    provider._background_refresh(AUDIENCE)
+
+    assert fetcher.calls == 1
+    assert AUDIENCE not in provider._timers
+    provider.invalidate()
+
+
+def test_read_token_is_refreshed_in_the_background():
+    fetcher = CountingFetcher()
+    provider = IdTokenProvider(fetcher)
+    assert provider.get_token(AUDIENCE) == "token-1"
+
+    provider._background_refresh(AUDIENCE)
+
+    assert fetcher.calls == 2
+    assert provider.peek_token(AUDIENCE) == "token-2"
+    provider.invalidate()
+
+
+def test_token_fetched_across_invalidate_is_not_cached():
+    fetching, release = threading.Event(), threading.Event()
+
+    def fetch_token(audience: str) -> str:
+        fetching.set()
+        release.wait(5)
+        return "stale-token"
+
+    provider = IdTokenProvider(fetch_token)
+    tokens = []
+    thread = threading.Thread(target=lambda: tokens.append(provider.get_token(AUDIENCE)))
+    thread.start()
+    fetching.wait(5)
+
+    provider.invalidate()
+    release.set()
+    thread.join(5)
+
+    assert tokens == ["stale-token"]
+    assert provider.peek_token(AUDIENCE) is None
+    assert AUDIENCE not in provider._timers
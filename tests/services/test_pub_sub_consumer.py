@@ -0,0 +1,111 @@
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
+from sds_common.enums.client_types import ClientType
+from sds_common.services.pub_sub_consumer import PubSubConsumer
+
+
+class FakeMessage:
+    def __init__(self, message_id: str, data: bytes):
+        self.message_id = message_id
+        self.data = data
+        self.acked = False
+        self.nacked = False
+
+    def ack(self):
+        self.acked = True
+
+    def nack(self):
+        self.nacked = True
+
+
+class FakeSubscriber:
+    def __init__(self):
+        self.callback = None
+        self.future = MagicMock()
+        self.future.done.return_value = False
+
+    def subscription_path(self, project_id: str, subscription_id: str) -> str:
+        return f"projects/{project_id}/subscriptions/{subscription_id}"
+
+    def subscribe(self, subscription_path, callback, flow_control, scheduler):
+        self.callback = callback
+        return self.future
+
+
+@pytest.fixture
+def subscriber():
+    subscriber = FakeSubscriber()
+    CLIENT_REGISTRY.override(ClientType.SUBSCRIBER, subscriber)
+    yield subscriber
+    CLIENT_REGISTRY.clear_overrides(ClientType.SUBSCRIBER)
+
+
+def make_message(message_id: str, payload: dict) -> FakeMessage:
+    return FakeMessage(message_id, json.dumps(payload).encode("utf-8"))
+
+
+def test_full_queue_holds_back_delivery_until_it_is_read(subscriber):
+    consumer = PubSubConsumer("subscription", queue_size=1)
+    consumer.start()
+    first, second = make_message("1", {}), make_message("2", {})
+    subscriber.callback(first)
+
+    delivery = threading.Thread(target=subscriber.callback, args=(second,))
+    delivery.start()
+    delivery.join(timeout=0.2)
+    assert delivery.is_alive()
+
+    assert consumer.get(timeout=1) is first
+    delivery.join(timeout=1)
+    assert not delivery.is_alive()
+    assert consumer.get(timeout=1) is second
+
+
+def test_purge_acks_and_discards_queued_messages(subscriber):
+    consumer = PubSubConsumer("subscription", queue_size=5)
+    consumer.start()
+    messages = [make_message(str(i), {"i": i}) for i in range(3)]
+    for message in messages:
+        subscriber.callback(message)
+
+    assert consumer.purge() == 3
+
+    assert all(message.acked for message in messages)
+    assert consumer.get(timeout=0) is None
+    assert consumer.purge() == 0
+
+
+def test_await_messages_acks_every_message_and_returns_matches(subscriber):
+    consumer = PubSubConsumer("subscription", queue_size=5)
+    consumer.start()
+    messages = [
+        make_message("1", {"survey_id": "a"}),
+        FakeMessage("2", b"not json"),
+        make_message("3", {"survey_id": "b"}),
+        make_message("4", {"survey_id": "b"}),
+    ]
+    for message in messages:
+        subscriber.callback(message)
+
+    matched = consumer.await_messages(lambda data: data["survey_id"] == "b", count=1, timeout=1)
+
+    assert matched == [{"survey_id": "b"}, {"survey_id": "b"}]
+    assert all(message.acked for message in messages)
+
+
+def test_stop_nacks_unread_messages(subscriber):
+    consumer = PubSubConsumer("subscription", queue_size=5)
+    consumer.start()
+    message = make_message("1", {})
+    subscriber.callback(message)
+
+    consumer.stop(timeout=1)
+
+    subscriber.future.cancel.assert_called_once()
+    assert message.nacked
+    assert not consumer.running
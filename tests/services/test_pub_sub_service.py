@@ -0,0 +1,62 @@
+from concurrent.futures import Future
+
+from sds_common.services.pub_sub_service import PubSubService
+from sds_common.utilities.instrumentation import InMemoryInstrumentation, set_instrumentation
+
+
+class FakePublisher:
+    def __init__(self):
+        self.published = []
+        self.resumed = []
+
+    def topic_path(self, project_id, topic_id):
+        return f"projects/{project_id}/topics/{topic_id}"
+
+    def publish(self, topic_path, data, ordering_key=""):
+        if data == b"too large":
+            raise ValueError("Message too large")
+
+        future = Future()
+        if data == b"fails":
+            future.set_exception(RuntimeError("Publish failed"))
+        else:
+            self.published.append(data)
+            future.set_result(str(len(self.published)))
+        return future
+
+    def resume_publish(self, topic_path, ordering_key):
+        self.resumed.append(ordering_key)
+
+
+def make_service():
+    service = PubSubService(track_outcomes=True)
+    service._publisher = FakePublisher()
+    return service
+
+
+def test_send_many_records_a_rejected_message_without_stopping_the_others():
+    service = make_service()
+    instrumentation = InMemoryInstrumentation()
+    previous = set_instrumentation(instrumentation)
+    try:
+        outcomes = service.send_many([b"first", b"too large", b"last"], "topic")
+    finally:
+        set_instrumentation(previous)
+
+    assert [outcome.succeeded for outcome in outcomes] == [True, False, True]
+    assert isinstance(outcomes[1].error, ValueError)
+    assert service.publisher.published == [b"first", b"last"]
+
+    spans = instrumentation.finished_spans("pubsub.publish")
+    assert len(spans) == 3
+    assert sum(not span.succeeded for span in spans) == 1
+
+
+def test_send_many_resumes_ordering_key_after_failure():
+    service = make_service()
+
+    outcomes = service.send_many([b"fails", b"ok"], "topic", ordering_key="survey-068")
+
+    assert [outcome.succeeded for outcome in outcomes] == [False, True]
+    assert isinstance(outcomes[0].error, RuntimeError)
+    assert service.publisher.resumed == ["survey-068"]
@@ -0,0 +1,82 @@
+import threading
+from collections import Counter
+from types import SimpleNamespace
+
+import requests
+
+from sds_common.services.sds_dataset_request_service import SdsDatasetRequestService
+
+
+def make_dataset(survey_id: str, period_id: str) -> dict:
+    return {
+        "dataset_id": f"{survey_id}-{period_id}",
+        "survey_id": survey_id,
+        "period_id": period_id,
+        "form_types": ["0001"],
+        "sds_published_at": "2026-01-01T00:00:00Z",
+        "total_reporting_units": 1,
+        "sds_dataset_version": 1,
+        "filename": "dataset.json",
+    }
+
+
+class FakeHttpService:
+    """
+    Answers dataset metadata requests, failing with a status code or a transport error for the given pairs.
+    """
+    def __init__(self, statuses: dict[tuple[str, str], int] | None = None, broken: set[tuple[str, str]] = frozenset()):
+        self.statuses = statuses or {}
+        self.broken = broken
+        self.requests: Counter[tuple[str, str]] = Counter()
+        self._lock = threading.Lock()
+
+    def make_get_request(self, url: str, params: dict) -> SimpleNamespace:
+        pair = (params["survey_id"], params["period_id"])
+        with self._lock:
+            self.requests[pair] += 1
+        if pair in self.broken:
+            raise requests.ConnectionError("connection refused")
+        return SimpleNamespace(status_code=self.statuses.get(pair, 200), json=lambda: [make_dataset(*pair)])
+
+
+def make_service(http_service: FakeHttpService) -> SdsDatasetRequestService:
+    service = SdsDatasetRequestService(cache_ttl=60)
+    service.http_service = http_service
+    return service
+
+
+def test_repeated_pairs_are_requested_once():
+    http_service = FakeHttpService()
+    service = make_service(http_service)
+
+    result = service.get_dataset_metadata_many([("a", "1"), ("b", "1"), ("a", "1"), ("b", "1")], max_workers=2)
+
+    assert http_service.requests == {("a", "1"): 1, ("b", "1"): 1}
+    assert list(result.metadata) == [("a", "1"), ("b", "1")]
+    assert result.metadata[("a", "1")][0].dataset_id == "a-1"
+    assert result.succeeded
+
+
+def test_failed_pairs_do_not_stop_the_others():
+    http_service = FakeHttpService(statuses={("b", "1"): 404}, broken={("c", "1")})
+    service = make_service(http_service)
+
+    result = service.get_dataset_metadata_many([("a", "1"), ("b", "1"), ("c", "1")])
+
+    assert list(result.metadata) == [("a", "1")]
+    assert not result.succeeded
+    assert (result.errors[("b", "1")].survey_id, result.errors[("b", "1")].status_code) == ("b", 404)
+    assert result.errors[("c", "1")].status_code is None
+    assert "connection refused" in result.errors[("c", "1")].message
+
+
+def test_cached_pairs_are_not_requested_again_and_failures_are_not_cached():
+    http_service = FakeHttpService(statuses={("b", "1"): 500})
+    service = make_service(http_service)
+    service.get_dataset_metadata_many([("a", "1"), ("b", "1")])
+
+    result = service.get_dataset_metadata_many([("a", "1"), ("b", "1")])
+
+    assert http_service.requests == {("a", "1"): 1, ("b", "1"): 2}
+    assert ("a", "1") in result.metadata
+    assert ("b", "1") in result.errors
@@ -0,0 +1,72 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from sds_common.clients.client_registry import CLIENT_REGISTRY
+from sds_common.enums.client_types import ClientType
+from sds_common.services.secret_service import SECRET_PAYLOAD_CACHE, SecretService
+from sds_common.utilities.ttl_cache import TTLCache
+
+
+class FakeSecretManager:
+    def __init__(self):
+        self.version = 1
+        self.accesses = 0
+
+    def access_secret_version(self, name: str):
+        self.accesses += 1
+        data = f'{{"web": {{"client_id": "client-{self.version}"}}}}'.encode()
+        return SimpleNamespace(payload=SimpleNamespace(data=data), name=f"{name[: -len('latest')]}{self.version}")
+
+
+@pytest.fixture
+def secret_manager():
+    secret_manager = FakeSecretManager()
+    CLIENT_REGISTRY.override(ClientType.SECRET_MANAGER, secret_manager)
+    yield secret_manager
+    CLIENT_REGISTRY.clear_overrides(ClientType.SECRET_MANAGER)
+    SECRET_PAYLOAD_CACHE.clear()
+
+
+def test_instances_share_the_payload_cache(secret_manager):
+    assert SecretService().get_oauth_client_id() == "client-1"
+    assert SecretService().get_oauth_client_id() == "client-1"
+
+    assert secret_manager.accesses == 1
+
+
+def test_expired_payload_is_fetched_again(secret_manager):
+    service = SecretService(TTLCache(0), stale_while_revalidate=False)
+    service.get_oauth_client_id()
+    secret_manager.version = 2
+
+    assert service.get_oauth_client_id() == "client-2"
+    assert secret_manager.accesses == 2
+
+
+def test_expired_payload_is_served_while_it_is_refreshed(secret_manager):
+    cache = TTLCache(0)
+    service = SecretService(cache, stale_while_revalidate=True)
+    service.get_oauth_client_id()
+    secret_manager.version = 2
+
+    assert service.get_oauth_client_id() == "client-1"
+
+    deadline = time.monotonic() + 5
+    while cache.get_entry(service.secret_id).value.data["web"]["client_id"] != "client-2":
+        assert time.monotonic() < deadline, "the payload was not refreshed in the background"
+        time.sleep(0.01)
+
+
+def test_invalidate_only_drops_the_given_version(secret_manager):
+    service = SecretService(TTLCache(60))
+    service.get_oauth_client_id()
+
+    service.invalidate(version="2")
+    service.get_oauth_client_id()
+    assert secret_manager.accesses == 1
+
+    service.invalidate(version="1")
+    service.get_oauth_client_id()
+    assert secret_manager.accesses == 2
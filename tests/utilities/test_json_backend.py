@@ -0,0 +1,17 @@
+import json
+
+from sds_common.utilities import json_backend
+
+
+def test_canonical_dumps_matches_standard_library_encoding():
+    value = {"b": 1e20, "a": [1e-7, 0.1, 10, "é"], "c": {"z": None, "y": True}}
+
+    expected = json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    assert json_backend.canonical_dumps(value) == expected
+
+
+def test_canonical_dumps_ignores_formatting_and_key_order():
+    first = json_backend.loads(b'{"a": 1, "b": [1.50, 2E3]}')
+    second = json_backend.loads(b'{"b":[1.5,2000.0],"a":1}')
+
+    assert json_backend.canonical_dumps(first) == json_backend.canonical_dumps(second)
@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+
+from sds_common.utilities.json_stream import iter_json_items
+
+CHUNK_SIZES = [1, 2, 3, 4, 5, 8, 13, 64]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("mode", ["bytes", "text"])
+def test_numbers_split_across_chunks(chunk_size, mode):
+    document = "[1.5, 2.25, 3e10, 4, -0.5E-3, 12345678901234567890, 6.0e+2]"
+    stream = io.BytesIO(document.encode("utf-8")) if mode == "bytes" else io.StringIO(document)
+
+    assert list(iter_json_items(stream, chunk_size=chunk_size)) == json.loads(document)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_numbers_at_end_of_objects_split_across_chunks(chunk_size):
+    document = '[{"a": 1.5}, {"b": [2.25,3e10]}, {"c": 4}]'
+
+    assert list(iter_json_items(io.BytesIO(document.encode("utf-8")), chunk_size=chunk_size)) == json.loads(document)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_path_skips_earlier_members(chunk_size):
+    document = {
+        "count": 1.25e3,
+        "meta": {"nested": ["]", "}", "\"quoted\\\\", {"deep": [1, [2, [3]]]}], "é": "ü"},
+        "note": "a string with [brackets] and {braces} and \\\"escapes\\\"",
+        "flag": True,
+        "data": [1.5, {"x": "y"}, None],
+    }
+    stream = io.BytesIO(json.dumps(document, ensure_ascii=False).encode("utf-8"))
+
+    assert list(iter_json_items(stream, path="data", chunk_size=chunk_size)) == document["data"]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_nested_path(chunk_size):
+    document = {"skip": [[{"data": [0]}]], "outer": {"skip": "x", "data": [3.75, 4]}}
+    stream = io.BytesIO(json.dumps(document).encode("utf-8"))
+
+    assert list(iter_json_items(stream, path="outer.data", chunk_size=chunk_size)) == [3.75, 4]
+
+
+def test_missing_path_raises_key_error():
+    stream = io.BytesIO(b'{"other": [1, 2]}')
+
+    with pytest.raises(KeyError):
+        list(iter_json_items(stream, path="data", chunk_size=4))
+
+
+def test_truncated_skipped_value_raises_value_error():
+    stream = io.BytesIO(b'{"other": [1, 2')
+
+    with pytest.raises(ValueError):
+        list(iter_json_items(stream, path="data", chunk_size=4))